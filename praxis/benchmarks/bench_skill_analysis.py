@@ -0,0 +1,72 @@
+# praxis/benchmarks/bench_skill_analysis.py
+"""
+Benchmark Database.get_skill_analysis against the previous correlated-subquery version.
+
+Run from the praxis directory:
+    python -m benchmarks.bench_skill_analysis --users 10000 --attempts 1000000
+"""
+import os
+import time
+import random
+import argparse
+
+from database.db_manager import Database
+from benchmarks.synthetic import build_synthetic_db
+from benchmarks.timing import time_calls
+
+# The original query, kept for comparison
+LEGACY_SKILL_ANALYSIS_SQL = '''
+    SELECT s.skill_id, s.name, s.category, COALESCE(us.proficiency, 0) as proficiency,
+          (SELECT COUNT(*) FROM attempts a
+           JOIN challenge_skills cs ON a.challenge_id = cs.challenge_id
+           WHERE a.user_id = ? AND cs.skill_id = s.skill_id) as practice_count
+    FROM skills s
+    LEFT JOIN user_skills us ON s.skill_id = us.skill_id AND us.user_id = ?
+    ORDER BY proficiency DESC
+'''
+
+def main() -> None:
+    """Build (or reuse) a synthetic database and compare both implementations."""
+    parser = argparse.ArgumentParser(description="Benchmark the skill analysis query")
+    parser.add_argument("--db", default="./praxis_bench.db")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--challenges", type=int, default=2000)
+    parser.add_argument("--attempts", type=int, default=1000000)
+    parser.add_argument("--samples", type=int, default=200, help="Users to query")
+    parser.add_argument("--rebuild", action="store_true", help="Regenerate the database even if it exists")
+    args = parser.parse_args()
+
+    if args.rebuild or not os.path.exists(args.db):
+        start = time.perf_counter()
+        build_synthetic_db(args.db, users=args.users, challenges=args.challenges, attempts=args.attempts)
+        print(f"Built {args.db} in {time.perf_counter() - start:.1f}s")
+
+    db = Database(args.db)
+    try:
+        all_users = [row[0] for row in db.conn.execute('SELECT user_id FROM users')]
+        # Include the heaviest users, where the old query hurts most
+        heavy = [row[0] for row in db.conn.execute(
+            'SELECT user_id FROM user_stats ORDER BY total_attempts DESC LIMIT ?', (args.samples // 10,))]
+        sample = heavy + random.Random(0).sample(all_users, min(len(all_users), args.samples - len(heavy)))
+
+        # Both must agree before timing means anything
+        for user_id in sample[:20]:
+            legacy = {row[0]: row[4] for row in db.conn.execute(LEGACY_SKILL_ANALYSIS_SQL, (user_id, user_id))}
+            current = {skill['skill_id']: skill['practice_count']
+                       for skills in db.get_skill_analysis(user_id).values() for skill in skills}
+            assert legacy == current, f"practice counts differ for user {user_id}"
+
+        results = {
+            "legacy": time_calls(lambda u: db.conn.execute(LEGACY_SKILL_ANALYSIS_SQL, (u, u)).fetchall(), sample),
+            "current": time_calls(db.get_skill_analysis, sample)
+        }
+    finally:
+        db.close()
+
+    for name, stats in results.items():
+        print(f"{name:>8}: " + ", ".join(f"{key}={value:.2f}" if isinstance(value, float) else f"{key}={value}"
+                                         for key, value in stats.items()))
+    print(f" speedup: {results['legacy']['mean_ms'] / results['current']['mean_ms']:.1f}x (mean)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+# praxis/benchmarks/groq_stub.py
+"""
+Local stand-in for the Groq chat completions API, for offline load tests and benchmarks.
+
+Speaks POST /openai/v1/chat/completions (plain and streaming), answers each prompt type
+the app uses with a canned or templated response, and can inject latency, 429s and errors.
+Point the app at it with:
+
+    python -m benchmarks.groq_stub --port 8765 --latency-ms 300
+    GROQ_API_URL=http://127.0.0.1:8765/openai/v1/chat/completions streamlit run main.py
+"""
+import json
+import time
+import uuid
+import random
+import hashlib
+import argparse
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+COMPLETIONS_PATH = "/openai/v1/chat/completions"
+
+# Prompt types, matched in order against the system prompt (lower-cased)
+PROMPT_TYPES: List[Tuple[str, str]] = [
+    ("score", "automated code grading"),
+    ("challenge_skills", "keys are skill names and values are relevance scores"),
+    ("code_skills", "code analysis expert"),
+    ("review", "expert code reviewer"),
+    ("learning_path", "curriculum designer"),
+    ("flowchart", "flowchart"),
+    ("complexity", "algorithm analysis expert"),
+    ("code", "code generator"),
+    ("improved_code", "code improvement expert"),
+    ("enhance", "structure and enhance it"),
+]
+
+SKILL_NAMES = ["Arrays/Lists", "Hash Tables", "Recursion", "Sorting", "Dynamic Programming",
+               "String Manipulation", "Time Complexity", "Error Handling"]
+
+PYTHON_SOLUTION = '''def solve(nums):
+    """Return the running sum of nums."""
+    total = 0
+    result = []
+    for value in nums:
+        total += value
+        result.append(total)
+    return result'''
+
+def default_response(kind: str, rng: random.Random, paragraphs: int) -> str:
+    """Build a deterministic response body of the given prompt type."""
+    if kind == "score":
+        return f"{rng.uniform(0.4, 1.0):.2f}"
+    if kind == "challenge_skills":
+        return json.dumps({name: round(rng.uniform(0.3, 1.0), 2) for name in rng.sample(SKILL_NAMES, 3)})
+    if kind == "code_skills":
+        return json.dumps({
+            "skills": {name: round(rng.uniform(0.2, 1.0), 2) for name in rng.sample(SKILL_NAMES, 4)},
+            "quality": round(rng.uniform(0.4, 0.95), 2),
+            "strengths": ["Clear variable names", "Handles the main case"],
+            "weaknesses": ["No input validation"]
+        }, indent=2)
+    if kind == "review":
+        return json.dumps({
+            "overall_rating": rng.randint(5, 9),
+            "strengths": ["Readable structure", "Simple control flow"],
+            "improvements": ["Add docstrings", "Validate inputs"],
+            "optimizations": ["Avoid repeated list copies"],
+            "potential_issues": ["Empty input is not handled"]
+        }, indent=2)
+    if kind == "learning_path":
+        return json.dumps([
+            {
+                "title": f"Step {i + 1}: {name}",
+                "description": f"implement an exercise that practises {name.lower()}",
+                "skills": [name],
+                "difficulty": min(5, i + 1)
+            }
+            for i, name in enumerate(rng.sample(SKILL_NAMES, 5))
+        ], indent=2)
+    if kind == "flowchart":
+        return ("Here is the approach:\n\n```mermaid\nflowchart TD\n"
+                "    A[Start] --> B[Read input]\n    B --> C{Input empty?}\n"
+                "    C -- Yes --> D[Return empty result]\n    C -- No --> E[Process each element]\n"
+                "    E --> F[Return result]\n```")
+    if kind == "complexity":
+        return ("Time Complexity: O(n) - each element is visited once.\n"
+                "Space Complexity: O(n) - the result list grows with the input.\n"
+                "Explanation: A single pass accumulates the running total.")
+    if kind in ("code", "improved_code"):
+        return f"```python\n{PYTHON_SOLUTION}\n```\n\nThe function walks the input once and keeps a running total."
+    if kind == "enhance":
+        return ("Implement a function that takes a list of integers and returns their running sum.\n\n"
+                "Requirements:\n- Handle an empty list\n- Handle negative numbers\n- Run in O(n) time")
+    text = ("This is a synthetic response from the Groq stub. It stands in for mentoring feedback, "
+            "explanations and insights so that page flows can be exercised without the real API. ")
+    return "\n\n".join(f"### Section {i + 1}\n\n{text * 3}" for i in range(paragraphs))
+
+def classify_prompt(messages: List[Dict[str, str]]) -> str:
+    """Identify which of the app's prompt types a request is."""
+    system = " ".join(m.get("content", "") for m in messages if m.get("role") == "system").lower()
+    for kind, marker in PROMPT_TYPES:
+        if marker in system:
+            return kind
+    return "text"
+
+def count_tokens(text: str) -> int:
+    """Rough token estimate (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+class StubConfig:
+    """Behaviour knobs for the stub server; fields may be changed while it runs."""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, token_delay_ms: float = 0.0,
+                 rate_limit_rate: float = 0.0, error_rate: float = 0.0, rpm_limit: int = 0,
+                 retry_after: float = 1.0, paragraphs: int = 3, chunk_chars: int = 16,
+                 responses: Optional[Dict[str, str]] = None, seed: int = 0):
+        """
+        Args:
+            latency_ms: Delay before the response (or the first streamed chunk)
+            jitter_ms: Uniform random extra delay on top of latency_ms
+            token_delay_ms: Delay between streamed chunks
+            rate_limit_rate: Probability of answering 429 Too Many Requests
+            error_rate: Probability of answering 500 Internal Server Error
+            rpm_limit: Requests per minute before answering 429 (0 = unlimited)
+            retry_after: Value of the Retry-After header on 429s, in seconds
+            paragraphs: Sections in free-text responses
+            chunk_chars: Characters per streamed chunk
+            responses: Overrides per prompt type; values may use {prompt} and {model}
+            seed: Seed for fault injection, so runs are reproducible
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.token_delay_ms = token_delay_ms
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self.rpm_limit = rpm_limit
+        self.retry_after = retry_after
+        self.paragraphs = paragraphs
+        self.chunk_chars = chunk_chars
+        self.responses = responses or {}
+        self.seed = seed
+
+class GroqStubServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering chat completions from a StubConfig."""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: Optional[StubConfig] = None):
+        """Bind the server; port 0 picks a free port."""
+        super().__init__((host, port), StubRequestHandler)
+        self.config = config or StubConfig()
+        self._fault_rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._recent = deque()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"requests": 0, "streamed": 0, "rate_limited": 0, "errors": 0, "by_type": {}}
+
+    @property
+    def url(self) -> str:
+        """Full chat completions URL, suitable for GROQ_API_URL."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{COMPLETIONS_PATH}"
+
+    def start(self) -> "GroqStubServer":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True, name="groq-stub")
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "GroqStubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def admit(self, kind: str, stream: bool) -> Optional[int]:
+        """Record a request and decide whether to fail it; returns an error status or None."""
+        config = self.config
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["streamed"] += int(stream)
+            self.stats["by_type"][kind] = self.stats["by_type"].get(kind, 0) + 1
+
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] > 60:
+                self._recent.popleft()
+            over_limit = config.rpm_limit and len(self._recent) >= config.rpm_limit
+            if not over_limit:
+                self._recent.append(now)
+
+            if over_limit or self._fault_rng.random() < config.rate_limit_rate:
+                self.stats["rate_limited"] += 1
+                return 429
+            if self._fault_rng.random() < config.error_rate:
+                self.stats["errors"] += 1
+                return 500
+            return None
+
+    def delay(self) -> float:
+        """Seconds to wait before answering."""
+        config = self.config
+        with self._lock:
+            jitter = self._fault_rng.uniform(0, config.jitter_ms) if config.jitter_ms else 0.0
+        return (config.latency_ms + jitter) / 1000
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Handles one chat completion request."""
+
+    server: GroqStubServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Keep load tests quiet."""
+
+    def do_POST(self) -> None:
+        if self.path.split("?")[0] != COMPLETIONS_PATH:
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}", "type": "not_found"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self.send_json(400, {"error": {"message": "Invalid JSON body", "type": "invalid_request_error"}})
+            return
+
+        messages = payload.get("messages", [])
+        model = payload.get("model", "stub")
+        stream = bool(payload.get("stream"))
+        kind = classify_prompt(messages)
+        config = self.server.config
+
+        status = self.server.admit(kind, stream)
+        time.sleep(self.server.delay())
+        if status == 429:
+            self.send_json(429, {"error": {"message": "Rate limit reached", "type": "requests",
+                                           "code": "rate_limit_exceeded"}},
+                           {"Retry-After": f"{config.retry_after:g}"})
+            return
+        if status:
+            self.send_json(status, {"error": {"message": "Injected server error", "type": "internal_server_error"}})
+            return
+
+        # Same request, same answer
+        digest = hashlib.sha256(json.dumps(messages, sort_keys=True).encode()).hexdigest()
+        rng = random.Random(int(digest[:16], 16))
+        prompt = messages[-1].get("content", "") if messages else ""
+        if kind in config.responses:
+            content = config.responses[kind].format(prompt=prompt, model=model)
+        else:
+            content = default_response(kind, rng, config.paragraphs)
+
+        usage = {
+            "prompt_tokens": sum(count_tokens(m.get("content", "")) for m in messages),
+            "completion_tokens": count_tokens(content)
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+
+        if stream:
+            self.send_stream(completion_id, model, content, usage)
+        else:
+            self.send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": "stop"}],
+                "usage": usage
+            })
+
+    def send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        """Write a complete JSON response."""
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_stream(self, completion_id: str, model: str, content: str, usage: Dict[str, int]) -> None:
+        """Write the completion as server-sent events, chunk by chunk."""
+        config = self.server.config
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def event(delta: Dict[str, str], finish_reason: Optional[str] = None, **extra: Any) -> None:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            }
+            chunk.update(extra)
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+
+        try:
+            event({"role": "assistant", "content": ""})
+            for start in range(0, len(content), config.chunk_chars):
+                if config.token_delay_ms:
+                    time.sleep(config.token_delay_ms / 1000)
+                event({"content": content[start:start + config.chunk_chars]})
+            # Groq reports usage on the final chunk under x_groq
+            event({}, "stop", x_groq={"id": completion_id, "usage": usage})
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+def main() -> None:
+    """Command-line entry point: run the stub until interrupted."""
+    parser = argparse.ArgumentParser(description="Offline Groq-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--token-delay-ms", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Probability of a 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 500")
+    parser.add_argument("--rpm-limit", type=int, default=0, help="Requests per minute before 429s (0 = off)")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--responses", help="JSON file mapping prompt types to response templates")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    responses = None
+    if args.responses:
+        with open(args.responses) as f:
+            responses = json.load(f)
+
+    config = StubConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, token_delay_ms=args.token_delay_ms,
+        rate_limit_rate=args.rate_limit_rate, error_rate=args.error_rate, rpm_limit=args.rpm_limit,
+        retry_after=args.retry_after, responses=responses, seed=args.seed
+    )
+    server = GroqStubServer(args.host, args.port, config)
+    print(f"Groq stub listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+# praxis/benchmarks/load_harness.py
+"""
+End-to-end load harness: N simulated students walk the learning workflow headlessly.
+
+Each student is a Streamlit AppTest session running main.py against the local Groq stub.
+It walks start -> challenge -> feedback -> flowchart -> solution. The harness records
+per-step latency percentiles and the time spent inside Database calls, which includes
+any wait for SQLite's write lock.
+
+Run from the praxis directory:
+    python -m benchmarks.load_harness --students 30 --latency-ms 400 --output load_report.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+import datetime
+import tempfile
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.groq_stub import GroqStubServer, StubConfig
+from benchmarks.timing import summarize
+
+PRAXIS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(PRAXIS_DIR, "main.py")
+
+STEPS = ["start", "challenge", "feedback", "flowchart", "solution"]
+
+PROBLEMS = [
+    "Create a function that returns the running sum of a list of integers.",
+    "Create a function that checks whether a string is a palindrome, ignoring punctuation.",
+    "Create a function that merges two sorted lists into one sorted list.",
+    "Create a function that counts word frequencies in a paragraph.",
+    "Create a function that finds the first non-repeating character in a string."
+]
+
+STUDENT_CODE = '''def solve(nums):
+    result = []
+    total = 0
+    for n in nums:
+        total += n
+        result.append(total)
+    return result
+'''
+
+class DatabaseTimings:
+    """Collects the duration of every Database method call, across all sessions."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timings: Dict[str, List[float]] = {}
+        self.lock_errors = 0
+
+    def record(self, name: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.timings.setdefault(name, []).append(elapsed_ms)
+
+    def record_lock_error(self) -> None:
+        with self._lock:
+            self.lock_errors += 1
+
+def instrument_database(timings: DatabaseTimings) -> None:
+    """Wrap every public Database method so its wall time (including lock waits) is recorded."""
+    from database.db_manager import Database
+
+    def wrap(name: str, method: Callable) -> Callable:
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if "locked" in str(e) or "busy" in str(e):
+                    timings.record_lock_error()
+                raise
+            finally:
+                timings.record(name, (time.perf_counter() - start) * 1000)
+        timed.__wrapped_for_load__ = True
+        return timed
+
+    for name in dir(Database):
+        method = getattr(Database, name)
+        if name.startswith("_") or name == "close" or not callable(method):
+            continue
+        if getattr(method, "__wrapped_for_load__", False):
+            continue
+        setattr(Database, name, wrap(name, method))
+
+def share_test_runtime() -> None:
+    """
+    Make AppTest safe to run in concurrent threads, the way a real server shares one runtime.
+
+    Each AppTest run installs process-wide state on entry and removes it on exit, pulling
+    it out from under sessions still running in other threads:
+    - the mock Runtime singleton ("Runtime hasn't been created!"), so lookups fall back
+      to a shared mock;
+    - the "global.appTest" config patch (widget KeyErrors), so it is applied once for
+      the whole load run;
+    - a fresh script cache, whose concurrent compiles of main.py trip a CPython 3.11
+      parser bug ("AST constructor recursion depth mismatch"), so all runs share one.
+    """
+    import contextlib
+    from unittest.mock import MagicMock
+    from streamlit import config
+    from streamlit.testing.v1 import app_test, local_script_runner
+    from streamlit.testing.v1.util import build_mock_config_get_option
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+
+    shared = MagicMock(spec=Runtime)
+    shared.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    shared.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: cls._instance or shared)
+    Runtime.exists = classmethod(lambda cls: True)
+
+    config.get_option = build_mock_config_get_option({"global.appTest": True})
+    app_test.patch_config_options = lambda overrides: contextlib.nullcontext()
+
+    script_cache = ScriptCache()
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+
+def find_button(at, label: str):
+    """Find a rendered button by its label."""
+    for button in at.button:
+        if button.label == label:
+            return button
+    raise LookupError(f"Button '{label}' not found on page '{at.session_state['page']}'")
+
+def run_student(index: int, user_id: str, username: str, timeout: float, think_seconds: float,
+                seed: int) -> Dict[str, Any]:
+    """Walk one student through the workflow and return per-step timings and errors."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed + index)
+    steps: Dict[str, float] = {}
+    errors: List[str] = []
+
+    at = AppTest.from_file(MAIN_SCRIPT, default_timeout=timeout)
+    at.session_state["user_id"] = user_id
+    at.session_state["username"] = username
+
+    def timed_run(step: str) -> None:
+        start = time.perf_counter()
+        at.run()
+        steps[step] = steps.get(step, 0.0) + (time.perf_counter() - start) * 1000
+        if at.exception:
+            errors.append(f"{step}: {at.exception[0].value}")
+        for error in at.error:
+            errors.append(f"{step}: {error.value}")
+
+    def navigate(page: str) -> None:
+        at.session_state["page"] = page
+
+    try:
+        # Initial load with the API key entered
+        at.run()
+        at.sidebar.text_input[0].input("stub-key")
+        at.run()
+
+        # start: describe a problem and generate the challenge
+        at.text_area[0].input(rng.choice(PROBLEMS))
+        find_button(at, "Start Learning").click()
+        timed_run("start")
+        time.sleep(think_seconds)
+
+        # challenge: render the page, submit code for analysis and scoring
+        navigate("challenge")
+        at.session_state["user_code"] = STUDENT_CODE
+        timed_run("challenge")
+        find_button(at, "Analyze My Code").click()
+        timed_run("challenge")
+        time.sleep(think_seconds)
+
+        # feedback: submit a revision
+        navigate("feedback")
+        timed_run("feedback")
+        find_button(at, "Analyze Revision").click()
+        timed_run("feedback")
+        time.sleep(think_seconds)
+
+        # flowchart: generate the flowchart, then open its page
+        find_button(at, "Show Flowchart").click()
+        timed_run("flowchart")
+        navigate("flowchart")
+        timed_run("flowchart")
+        time.sleep(think_seconds)
+
+        # solution: generate the solution and its explanations
+        navigate("solution")
+        timed_run("solution")
+    except Exception as e:
+        errors.append(f"harness: {type(e).__name__}: {e}")
+
+    return {"student": index, "steps": steps, "errors": errors}
+
+def create_students(count: int, run_id: str) -> List[Dict[str, str]]:
+    """Register the simulated students directly in the database."""
+    from database.db_manager import Database
+
+    db = Database()
+    try:
+        students = []
+        for i in range(count):
+            username = f"load_{run_id}_{i}"
+            user_id = db.create_user(username, "load-test")
+            students.append({"user_id": user_id, "username": username})
+        return students
+    finally:
+        db.close()
+
+def run_load(students: int, concurrency: int, ramp_seconds: float, think_seconds: float,
+             timeout: float, seed: int) -> Dict[str, Any]:
+    """Run the simulated class and aggregate the results."""
+    timings = DatabaseTimings()
+    instrument_database(timings)
+    share_test_runtime()
+
+    run_id = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+    accounts = create_students(students, run_id)
+
+    results = []
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="student") as pool:
+        futures = []
+        for i, account in enumerate(accounts):
+            futures.append(pool.submit(run_student, i, account["user_id"], account["username"],
+                                       timeout, think_seconds, seed))
+            if ramp_seconds and students > 1:
+                time.sleep(ramp_seconds / (students - 1))
+        for future in futures:
+            results.append(future.result())
+    elapsed = time.perf_counter() - started
+
+    step_report = {
+        step: summarize([r["steps"][step] for r in results if step in r["steps"]])
+        for step in STEPS
+    }
+    db_report = {name: summarize(values) for name, values in sorted(timings.timings.items())}
+    errors = [error for r in results for error in r["errors"]]
+
+    return {
+        "wall_seconds": elapsed,
+        "completed_students": sum(1 for r in results if not r["errors"]),
+        "steps": step_report,
+        "database": db_report,
+        "database_lock_errors": timings.lock_errors,
+        "errors": errors[:100],
+        "error_count": len(errors)
+    }
+
+def main() -> None:
+    """Command-line entry point: start the stub, run the load and write the report."""
+    parser = argparse.ArgumentParser(description="Headless end-to-end load test against the Groq stub")
+    parser.add_argument("--students", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=0, help="Simultaneous sessions (default: all)")
+    parser.add_argument("--ramp-seconds", type=float, default=0.0, help="Spread session starts over this time")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Pause between workflow steps")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-run AppTest timeout in seconds")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Stub latency per LLM call")
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--token-delay-ms", type=float, default=5.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--workdir", help="Directory for the test database (default: a fresh temp dir)")
+    parser.add_argument("--llm-cache", action="store_true", help="Keep the LLM response cache enabled")
+    parser.add_argument("--client-rate-limits", action="store_true",
+                        help="Keep the client-side requests/tokens per minute budget enabled")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="load_report.json")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output)
+    config = StubConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, token_delay_ms=args.token_delay_ms,
+                        rate_limit_rate=args.rate_limit_rate, error_rate=args.error_rate, seed=args.seed)
+
+    with GroqStubServer(config=config) as stub:
+        # Settings are read at import time, so the environment must be ready before
+        # the app modules are imported
+        os.environ["GROQ_API_URL"] = stub.url
+        if not args.llm_cache:
+            os.environ["LLM_CACHE_ENABLED"] = "0"
+        if not args.client_rate_limits:
+            os.environ["GROQ_REQUESTS_PER_MINUTE"] = "0"
+            os.environ["GROQ_TOKENS_PER_MINUTE"] = "0"
+        workdir = args.workdir or tempfile.mkdtemp(prefix="praxis_load_")
+        os.environ.setdefault("LLM_CACHE_PATH", os.path.join(workdir, "llm_cache.db"))
+        os.chdir(workdir)
+        if PRAXIS_DIR not in sys.path:
+            sys.path.insert(0, PRAXIS_DIR)
+
+        report = run_load(args.students, args.concurrency or args.students, args.ramp_seconds,
+                          args.think_ms / 1000, args.timeout, args.seed)
+        report["stub"] = stub.stats
+        report["meta"] = {
+            "timestamp": datetime.datetime.now().isoformat(),
+            "students": args.students,
+            "concurrency": args.concurrency or args.students,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "token_delay_ms": args.token_delay_ms,
+            "workdir": workdir
+        }
+
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+    print(f"{report['completed_students']}/{args.students} students completed in {report['wall_seconds']:.1f}s")
+    for step in STEPS:
+        stats = report["steps"][step]
+        if stats.get("calls"):
+            print(f"{step:10} p50={stats['p50_ms']:8.0f}ms  p95={stats['p95_ms']:8.0f}ms  max={stats['max_ms']:8.0f}ms")
+    writes = {name: stats for name, stats in report["database"].items()
+              if name in ("store_attempt", "update_user_skills", "store_challenge", "map_challenge_skills")}
+    for name, stats in writes.items():
+        print(f"db.{name:22} p95={stats['p95_ms']:7.1f}ms  max={stats['max_ms']:7.1f}ms")
+    print(f"Database lock errors: {report['database_lock_errors']}, other errors: {report['error_count']}")
+    print(f"Report written to {output}")
+
+if __name__ == "__main__":
+    main()
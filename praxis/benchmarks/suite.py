@@ -0,0 +1,210 @@
+# praxis/benchmarks/suite.py
+"""
+Benchmark suite for every public Database method.
+
+Builds (or reuses) a synthetic database, times each method against a sample of
+users, challenges and paths, and writes a JSON report that can be compared across commits.
+Write methods run against a throwaway copy so the dataset stays identical between runs.
+
+Run from the praxis directory:
+    python -m benchmarks.suite --users 10000 --attempts 1000000 --output bench_report.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import inspect
+import argparse
+import datetime
+import platform
+import tempfile
+import subprocess
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from database.db_manager import Database
+from benchmarks.synthetic import build_synthetic_db
+from benchmarks.timing import time_calls
+
+# Methods that are not part of the data API
+EXCLUDED_METHODS = {"create_tables", "close"}
+
+def git_commit() -> Optional[str]:
+    """Current commit hash, if the benchmark runs inside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def table_counts(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Row counts of the main tables, recorded with the report."""
+    tables = ["users", "challenges", "challenge_skills", "attempts", "user_skills",
+              "learning_paths", "learning_path_items", "skills"]
+    return {table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0] for table in tables}
+
+def sample_ids(db: Database, samples: int, seed: int = 0) -> Dict[str, List[Any]]:
+    """Pick users (heaviest first, then random), challenges, paths and skills to query."""
+    rng = random.Random(seed)
+    conn = db.conn
+    heavy = [row[0] for row in conn.execute(
+        'SELECT user_id FROM user_stats ORDER BY total_attempts DESC LIMIT ?', (max(1, samples // 10),))]
+    users = [row[0] for row in conn.execute('SELECT user_id FROM users')]
+    challenges = [row[0] for row in conn.execute('SELECT challenge_id FROM challenges')]
+    paths = [row[0] for row in conn.execute('SELECT path_id FROM learning_paths')]
+    skills = [row[0] for row in conn.execute('SELECT skill_id FROM skills')]
+    return {
+        "users": heavy + rng.sample(users, min(len(users), samples - len(heavy))),
+        "challenges": rng.sample(challenges, min(len(challenges), samples)),
+        "paths": rng.sample(paths, min(len(paths), samples)),
+        "skills": skills
+    }
+
+def read_benchmarks(db: Database, ids: Dict[str, List[Any]]) -> Dict[str, Tuple[Callable, List[Any]]]:
+    """Read-only methods, each with the arguments to call it with."""
+    users = ids["users"]
+    rng = random.Random(1)
+    user_skill_pairs = [(user_id, rng.choice(ids["skills"])) for user_id in users]
+    return {
+        "get_user_skills": (db.get_user_skills, users),
+        "get_user_weakest_skills": (db.get_user_weakest_skills, users),
+        "get_user_strongest_skills": (db.get_user_strongest_skills, users),
+        "get_recommended_challenges": (db.get_recommended_challenges, users),
+        "get_user_progress": (db.get_user_progress, users),
+        "get_user_challenge_history": (db.get_user_challenge_history, users),
+        "get_activity_patterns": (db.get_activity_patterns, users),
+        "get_user_recent_attempts": (db.get_user_recent_attempts, users),
+        "get_skill_progress_over_time": (lambda pair: db.get_skill_progress_over_time(*pair), user_skill_pairs),
+        "get_learning_paths": (lambda _: db.get_learning_paths(), range(min(20, len(users)))),
+        "get_learning_path_challenges": (db.get_learning_path_challenges, ids["paths"]),
+        "get_skill_analysis": (db.get_skill_analysis, users)
+    }
+
+def write_benchmarks(db: Database, ids: Dict[str, List[Any]]) -> Dict[str, Tuple[Callable, List[Any]]]:
+    """Write methods, each with the arguments to call it with."""
+    rng = random.Random(2)
+    users = ids["users"]
+    challenges = ids["challenges"]
+    n = len(users)
+    run = datetime.datetime.now().strftime("%H%M%S%f")
+    skill_names = [row[0] for row in db.conn.execute('SELECT name FROM skills')]
+
+    new_users = [f"bench_{run}_{i}" for i in range(n)]
+    paths = []
+
+    def create_path(i: int) -> None:
+        paths.append(db.get_or_create_learning_path(f"Bench path {run} {i}", "Benchmark path", "Python"))
+
+    return {
+        "create_user": (lambda name: db.create_user(name, "secret"), new_users),
+        "authenticate_user": (lambda name: db.authenticate_user(name, "secret"), new_users),
+        "store_challenge": (lambda i: db.store_challenge(f"Bench challenge {i}", "Prompt", "Python"), range(n)),
+        "update_challenge_solution": (lambda c: db.update_challenge_solution(c, "def solve():\n    pass"), challenges),
+        "map_challenge_skills": (
+            lambda c: db.map_challenge_skills(c, {name: rng.random() for name in rng.sample(skill_names, 3)}),
+            challenges),
+        "store_attempt": (
+            lambda u: db.store_attempt(u, rng.choice(challenges), "pass", "", rng.random(), 120, 1, rng.random() > 0.8),
+            users),
+        "update_user_skills": (lambda u: db.update_user_skills(u, rng.choice(challenges), rng.random()), users),
+        "update_user_skills_bulk": (
+            lambda _: db.update_user_skills_bulk([(rng.choice(users), rng.choice(challenges), rng.random())
+                                                  for _ in range(100)]),
+            range(max(1, n // 10))),
+        "save_user_skill_scores": (
+            lambda u: db.save_user_skill_scores(u, {name: rng.random() for name in rng.sample(skill_names, 3)}),
+            users),
+        "get_or_create_learning_path": (create_path, range(n)),
+        "add_challenge_to_path": (
+            lambda i: db.add_challenge_to_path(paths[i % len(paths)], rng.choice(challenges), i), range(n)),
+        "create_learning_path_bulk": (
+            lambda i: db.create_learning_path_bulk(f"Bulk path {run} {i}", "Benchmark path", "Python", [
+                {"title": f"Bulk challenge {i}.{j}", "enhanced_prompt": "Prompt", "difficulty": 2,
+                 "skills": {name: 0.8 for name in rng.sample(skill_names, 2)}}
+                for j in range(6)
+            ]),
+            range(max(1, n // 10)))
+    }
+
+def run_suite(db_path: str, samples: int = 200) -> Dict[str, Any]:
+    """Time every public Database method on an existing database and return the report."""
+    report: Dict[str, Any] = {"results": {}}
+    db = Database(db_path)
+    try:
+        ids = sample_ids(db, samples)
+        report["dataset"] = table_counts(db.conn)
+        for name, (func, args) in read_benchmarks(db, ids).items():
+            report["results"][name] = time_calls(func, list(args))
+    finally:
+        db.close()
+
+    # Writes go to a copy so repeated runs see the same data
+    with tempfile.TemporaryDirectory(prefix="praxis_bench_") as workdir:
+        copy_path = os.path.join(workdir, "bench_copy.db")
+        source = sqlite3.connect(db_path)
+        target = sqlite3.connect(copy_path)
+        source.backup(target)
+        source.close()
+        target.close()
+
+        db = Database(copy_path)
+        try:
+            for name, (func, args) in write_benchmarks(db, ids).items():
+                report["results"][name] = time_calls(func, list(args))
+        finally:
+            db.close()
+
+    public = {name for name, _ in inspect.getmembers(Database, inspect.isfunction)
+              if not name.startswith("_") and name not in EXCLUDED_METHODS}
+    report["not_benchmarked"] = sorted(public - set(report["results"]))
+    return report
+
+def main() -> None:
+    """Command-line entry point: build or reuse a dataset, run the suite and write the report."""
+    parser = argparse.ArgumentParser(description="Benchmark all public Database methods")
+    parser.add_argument("--db", default="./praxis_bench.db")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--challenges", type=int, default=2000)
+    parser.add_argument("--attempts", type=int, default=1000000)
+    parser.add_argument("--paths", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--samples", type=int, default=200, help="Calls per method")
+    parser.add_argument("--rebuild", action="store_true", help="Regenerate the database even if it exists")
+    parser.add_argument("--output", default="bench_report.json", help="Where to write the JSON report")
+    parser.add_argument("--label", default="", help="Free-form label stored in the report")
+    args = parser.parse_args()
+
+    build_seconds = None
+    if args.rebuild or not os.path.exists(args.db):
+        start = time.perf_counter()
+        build_synthetic_db(args.db, users=args.users, challenges=args.challenges, attempts=args.attempts,
+                           paths=args.paths, seed=args.seed)
+        build_seconds = time.perf_counter() - start
+
+    report = run_suite(args.db, samples=args.samples)
+    report["meta"] = {
+        "label": args.label,
+        "timestamp": datetime.datetime.now().isoformat(),
+        "git_commit": git_commit(),
+        "python": sys.version.split()[0],
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "samples": args.samples,
+        "seed": args.seed,
+        "build_seconds": build_seconds
+    }
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+    for name, stats in sorted(report["results"].items()):
+        print(f"{name:32} mean={stats['mean_ms']:8.2f}ms  p95={stats['p95_ms']:8.2f}ms  max={stats['max_ms']:8.2f}ms")
+    if report["not_benchmarked"]:
+        print("Not benchmarked: " + ", ".join(report["not_benchmarked"]))
+    print(f"Report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
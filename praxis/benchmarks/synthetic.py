@@ -0,0 +1,151 @@
+# praxis/benchmarks/synthetic.py
+"""
+Synthetic data generator for database benchmarks.
+
+Builds a database through the normal Database/migration path, then bulk-loads users,
+challenges, skill mappings and attempts so the rollup triggers run as they do in production.
+"""
+import os
+import uuid
+import random
+import hashlib
+import argparse
+import itertools
+import datetime
+from typing import Dict, List
+
+from config import PROGRAMMING_LANGUAGES
+from database.db_manager import Database
+from database.migrations import run_migrations
+
+# Rows per executemany batch while loading attempts
+BATCH_SIZE = 10000
+
+def build_synthetic_db(db_path: str, users: int = 10000, challenges: int = 2000, attempts: int = 1000000,
+                       paths: int = 200, path_length: int = 8, skills_per_challenge: int = 3,
+                       days: int = 365, seed: int = 42) -> Dict[str, List[str]]:
+    """
+    Create (or replace) a database filled with synthetic platform history.
+
+    Args:
+        db_path: Path of the database file to create
+        users: Number of users
+        challenges: Number of challenges
+        attempts: Number of attempts, spread across users and challenges
+        paths: Number of learning paths
+        path_length: Challenges per learning path
+        skills_per_challenge: Skills mapped to each challenge
+        days: Attempts are spread over this many days before now
+        seed: Random seed, for reproducible datasets
+
+    Returns:
+        Dictionary with the generated user_ids, challenge_ids and path_ids
+    """
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+    rng = random.Random(seed)
+    db = Database(db_path)
+    conn = db.conn
+    try:
+        # The pool may have migrated a previous file at this path in this process
+        run_migrations(conn)
+        password_hash = hashlib.sha256(b"benchmark").hexdigest()
+        user_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(users)]
+        conn.executemany(
+            'INSERT INTO users (user_id, username, password_hash) VALUES (?, ?, ?)',
+            [(user_id, f"user{i}", password_hash) for i, user_id in enumerate(user_ids)]
+        )
+
+        lang_ids = [row[0] for row in conn.execute(
+            'SELECT lang_id FROM programming_languages WHERE name IN ({})'.format(
+                ", ".join("?" for _ in PROGRAMMING_LANGUAGES)), PROGRAMMING_LANGUAGES)]
+        skill_ids = [row[0] for row in conn.execute('SELECT skill_id FROM skills')]
+
+        challenge_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(challenges)]
+        difficulties = {}
+        challenge_rows = []
+        mapping_rows = []
+        for i, challenge_id in enumerate(challenge_ids):
+            difficulties[challenge_id] = rng.randint(1, 5)
+            challenge_rows.append((challenge_id, f"Challenge {i}", f"Synthetic challenge {i}",
+                                   f"Enhanced prompt {i}", difficulties[challenge_id], rng.choice(lang_ids)))
+            for skill_id in rng.sample(skill_ids, min(skills_per_challenge, len(skill_ids))):
+                mapping_rows.append((challenge_id, skill_id, round(rng.uniform(0.3, 1.0), 2)))
+        conn.executemany(
+            'INSERT INTO challenges (challenge_id, title, description, enhanced_prompt, difficulty, lang_id) '
+            'VALUES (?, ?, ?, ?, ?, ?)', challenge_rows)
+        conn.executemany(
+            'INSERT INTO challenge_skills (challenge_id, skill_id, relevance) VALUES (?, ?, ?)', mapping_rows)
+        conn.commit()
+
+        path_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(paths)]
+        conn.executemany(
+            'INSERT INTO learning_paths (path_id, title, description, difficulty, lang_id, ordering) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            [(path_id, f"Path {i}", f"Synthetic learning path {i}", rng.randint(1, 5), rng.choice(lang_ids), '[]')
+             for i, path_id in enumerate(path_ids)]
+        )
+        conn.executemany(
+            'INSERT INTO learning_path_items (path_id, challenge_id, position) VALUES (?, ?, ?)',
+            [(path_id, challenge_id, position)
+             for path_id in path_ids
+             for position, challenge_id in enumerate(rng.sample(challenge_ids, min(path_length, len(challenge_ids))))]
+        )
+        conn.commit()
+
+        # Activity is skewed: a minority of users make most attempts
+        cum_weights = list(itertools.accumulate(1.0 / (rank + 1) ** 0.8 for rank in range(users)))
+        start = datetime.datetime.now() - datetime.timedelta(days=days)
+        remaining = attempts
+        while remaining > 0:
+            batch = []
+            for user_id in rng.choices(user_ids, cum_weights=cum_weights, k=min(BATCH_SIZE, remaining)):
+                challenge_id = rng.choice(challenge_ids)
+                score = round(min(1.0, max(0.0, rng.gauss(0.75 - 0.08 * difficulties[challenge_id], 0.2))), 3)
+                created_at = start + datetime.timedelta(seconds=rng.randrange(days * 86400))
+                batch.append((
+                    str(uuid.UUID(int=rng.getrandbits(128))), user_id, challenge_id, "pass", "", score,
+                    rng.randint(30, 3600), rng.randint(1, 5), score > 0.8,
+                    created_at.strftime("%Y-%m-%d %H:%M:%S")
+                ))
+            conn.executemany(
+                'INSERT INTO attempts (attempt_id, user_id, challenge_id, code, feedback, score, time_spent, '
+                'attempt_number, successful, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', batch)
+            conn.commit()
+            remaining -= len(batch)
+
+        # Derive proficiencies from the generated history in one pass
+        conn.execute('''
+            INSERT OR REPLACE INTO user_skills (user_id, skill_id, proficiency)
+            SELECT a.user_id, cs.skill_id, MIN(1.0, AVG(a.score * cs.relevance))
+            FROM attempts a
+            JOIN challenge_skills cs ON a.challenge_id = cs.challenge_id
+            GROUP BY a.user_id, cs.skill_id
+        ''')
+        conn.commit()
+        conn.execute('ANALYZE')
+        conn.commit()
+    finally:
+        db.close()
+
+    return {"user_ids": user_ids, "challenge_ids": challenge_ids, "path_ids": path_ids}
+
+def main() -> None:
+    """Command-line entry point: build a synthetic database."""
+    parser = argparse.ArgumentParser(description="Build a synthetic Praxis database for benchmarks")
+    parser.add_argument("--db", default="./praxis_bench.db", help="Database file to create")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--challenges", type=int, default=2000)
+    parser.add_argument("--attempts", type=int, default=1000000)
+    parser.add_argument("--paths", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    build_synthetic_db(args.db, users=args.users, challenges=args.challenges,
+                       attempts=args.attempts, paths=args.paths, seed=args.seed)
+    print(f"Wrote {args.db}")
+
+if __name__ == "__main__":
+    main()
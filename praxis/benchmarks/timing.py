@@ -0,0 +1,31 @@
+# praxis/benchmarks/timing.py
+import time
+import statistics
+from typing import Any, Callable, Dict, Iterable, List
+
+def summarize(timings_ms: List[float]) -> Dict[str, float]:
+    """Summarise latencies in milliseconds as count, mean and percentiles."""
+    if not timings_ms:
+        return {"calls": 0}
+    ordered = sorted(timings_ms)
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+    return {
+        "calls": len(ordered),
+        "mean_ms": statistics.mean(ordered),
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": ordered[-1]
+    }
+
+def time_calls(func: Callable[[Any], object], args: Iterable[Any]) -> Dict[str, float]:
+    """Call func once per argument and summarise the latencies."""
+    timings = []
+    for arg in args:
+        start = time.perf_counter()
+        func(arg)
+        timings.append((time.perf_counter() - start) * 1000)
+    return summarize(timings)
@@ -4,6 +4,12 @@ import os
 # Database configuration
 DB_PATH = "./praxis_data.db"
 
+# SQLite connection pool and pragmas
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 16))
+DB_BUSY_TIMEOUT_MS = int(os.environ.get("DB_BUSY_TIMEOUT_MS", 5000))
+DB_CACHE_SIZE_KB = int(os.environ.get("DB_CACHE_SIZE_KB", 16384))
+DB_MMAP_SIZE_MB = int(os.environ.get("DB_MMAP_SIZE_MB", 256))
+
 # Supported programming languages
 PROGRAMMING_LANGUAGES = [
     "Python", "JavaScript", "Java", "C++", "C#", "Go", 
@@ -63,10 +69,78 @@ DEFAULT_SKILLS = [
     ("C++ STL", "language_specific")
 ]
 
+# Skill proficiency: weight kept from the previous value on each attempt (exponential moving average)
+SKILL_EMA_DECAY = 0.7
+
+# Users whose attempted-challenge sets the in-memory recommendation index keeps
+RECOMMENDER_MAX_USERS = int(os.environ.get("RECOMMENDER_MAX_USERS", 10000))
+
+# In-memory NumPy proficiency engine (single-process deployments; needs numpy)
+PROFICIENCY_ENGINE_ENABLED = os.environ.get("PROFICIENCY_ENGINE_ENABLED", "0") != "0"
+# Write changed proficiencies back to user_skills after this many seconds or changed cells
+PROFICIENCY_CHECKPOINT_SECONDS = float(os.environ.get("PROFICIENCY_CHECKPOINT_SECONDS", 30))
+PROFICIENCY_CHECKPOINT_CELLS = int(os.environ.get("PROFICIENCY_CHECKPOINT_CELLS", 1000))
+
+# user_skills replay (python -m database.replay): worker processes and attempts read per query
+REPLAY_WORKERS = int(os.environ.get("REPLAY_WORKERS", os.cpu_count() or 1))
+REPLAY_CHUNK_SIZE = int(os.environ.get("REPLAY_CHUNK_SIZE", 10000))
+
 # Groq API configuration
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_API_URL = os.environ.get("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
 GROQ_DEFAULT_MODEL = "llama3-70b-8192"
 GROQ_API_KEY = os.environ.get("GROQ_API_KEY")
 
+# Groq HTTP client configuration
+GROQ_POOL_CONNECTIONS = int(os.environ.get("GROQ_POOL_CONNECTIONS", 4))
+GROQ_POOL_MAXSIZE = int(os.environ.get("GROQ_POOL_MAXSIZE", 32))
+GROQ_CONNECT_TIMEOUT = float(os.environ.get("GROQ_CONNECT_TIMEOUT", 5.0))
+GROQ_READ_TIMEOUT = float(os.environ.get("GROQ_READ_TIMEOUT", 120.0))
+
+# Groq retries and client-side rate limits (0 disables a limit).
+# Defaults match the published free-tier limits for the default model.
+GROQ_MAX_RETRIES = int(os.environ.get("GROQ_MAX_RETRIES", 4))
+GROQ_BACKOFF_BASE = float(os.environ.get("GROQ_BACKOFF_BASE", 0.5))
+GROQ_BACKOFF_MAX = float(os.environ.get("GROQ_BACKOFF_MAX", 20.0))
+GROQ_REQUESTS_PER_MINUTE = int(os.environ.get("GROQ_REQUESTS_PER_MINUTE", 30))
+GROQ_TOKENS_PER_MINUTE = int(os.environ.get("GROQ_TOKENS_PER_MINUTE", 6000))
+# API keys whose rate-limit state is kept (each session may use its own key)
+GROQ_RATE_LIMITER_MAX_KEYS = int(os.environ.get("GROQ_RATE_LIMITER_MAX_KEYS", 1000))
+GROQ_RATE_LIMIT_MAX_WAIT = float(os.environ.get("GROQ_RATE_LIMIT_MAX_WAIT", 60.0))
+
+# LLM response cache configuration
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "1") != "0"
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", "./praxis_llm_cache.db")
+LLM_CACHE_TTL = int(os.environ.get("LLM_CACHE_TTL", 7 * 24 * 3600))
+LLM_CACHE_MEMORY_ENTRIES = int(os.environ.get("LLM_CACHE_MEMORY_ENTRIES", 512))
+LLM_CACHE_DISK_ENTRIES = int(os.environ.get("LLM_CACHE_DISK_ENTRIES", 20000))
+
+# Share one upstream call between identical concurrent non-streaming requests
+LLM_SINGLE_FLIGHT_ENABLED = os.environ.get("LLM_SINGLE_FLIGHT_ENABLED", "1") != "0"
+
+# LLM call metrics (LLM_METRICS_PORT=0 disables the Prometheus /metrics endpoint)
+LLM_METRICS_RECENT_CALLS = int(os.environ.get("LLM_METRICS_RECENT_CALLS", 200))
+LLM_METRICS_PORT = int(os.environ.get("LLM_METRICS_PORT", 0))
+ADMIN_USERS = [name.strip() for name in os.environ.get("PRAXIS_ADMIN_USERS", "").split(",") if name.strip()]
+
+# Sandboxed test execution limits (per test case)
+TEST_TIMEOUT_SECONDS = float(os.environ.get("TEST_TIMEOUT_SECONDS", 5.0))
+TEST_CPU_LIMIT_SECONDS = int(os.environ.get("TEST_CPU_LIMIT_SECONDS", 2))
+TEST_MEMORY_LIMIT_MB = int(os.environ.get("TEST_MEMORY_LIMIT_MB", 256))
+# Identity isolated jobs run as when the app runs as root (default: nobody)
+TEST_SANDBOX_UID = int(os.environ.get("TEST_SANDBOX_UID", 65534))
+TEST_SANDBOX_GID = int(os.environ.get("TEST_SANDBOX_GID", 65534))
+# Wait before generating a challenge's test cases again after no usable case was found
+TEST_CASE_RETRY_SECONDS = float(os.environ.get("TEST_CASE_RETRY_SECONDS", 600))
+
+# Warm sandbox worker pool
+TEST_POOL_SIZE = int(os.environ.get("TEST_POOL_SIZE", min(8, os.cpu_count() or 2)))
+TEST_WORKER_MAX_JOBS = int(os.environ.get("TEST_WORKER_MAX_JOBS", 50))
+
+# Background jobs (learning path generation)
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 4))
+JOB_POLL_SECONDS = float(os.environ.get("JOB_POLL_SECONDS", 2.0))
+# Concurrent enhance_prompt calls while materialising one learning path
+PATH_ENHANCE_CONCURRENCY = int(os.environ.get("PATH_ENHANCE_CONCURRENCY", 4))
+
 # Application modes
 APP_MODES = ["Learning Path", "Code Review", "Analytics"]
\ No newline at end of file
@@ -1,165 +1,41 @@
 # praxis/database/db_manager.py
 import os
+import json
 import uuid
 import hashlib
 import datetime
 import sqlite3
 from typing import Optional, List, Dict, Tuple, Any
 
-from config import DB_PATH, DEFAULT_SKILLS
+from config import DB_PATH, SKILL_EMA_DECAY
+from database.pool import get_connection_pool
+from database.migrations import run_migrations
+from database.skill_registry import get_skill_registry
+from database.recommendations import get_recommendation_index
+from database.proficiency_matrix import ProficiencyMatrix, get_proficiency_matrix
 
 class Database:
     """SQLite database for storing user data, challenges, and attempts."""
     
     def __init__(self, db_path=DB_PATH):
-        """Initialize the database connection and create tables if they don't exist."""
+        """Borrow a pooled database connection and migrate the schema if it is behind."""
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
-        self.create_tables()
+        self.pool = get_connection_pool(db_path)
+        self.conn = self.pool.acquire()
+        # The schema version only needs checking once per process, not on every rerun
+        if not self.pool.schema_ready:
+            self.create_tables()
+            self.pool.schema_ready = True
     
     def create_tables(self):
-        """Create necessary tables if they don't exist."""
-        cursor = self.conn.cursor()
-        
-        # Users table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            user_id TEXT PRIMARY KEY,
-            username TEXT UNIQUE,
-            password_hash TEXT,
-            email TEXT UNIQUE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            last_login TIMESTAMP
-        )
-        ''')
-        
-        # Programming languages table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS programming_languages (
-            lang_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE
-        )
-        ''')
-        
-        # Skills/concepts table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS skills (
-            skill_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE,
-            category TEXT
-        )
-        ''')
-        
-        # Challenges table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS challenges (
-            challenge_id TEXT PRIMARY KEY,
-            title TEXT,
-            description TEXT,
-            enhanced_prompt TEXT,
-            difficulty INTEGER,
-            lang_id INTEGER,
-            solution TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (lang_id) REFERENCES programming_languages(lang_id)
-        )
-        ''')
-        
-        # Challenge-skill mapping (many-to-many)
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS challenge_skills (
-            challenge_id TEXT,
-            skill_id INTEGER,
-            relevance REAL,
-            PRIMARY KEY (challenge_id, skill_id),
-            FOREIGN KEY (challenge_id) REFERENCES challenges(challenge_id),
-            FOREIGN KEY (skill_id) REFERENCES skills(skill_id)
-        )
-        ''')
-        
-        # User attempts table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS attempts (
-            attempt_id TEXT PRIMARY KEY,
-            user_id TEXT,
-            challenge_id TEXT,
-            code TEXT,
-            feedback TEXT,
-            score REAL,
-            time_spent INTEGER,
-            attempt_number INTEGER,
-            successful BOOLEAN,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(user_id),
-            FOREIGN KEY (challenge_id) REFERENCES challenges(challenge_id)
-        )
-        ''')
-        
-        # User skill proficiency table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS user_skills (
-            user_id TEXT,
-            skill_id INTEGER,
-            proficiency REAL,
-            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (user_id, skill_id),
-            FOREIGN KEY (user_id) REFERENCES users(user_id),
-            FOREIGN KEY (skill_id) REFERENCES skills(skill_id)
-        )
-        ''')
-        
-        # User preferences table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS user_preferences (
-            user_id TEXT PRIMARY KEY,
-            difficulty_preference INTEGER,
-            theme TEXT,
-            preferences JSON,
-            FOREIGN KEY (user_id) REFERENCES users(user_id)
-        )
-        ''')
-        
-        # Learning paths table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS learning_paths (
-            path_id TEXT PRIMARY KEY,
-            title TEXT,
-            description TEXT,
-            difficulty INTEGER,
-            lang_id INTEGER,
-            ordering JSON,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (lang_id) REFERENCES programming_languages(lang_id)
-        )
-        ''')
-        
-        # Learning path items
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS learning_path_items (
-            path_id TEXT,
-            challenge_id TEXT,
-            position INTEGER,
-            PRIMARY KEY (path_id, challenge_id),
-            FOREIGN KEY (path_id) REFERENCES learning_paths(path_id),
-            FOREIGN KEY (challenge_id) REFERENCES challenges(challenge_id)
-        )
-        ''')
-        
-        # Populate programming languages
-        langs = ["Python", "JavaScript", "Java", "C++", "C#", "Go", "Ruby", "PHP", "TypeScript", "Rust", "Swift", "Kotlin"]
-        for lang in langs:
-            cursor.execute('INSERT OR IGNORE INTO programming_languages (name) VALUES (?)', (lang,))
-        
-        # Populate skills/concepts with common programming concepts
-        for skill_name, category in DEFAULT_SKILLS:
-            cursor.execute('INSERT OR IGNORE INTO skills (name, category) VALUES (?, ?)', (skill_name, category))
-        
-        self.conn.commit()
+        """Bring the schema up to date by running any pending migrations."""
+        run_migrations(self.conn)
     
     def close(self):
-        """Close the database connection."""
+        """Return the database connection to the pool."""
         if self.conn:
-            self.conn.close()
+            self.pool.release(self.conn)
+            self.conn = None
     
     # User management methods
     def create_user(self, username: str, password: str, email: Optional[str] = None) -> Optional[str]:
@@ -217,31 +93,37 @@ class Database:
         return challenge_id
     
     def update_challenge_solution(self, challenge_id: str, solution: str) -> None:
-        """Update the solution for a challenge."""
+        """Update the solution for a challenge, discarding test cases checked against the old one."""
+        cursor = self.conn.cursor()
+        cursor.execute('UPDATE challenges SET solution = ?, test_cases = NULL WHERE challenge_id = ?',
+                       (solution, challenge_id))
+        self.conn.commit()
+    
+    def get_challenge_test_cases(self, challenge_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Get a challenge's stored test cases, or None if they have not been generated yet."""
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT test_cases FROM challenges WHERE challenge_id = ?', (challenge_id,))
+        row = cursor.fetchone()
+        if not row or row[0] is None:
+            return None
+        return json.loads(row[0])
+    
+    def set_challenge_test_cases(self, challenge_id: str, test_cases: List[Dict[str, Any]]) -> None:
+        """Store the test cases used to grade a challenge."""
         cursor = self.conn.cursor()
-        cursor.execute('UPDATE challenges SET solution = ? WHERE challenge_id = ?', (solution, challenge_id))
+        cursor.execute('UPDATE challenges SET test_cases = ? WHERE challenge_id = ?', (json.dumps(test_cases), challenge_id))
         self.conn.commit()
     
     def map_challenge_skills(self, challenge_id: str, skill_relevance: Dict[str, float]) -> None:
         """Map a challenge to relevant skills with relevance scores."""
+        # Resolve names in memory, creating any unknown skills in one batch
+        skill_ids = get_skill_registry(self.db_path).resolve(self.conn, skill_relevance.keys())
+        
         cursor = self.conn.cursor()
-        for skill_name, relevance in skill_relevance.items():
-            # Get skill ID or create if it doesn't exist
-            cursor.execute('SELECT skill_id FROM skills WHERE name = ?', (skill_name,))
-            skill_result = cursor.fetchone()
-            if not skill_result:
-                cursor.execute('INSERT INTO skills (name, category) VALUES (?, ?)', (skill_name, "auto_detected"))
-                self.conn.commit()
-                cursor.execute('SELECT skill_id FROM skills WHERE name = ?', (skill_name,))
-                skill_result = cursor.fetchone()
-            
-            skill_id = skill_result[0]
-            
-            # Map challenge to skill
-            cursor.execute(
-                'INSERT OR REPLACE INTO challenge_skills (challenge_id, skill_id, relevance) VALUES (?, ?, ?)',
-                (challenge_id, skill_id, relevance)
-            )
+        cursor.executemany(
+            'INSERT OR REPLACE INTO challenge_skills (challenge_id, skill_id, relevance) VALUES (?, ?, ?)',
+            [(challenge_id, skill_ids[name], relevance) for name, relevance in skill_relevance.items() if name in skill_ids]
+        )
         self.conn.commit()
     
     # User attempt methods
@@ -257,45 +139,99 @@ class Database:
         self.conn.commit()
         return attempt_id
     
+    def get_last_attempt(self, user_id: str, challenge_id: str) -> Optional[Tuple]:
+        """Get the code and attempt number of a user's latest attempt at a challenge."""
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT code, attempt_number
+            FROM attempts
+            WHERE user_id = ? AND challenge_id = ?
+            ORDER BY created_at DESC LIMIT 1
+        ''', (user_id, challenge_id))
+        return cursor.fetchone()
+    
+    # Set-based EMA update: new skills start at score * relevance, existing ones move
+    # towards it by (1 - SKILL_EMA_DECAY)
+    UPSERT_USER_SKILLS_SQL = f'''
+        INSERT INTO user_skills (user_id, skill_id, proficiency, last_updated)
+        SELECT :user_id, cs.skill_id, :score * cs.relevance, :now
+        FROM challenge_skills cs
+        JOIN skills s ON cs.skill_id = s.skill_id
+        WHERE cs.challenge_id = :challenge_id
+        ON CONFLICT (user_id, skill_id) DO UPDATE SET
+            proficiency = user_skills.proficiency * {SKILL_EMA_DECAY} + excluded.proficiency * {1 - SKILL_EMA_DECAY},
+            last_updated = excluded.last_updated
+    '''
+    
+    def _proficiency_matrix(self) -> Optional[ProficiencyMatrix]:
+        """The in-memory proficiency engine, or None when user_skills is used directly."""
+        return get_proficiency_matrix(self.conn, self.db_path)
+    
     def update_user_skills(self, user_id: str, challenge_id: str, score: float) -> None:
         """Update user's skill proficiency based on a challenge attempt."""
-        cursor = self.conn.cursor()
+        matrix = self._proficiency_matrix()
+        if matrix is not None:
+            matrix.apply_attempts(self.conn, [(user_id, challenge_id, score)])
+            matrix.maybe_checkpoint(self.conn)
+            return
         
-        # Get skills related to the challenge
-        cursor.execute('''
-            SELECT s.skill_id, s.name, cs.relevance
-            FROM challenge_skills cs
-            JOIN skills s ON cs.skill_id = s.skill_id
-            WHERE cs.challenge_id = ?
-        ''', (challenge_id,))
-        
-        challenge_skills = cursor.fetchall()
-        
-        for skill_id, skill_name, relevance in challenge_skills:
-            # Check if user already has this skill
-            cursor.execute('SELECT proficiency FROM user_skills WHERE user_id = ? AND skill_id = ?', (user_id, skill_id))
-            current_proficiency = cursor.fetchone()
-            
-            if current_proficiency:
-                # Update existing proficiency
-                # Formula: new_prof = (old_prof * 0.7) + (attempt_score * relevance * 0.3)
-                new_proficiency = (current_proficiency[0] * 0.7) + (score * relevance * 0.3)
-                cursor.execute(
-                    'UPDATE user_skills SET proficiency = ?, last_updated = ? WHERE user_id = ? AND skill_id = ?',
-                    (new_proficiency, datetime.datetime.now().isoformat(), user_id, skill_id)
-                )
-            else:
-                # Create new skill proficiency entry
-                cursor.execute(
-                    'INSERT INTO user_skills (user_id, skill_id, proficiency) VALUES (?, ?, ?)',
-                    (user_id, skill_id, score * relevance)
-                )
+        cursor = self.conn.cursor()
+        cursor.execute(self.UPSERT_USER_SKILLS_SQL, {
+            'user_id': user_id,
+            'challenge_id': challenge_id,
+            'score': score,
+            'now': datetime.datetime.now().isoformat()
+        })
+        self.conn.commit()
+    
+    def update_user_skills_bulk(self, updates: List[Tuple[str, str, float]]) -> None:
+        """
+        Apply many attempts' skill updates in a single transaction.
+        
+        Args:
+            updates: (user_id, challenge_id, score) tuples, applied in order
+        """
+        matrix = self._proficiency_matrix()
+        if matrix is not None:
+            matrix.apply_attempts(self.conn, updates)
+            matrix.maybe_checkpoint(self.conn)
+            return
+        
+        now = datetime.datetime.now().isoformat()
+        cursor = self.conn.cursor()
+        try:
+            cursor.executemany(self.UPSERT_USER_SKILLS_SQL, (
+                {'user_id': user_id, 'challenge_id': challenge_id, 'score': score, 'now': now}
+                for user_id, challenge_id, score in updates
+            ))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+    
+    def save_user_skill_scores(self, user_id: str, skill_scores: Dict[str, float], category: str = "code_review") -> None:
+        """Set a user's proficiency directly from detected skill scores, creating unknown skills."""
+        skill_ids = get_skill_registry(self.db_path).resolve(self.conn, skill_scores.keys(), category)
+        now = datetime.datetime.now().isoformat()
         
+        cursor = self.conn.cursor()
+        cursor.executemany(
+            'INSERT OR REPLACE INTO user_skills (user_id, skill_id, proficiency, last_updated) VALUES (?, ?, ?, ?)',
+            [(user_id, skill_ids[name], score, now) for name, score in skill_scores.items() if name in skill_ids]
+        )
         self.conn.commit()
+        
+        matrix = self._proficiency_matrix()
+        if matrix is not None:
+            matrix.set_scores(self.conn, user_id, {skill_ids[name]: score for name, score in skill_scores.items() if name in skill_ids})
     
     # User skill methods
     def get_user_skills(self, user_id: str) -> List[Tuple]:
         """Get a user's skill proficiencies."""
+        matrix = self._proficiency_matrix()
+        if matrix is not None:
+            return matrix.user_skills(user_id)
+        
         cursor = self.conn.cursor()
         cursor.execute('''
             SELECT s.skill_id, s.name, s.category, us.proficiency
@@ -309,6 +245,10 @@ class Database:
     
     def get_user_weakest_skills(self, user_id: str, limit: int = 5) -> List[Tuple]:
         """Get a user's weakest skills."""
+        matrix = self._proficiency_matrix()
+        if matrix is not None:
+            return matrix.user_skills(user_id, limit, ascending=True)
+        
         cursor = self.conn.cursor()
         cursor.execute('''
             SELECT s.skill_id, s.name, s.category, us.proficiency
@@ -323,6 +263,10 @@ class Database:
     
     def get_user_strongest_skills(self, user_id: str, limit: int = 5) -> List[Tuple]:
         """Get a user's strongest skills."""
+        matrix = self._proficiency_matrix()
+        if matrix is not None:
+            return matrix.user_skills(user_id, limit)
+        
         cursor = self.conn.cursor()
         cursor.execute('''
             SELECT s.skill_id, s.name, s.category, us.proficiency
@@ -337,67 +281,129 @@ class Database:
     
     # Recommendation methods
     def get_recommended_challenges(self, user_id: str, limit: int = 5) -> List[Tuple]:
-        """Get personalized challenge recommendations for a user."""
-        cursor = self.conn.cursor()
-        
-        # Get weakest skills
+        """
+        Get personalized challenge recommendations for a user.
+        
+        Unattempted challenges covering the user's three weakest skills are ranked in
+        memory by the recommendation index; only the winners are read from the database.
+        Rows are (challenge_id, title, description, difficulty, language, skills), where
+        skills lists the covered weak skills.
+        """
         weak_skills = self.get_user_weakest_skills(user_id, limit=3)
-        weak_skill_ids = [skill[0] for skill in weak_skills]
-        
-        if not weak_skill_ids:
+        if not weak_skills:
             return []
         
-        # Get challenges that target these weak skills but haven't been attempted by the user
-        placeholders = ', '.join(['?' for _ in weak_skill_ids])
+        index = get_recommendation_index(self.db_path)
+        ranked = index.recommend(self.conn, user_id, [(skill[0], skill[3]) for skill in weak_skills], limit)
+        if not ranked:
+            return []
         
+        placeholders = ', '.join(['?' for _ in ranked])
+        cursor = self.conn.cursor()
         cursor.execute(f'''
-            SELECT c.challenge_id, c.title, c.description, c.difficulty, pl.name as language, 
-                   GROUP_CONCAT(s.name) as skills
+            SELECT c.challenge_id, c.title, c.description, c.difficulty, pl.name as language
             FROM challenges c
             JOIN programming_languages pl ON c.lang_id = pl.lang_id
-            JOIN challenge_skills cs ON c.challenge_id = cs.challenge_id
-            JOIN skills s ON cs.skill_id = s.skill_id
-            WHERE cs.skill_id IN ({placeholders})
-            AND c.challenge_id NOT IN (
-                SELECT challenge_id FROM attempts WHERE user_id = ?
-            )
-            GROUP BY c.challenge_id
-            ORDER BY c.difficulty ASC
-            LIMIT ?
-        ''', (*weak_skill_ids, user_id, limit))
-        
-        return cursor.fetchall()
+            WHERE c.challenge_id IN ({placeholders})
+        ''', [challenge_id for challenge_id, _, _ in ranked])
+        rows = {row[0]: row for row in cursor.fetchall()}
+        
+        return [
+            rows[challenge_id] + (",".join(index.skill_name(skill_id) or "" for skill_id in skill_ids),)
+            for challenge_id, _, skill_ids in ranked if challenge_id in rows
+        ]
     
     # User progress methods
     def get_user_progress(self, user_id: str) -> Dict[str, Any]:
-        """Get a user's overall progress statistics."""
+        """Get a user's overall progress statistics from the incrementally maintained rollup."""
         cursor = self.conn.cursor()
-        
-        # Get total attempts and successful attempts
         cursor.execute('''
-            SELECT COUNT(*) as total_attempts,
-                   SUM(CASE WHEN successful = 1 THEN 1 ELSE 0 END) as successful_attempts,
-                   COUNT(DISTINCT challenge_id) as challenges_attempted
-            FROM attempts
+            SELECT total_attempts, successful_attempts, challenges_attempted, challenges_completed,
+                   score_sum, score_count, best_score_sum
+            FROM user_stats
             WHERE user_id = ?
         ''', (user_id,))
         
         result = cursor.fetchone()
+        if not result:
+            result = (0, 0, 0, 0, 0, 0, 0)
+        
+        total_attempts, successful_attempts, challenges_attempted, challenges_completed, \
+            score_sum, score_count, best_score_sum = result
+        
+        return {
+            'total_attempts': total_attempts,
+            'successful_attempts': successful_attempts,
+            'challenges_attempted': challenges_attempted,
+            'challenges_completed': challenges_completed,
+            'average_score': score_sum / score_count if score_count else 0,
+            'average_best_score': best_score_sum / challenges_attempted if challenges_attempted else 0
+        }
+    
+    def get_user_challenge_history(self, user_id: str) -> List[Tuple]:
+        """Get every challenge a user has attempted with their best score, attempt count and completion."""
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT c.challenge_id, c.title, c.description,
+                   ucs.best_score, ucs.attempts, ucs.completed, ucs.last_attempt
+            FROM user_challenge_stats ucs
+            JOIN challenges c ON ucs.challenge_id = c.challenge_id
+            WHERE ucs.user_id = ?
+            ORDER BY ucs.last_attempt DESC
+        ''', (user_id,))
         
-        # Get average score
+        return cursor.fetchall()
+    
+    def get_activity_patterns(self, user_id: str) -> Dict[str, Any]:
+        """
+        Get a user's activity broken down by day, hour, weekday and difficulty.
+        
+        All breakdowns come from one indexed scan of the pre-bucketed activity cube.
+        
+        Returns:
+            Dictionary with:
+                daily: [(day, average_score, attempts)] in date order
+                hourly: [(hour, attempts)] in hour order
+                weekday: [(weekday, attempts)] with 0 = Sunday
+                difficulty: [(difficulty, average_minutes)] over timed attempts
+                active_days: Number of days with at least one attempt
+        """
+        cursor = self.conn.cursor()
         cursor.execute('''
-            SELECT AVG(score) as average_score
-            FROM attempts
+            SELECT day, hour, weekday, difficulty, attempts, score_sum, score_count, time_spent_sum, timed_count
+            FROM activity_cube
             WHERE user_id = ?
+            ORDER BY day
         ''', (user_id,))
         
-        avg_score = cursor.fetchone()
+        daily = {}
+        hourly = {}
+        weekday_counts = {}
+        difficulty_time = {}
+        for day, hour, weekday, difficulty, attempts, score_sum, score_count, time_spent_sum, timed_count in cursor:
+            day_totals = daily.setdefault(day, [0, 0.0, 0])
+            day_totals[0] += attempts
+            day_totals[1] += score_sum
+            day_totals[2] += score_count
+            hourly[hour] = hourly.get(hour, 0) + attempts
+            weekday_counts[weekday] = weekday_counts.get(weekday, 0) + attempts
+            if timed_count:
+                totals = difficulty_time.setdefault(difficulty, [0, 0])
+                totals[0] += time_spent_sum
+                totals[1] += timed_count
         
         return {
-            'total_attempts': result[0] if result[0] else 0,
-            'successful_attempts': result[1] if result[1] else 0,
-            'challenges_attempted': result[2] if result[2] else 0,
-            'average_score': avg_score[0] if avg_score[0] else 0
+            'daily': [
+                (day, score_sum / score_count if score_count else None, attempts)
+                for day, (attempts, score_sum, score_count) in daily.items()
+            ],
+            'hourly': sorted(hourly.items()),
+            'weekday': sorted(weekday_counts.items()),
+            'difficulty': [
+                (difficulty, time_sum / count / 60)
+                for difficulty, (time_sum, count) in sorted(difficulty_time.items())
+            ],
+            'active_days': len(daily)
         }
     
     def get_user_recent_attempts(self, user_id: str, limit: int = 5) -> List[Tuple]:
@@ -463,6 +469,86 @@ class Database:
         )
         self.conn.commit()
     
+    def create_learning_path_bulk(self, title: str, description: str, language: str,
+                                  challenges: List[Dict[str, Any]], difficulty: int = 2) -> Tuple[str, List[str]]:
+        """
+        Create (or extend) a learning path with all of its challenges in one transaction.
+        
+        Args:
+            title: Path title; an existing path with this title and language is reused
+            description: Path description
+            language: Programming language
+            challenges: In path order, dictionaries with title, enhanced_prompt and optionally
+                difficulty and skills (a mapping of skill name to relevance)
+            difficulty: Path difficulty, also the default for challenges without one
+        
+        Returns:
+            Tuple of the path ID and the new challenge IDs in path order
+        """
+        # Unknown skills are created (and committed) up front, outside the transaction
+        skill_names = {name for challenge in challenges for name in (challenge.get('skills') or {})}
+        skill_ids = get_skill_registry(self.db_path).resolve(self.conn, skill_names) if skill_names else {}
+        
+        cursor = self.conn.cursor()
+        # Take the write lock up front so the path lookup and inserts are atomic
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            cursor.execute('SELECT lang_id FROM programming_languages WHERE name = ?', (language,))
+            lang_result = cursor.fetchone()
+            if not lang_result:
+                raise ValueError(f"Unknown programming language: {language}")
+            lang_id = lang_result[0]
+            
+            cursor.execute('SELECT path_id FROM learning_paths WHERE title = ? AND lang_id = ?', (title, lang_id))
+            path = cursor.fetchone()
+            if path:
+                path_id = path[0]
+            else:
+                path_id = str(uuid.uuid4())
+                cursor.execute(
+                    'INSERT INTO learning_paths (path_id, title, description, difficulty, lang_id, ordering) VALUES (?, ?, ?, ?, ?, ?)',
+                    (path_id, title, description, difficulty, lang_id, '[]')
+                )
+            
+            challenge_ids = [str(uuid.uuid4()) for _ in challenges]
+            cursor.executemany(
+                'INSERT INTO challenges (challenge_id, title, description, enhanced_prompt, difficulty, lang_id) VALUES (?, ?, ?, ?, ?, ?)',
+                [(challenge_id, challenge['title'][:50], challenge['title'], challenge['enhanced_prompt'],
+                  challenge.get('difficulty', difficulty), lang_id)
+                 for challenge_id, challenge in zip(challenge_ids, challenges)]
+            )
+            cursor.executemany(
+                'INSERT OR REPLACE INTO challenge_skills (challenge_id, skill_id, relevance) VALUES (?, ?, ?)',
+                [(challenge_id, skill_ids[name], relevance)
+                 for challenge_id, challenge in zip(challenge_ids, challenges)
+                 for name, relevance in (challenge.get('skills') or {}).items() if name in skill_ids]
+            )
+            cursor.executemany(
+                'INSERT OR REPLACE INTO learning_path_items (path_id, challenge_id, position) VALUES (?, ?, ?)',
+                [(path_id, challenge_id, position) for position, challenge_id in enumerate(challenge_ids)]
+            )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        
+        return path_id, challenge_ids
+    
+    def get_learning_paths(self) -> List[Tuple]:
+        """Get all learning paths with their language and number of challenges, newest first."""
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT lp.path_id, lp.title, lp.description, lp.difficulty, pl.name as language,
+                   COUNT(lpi.challenge_id) as challenge_count
+            FROM learning_paths lp
+            JOIN programming_languages pl ON lp.lang_id = pl.lang_id
+            LEFT JOIN learning_path_items lpi ON lp.path_id = lpi.path_id
+            GROUP BY lp.path_id
+            ORDER BY lp.created_at DESC
+        ''')
+        
+        return cursor.fetchall()
+    
     def get_learning_path_challenges(self, path_id: str) -> List[Tuple]:
         """Get all challenges in a learning path, ordered by position."""
         cursor = self.conn.cursor()
@@ -480,15 +566,27 @@ class Database:
     # Skill analysis methods
     def get_skill_analysis(self, user_id: str) -> Dict[str, List[Dict[str, Any]]]:
         """Get comprehensive skill analysis for a user."""
-        # Get all skills with proficiency
+        matrix = self._proficiency_matrix()
+        if matrix is not None:
+            # The query below reads user_skills, so write pending updates first
+            matrix.checkpoint(self.conn)
+        
+        # Practice counts come from one grouped join over the user's per-challenge
+        # rollup, instead of a correlated subquery over attempts for every skill
         cursor = self.conn.cursor()
         cursor.execute('''
+            WITH practice AS (
+                SELECT cs.skill_id, SUM(ucs.attempts) as practice_count
+                FROM user_challenge_stats ucs
+                JOIN challenge_skills cs ON ucs.challenge_id = cs.challenge_id
+                WHERE ucs.user_id = ?
+                GROUP BY cs.skill_id
+            )
             SELECT s.skill_id, s.name, s.category, COALESCE(us.proficiency, 0) as proficiency,
-                  (SELECT COUNT(*) FROM attempts a 
-                   JOIN challenge_skills cs ON a.challenge_id = cs.challenge_id 
-                   WHERE a.user_id = ? AND cs.skill_id = s.skill_id) as practice_count
+                   COALESCE(p.practice_count, 0) as practice_count
             FROM skills s
             LEFT JOIN user_skills us ON s.skill_id = us.skill_id AND us.user_id = ?
+            LEFT JOIN practice p ON s.skill_id = p.skill_id
             ORDER BY proficiency DESC
         ''', (user_id, user_id))
         
@@ -508,4 +606,132 @@ class Database:
                 'practice_count': practice_count
             })
         
-        return categories
\ No newline at end of file
+        return categories
+    
+    # Cohort methods
+    def get_cohort_user_ids(self, active_days: Optional[int] = None, username_prefix: Optional[str] = None) -> List[str]:
+        """IDs of the users in a cohort: optionally those active in the last active_days and with a username prefix."""
+        query = 'SELECT u.user_id FROM users u WHERE 1 = 1'
+        params: List[Any] = []
+        if username_prefix:
+            query += ' AND substr(u.username, 1, ?) = ?'
+            params.extend([len(username_prefix), username_prefix])
+        if active_days is not None:
+            query += ' AND EXISTS (SELECT 1 FROM activity_cube ac WHERE ac.user_id = u.user_id AND ac.day >= ?)'
+            params.append((datetime.date.today() - datetime.timedelta(days=active_days)).isoformat())
+        
+        cursor = self.conn.cursor()
+        cursor.execute(query, params)
+        return [row[0] for row in cursor.fetchall()]
+    
+    def get_cohort_skill_summary(self, user_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Per-skill proficiency statistics for a group of users, weakest average first.
+        
+        Uses the in-memory proficiency engine when it is enabled, otherwise a matrix
+        loaded from user_skills for this call. Requires NumPy.
+        
+        Args:
+            user_ids: Users in the cohort; None for all users
+            
+        Returns:
+            List of dictionaries with skill_id, name, category, users, mean, p25, median, p75, min and max
+        """
+        matrix = self._proficiency_matrix() or ProficiencyMatrix.from_database(self.conn)
+        return matrix.cohort_summary(user_ids)
+    
+    # Background job methods
+    def create_job(self, user_id: Optional[str], kind: str, params: Dict[str, Any], owner: Optional[str] = None) -> str:
+        """Record a new queued background job, run by the job queue process owner, and return its ID."""
+        job_id = str(uuid.uuid4())
+        self.conn.execute(
+            'INSERT INTO jobs (job_id, user_id, kind, status, params, progress, created_at, owner) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (job_id, user_id, kind, 'queued', json.dumps(params), '[]', datetime.datetime.now().isoformat(), owner)
+        )
+        self.conn.commit()
+        return job_id
+    
+    def update_job(self, job_id: str, status: Optional[str] = None, progress: Optional[List[Any]] = None,
+                   result: Optional[Any] = None, error: Optional[str] = None) -> None:
+        """Update a job's status, progress, result or error; None leaves a field unchanged."""
+        now = datetime.datetime.now().isoformat()
+        self.conn.execute('''
+            UPDATE jobs SET
+                status = COALESCE(?, status),
+                progress = COALESCE(?, progress),
+                result = COALESCE(?, result),
+                error = COALESCE(?, error),
+                started_at = CASE WHEN ? = 'running' THEN COALESCE(started_at, ?) ELSE started_at END,
+                finished_at = CASE WHEN ? IN ('completed', 'failed') THEN ? ELSE finished_at END
+            WHERE job_id = ?
+        ''', (
+            status,
+            json.dumps(progress) if progress is not None else None,
+            json.dumps(result) if result is not None else None,
+            error,
+            status, now, status, now,
+            job_id
+        ))
+        self.conn.commit()
+    
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a background job with its decoded params, progress and result."""
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT job_id, user_id, kind, status, params, progress, result, error, created_at, started_at, finished_at
+            FROM jobs
+            WHERE job_id = ?
+        ''', (job_id,))
+        row = cursor.fetchone()
+        return self._job_from_row(row) if row else None
+    
+    def get_user_jobs(self, user_id: str, kind: Optional[str] = None, limit: int = 5) -> List[Dict[str, Any]]:
+        """Get a user's most recent background jobs, optionally of one kind."""
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT job_id, user_id, kind, status, params, progress, result, error, created_at, started_at, finished_at
+            FROM jobs
+            WHERE user_id = ? AND (? IS NULL OR kind = ?)
+            ORDER BY created_at DESC
+            LIMIT ?
+        ''', (user_id, kind, kind, limit))
+        return [self._job_from_row(row) for row in cursor.fetchall()]
+    
+    def get_unfinished_job_owners(self) -> List[Optional[str]]:
+        """Owners of the queued or running jobs (None for jobs recorded without one)."""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT DISTINCT owner FROM jobs WHERE status IN ('queued', 'running')")
+        return [row[0] for row in cursor.fetchall()]
+    
+    def fail_unfinished_jobs(self, error: str, owners: List[Optional[str]]) -> int:
+        """Mark the queued or running jobs of these owners as failed, e.g. after their process stopped."""
+        now = datetime.datetime.now().isoformat()
+        failed = 0
+        cursor = self.conn.cursor()
+        for owner in owners:
+            cursor.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? "
+                "WHERE status IN ('queued', 'running') AND owner IS ?",
+                (error, now, owner)
+            )
+            failed += cursor.rowcount
+        self.conn.commit()
+        return failed
+    
+    @staticmethod
+    def _job_from_row(row: Tuple) -> Dict[str, Any]:
+        """Convert a jobs row into a dictionary."""
+        job_id, user_id, kind, status, params, progress, result, error, created_at, started_at, finished_at = row
+        return {
+            'job_id': job_id,
+            'user_id': user_id,
+            'kind': kind,
+            'status': status,
+            'params': json.loads(params) if params else {},
+            'progress': json.loads(progress) if progress else [],
+            'result': json.loads(result) if result else None,
+            'error': error,
+            'created_at': created_at,
+            'started_at': started_at,
+            'finished_at': finished_at
+        }
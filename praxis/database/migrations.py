@@ -0,0 +1,543 @@
+# praxis/database/migrations.py
+import sqlite3
+import datetime
+from typing import Callable, List, Tuple
+
+from config import DEFAULT_SKILLS
+
+def migration_001_initial_schema(cursor: sqlite3.Cursor) -> None:
+    """Create the original tables and seed languages and default skills."""
+    # Users table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS users (
+        user_id TEXT PRIMARY KEY,
+        username TEXT UNIQUE,
+        password_hash TEXT,
+        email TEXT UNIQUE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_login TIMESTAMP
+    )
+    ''')
+    
+    # Programming languages table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS programming_languages (
+        lang_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE
+    )
+    ''')
+    
+    # Skills/concepts table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS skills (
+        skill_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE,
+        category TEXT
+    )
+    ''')
+    
+    # Challenges table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS challenges (
+        challenge_id TEXT PRIMARY KEY,
+        title TEXT,
+        description TEXT,
+        enhanced_prompt TEXT,
+        difficulty INTEGER,
+        lang_id INTEGER,
+        solution TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (lang_id) REFERENCES programming_languages(lang_id)
+    )
+    ''')
+    
+    # Challenge-skill mapping (many-to-many)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS challenge_skills (
+        challenge_id TEXT,
+        skill_id INTEGER,
+        relevance REAL,
+        PRIMARY KEY (challenge_id, skill_id),
+        FOREIGN KEY (challenge_id) REFERENCES challenges(challenge_id),
+        FOREIGN KEY (skill_id) REFERENCES skills(skill_id)
+    )
+    ''')
+    
+    # User attempts table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS attempts (
+        attempt_id TEXT PRIMARY KEY,
+        user_id TEXT,
+        challenge_id TEXT,
+        code TEXT,
+        feedback TEXT,
+        score REAL,
+        time_spent INTEGER,
+        attempt_number INTEGER,
+        successful BOOLEAN,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(user_id),
+        FOREIGN KEY (challenge_id) REFERENCES challenges(challenge_id)
+    )
+    ''')
+    
+    # User skill proficiency table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS user_skills (
+        user_id TEXT,
+        skill_id INTEGER,
+        proficiency REAL,
+        last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (user_id, skill_id),
+        FOREIGN KEY (user_id) REFERENCES users(user_id),
+        FOREIGN KEY (skill_id) REFERENCES skills(skill_id)
+    )
+    ''')
+    
+    # User preferences table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS user_preferences (
+        user_id TEXT PRIMARY KEY,
+        difficulty_preference INTEGER,
+        theme TEXT,
+        preferences JSON,
+        FOREIGN KEY (user_id) REFERENCES users(user_id)
+    )
+    ''')
+    
+    # Learning paths table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS learning_paths (
+        path_id TEXT PRIMARY KEY,
+        title TEXT,
+        description TEXT,
+        difficulty INTEGER,
+        lang_id INTEGER,
+        ordering JSON,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (lang_id) REFERENCES programming_languages(lang_id)
+    )
+    ''')
+    
+    # Learning path items
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS learning_path_items (
+        path_id TEXT,
+        challenge_id TEXT,
+        position INTEGER,
+        PRIMARY KEY (path_id, challenge_id),
+        FOREIGN KEY (path_id) REFERENCES learning_paths(path_id),
+        FOREIGN KEY (challenge_id) REFERENCES challenges(challenge_id)
+    )
+    ''')
+    
+    # Populate programming languages
+    langs = ["Python", "JavaScript", "Java", "C++", "C#", "Go", "Ruby", "PHP", "TypeScript", "Rust", "Swift", "Kotlin"]
+    for lang in langs:
+        cursor.execute('INSERT OR IGNORE INTO programming_languages (name) VALUES (?)', (lang,))
+    
+    # Populate skills/concepts with common programming concepts
+    for skill_name, category in DEFAULT_SKILLS:
+        cursor.execute('INSERT OR IGNORE INTO skills (name, category) VALUES (?, ?)', (skill_name, category))
+
+def migration_002_hot_query_indexes(cursor: sqlite3.Cursor) -> None:
+    """Add secondary indexes for the per-user attempt, skill and learning path queries."""
+    # Per-user history, ordered by time (dashboard, history, analytics)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_attempts_user_created ON attempts(user_id, created_at)')
+    # Per-user, per-challenge lookups (attempt counts, "already attempted" filters)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_attempts_user_challenge_created ON attempts(user_id, challenge_id, created_at)')
+    # Skill -> challenges joins; the primary key only covers challenge -> skills
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_challenge_skills_skill ON challenge_skills(skill_id, challenge_id)')
+    # Weakest/strongest skill lookups ordered by proficiency
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_skills_user_proficiency ON user_skills(user_id, proficiency)')
+    # Learning path contents in order
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_learning_path_items_position ON learning_path_items(path_id, position)')
+
+def migration_003_user_stats_rollups(cursor: sqlite3.Cursor) -> None:
+    """Add per-user and per-user-challenge progress rollups, maintained by triggers on attempts."""
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS user_challenge_stats (
+        user_id TEXT,
+        challenge_id TEXT,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        best_score REAL,
+        completed INTEGER NOT NULL DEFAULT 0,
+        last_attempt TIMESTAMP,
+        PRIMARY KEY (user_id, challenge_id)
+    )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_challenge_stats_last ON user_challenge_stats(user_id, last_attempt)')
+    
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS user_stats (
+        user_id TEXT PRIMARY KEY,
+        total_attempts INTEGER NOT NULL DEFAULT 0,
+        successful_attempts INTEGER NOT NULL DEFAULT 0,
+        score_sum REAL NOT NULL DEFAULT 0,
+        score_count INTEGER NOT NULL DEFAULT 0,
+        challenges_attempted INTEGER NOT NULL DEFAULT 0,
+        challenges_completed INTEGER NOT NULL DEFAULT 0,
+        best_score_sum REAL NOT NULL DEFAULT 0
+    )
+    ''')
+    
+    # Attempt-level counters
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_attempts_stats_insert AFTER INSERT ON attempts
+    BEGIN
+        INSERT INTO user_stats (user_id, total_attempts, successful_attempts, score_sum, score_count)
+        VALUES (NEW.user_id, 1, COALESCE(NEW.successful, 0), COALESCE(NEW.score, 0), NEW.score IS NOT NULL)
+        ON CONFLICT (user_id) DO UPDATE SET
+            total_attempts = total_attempts + 1,
+            successful_attempts = successful_attempts + excluded.successful_attempts,
+            score_sum = score_sum + excluded.score_sum,
+            score_count = score_count + excluded.score_count;
+        
+        INSERT INTO user_challenge_stats (user_id, challenge_id, attempts, best_score, completed, last_attempt)
+        VALUES (NEW.user_id, NEW.challenge_id, 1, NEW.score, COALESCE(NEW.successful, 0), NEW.created_at)
+        ON CONFLICT (user_id, challenge_id) DO UPDATE SET
+            attempts = attempts + 1,
+            best_score = MAX(COALESCE(best_score, excluded.best_score), COALESCE(excluded.best_score, best_score)),
+            completed = MAX(completed, excluded.completed),
+            last_attempt = MAX(last_attempt, excluded.last_attempt);
+    END
+    ''')
+    
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_attempts_stats_update AFTER UPDATE OF successful, score ON attempts
+    BEGIN
+        UPDATE user_stats SET
+            successful_attempts = successful_attempts - COALESCE(OLD.successful, 0) + COALESCE(NEW.successful, 0),
+            score_sum = score_sum - COALESCE(OLD.score, 0) + COALESCE(NEW.score, 0),
+            score_count = score_count - (OLD.score IS NOT NULL) + (NEW.score IS NOT NULL)
+        WHERE user_id = NEW.user_id;
+        
+        -- Scores and success can go down, so recompute this challenge's row from its attempts
+        UPDATE user_challenge_stats SET
+            best_score = (SELECT MAX(score) FROM attempts WHERE user_id = NEW.user_id AND challenge_id = NEW.challenge_id),
+            completed = (SELECT COALESCE(MAX(successful), 0) FROM attempts WHERE user_id = NEW.user_id AND challenge_id = NEW.challenge_id)
+        WHERE user_id = NEW.user_id AND challenge_id = NEW.challenge_id;
+    END
+    ''')
+    
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_attempts_stats_delete AFTER DELETE ON attempts
+    BEGIN
+        UPDATE user_stats SET
+            total_attempts = total_attempts - 1,
+            successful_attempts = successful_attempts - COALESCE(OLD.successful, 0),
+            score_sum = score_sum - COALESCE(OLD.score, 0),
+            score_count = score_count - (OLD.score IS NOT NULL)
+        WHERE user_id = OLD.user_id;
+        
+        UPDATE user_challenge_stats SET
+            attempts = attempts - 1,
+            best_score = (SELECT MAX(score) FROM attempts WHERE user_id = OLD.user_id AND challenge_id = OLD.challenge_id),
+            completed = (SELECT COALESCE(MAX(successful), 0) FROM attempts WHERE user_id = OLD.user_id AND challenge_id = OLD.challenge_id),
+            last_attempt = (SELECT MAX(created_at) FROM attempts WHERE user_id = OLD.user_id AND challenge_id = OLD.challenge_id)
+        WHERE user_id = OLD.user_id AND challenge_id = OLD.challenge_id;
+        
+        DELETE FROM user_challenge_stats
+        WHERE user_id = OLD.user_id AND challenge_id = OLD.challenge_id AND attempts <= 0;
+    END
+    ''')
+    
+    # Challenge-level counters follow the per-challenge rollup
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_user_challenge_stats_insert AFTER INSERT ON user_challenge_stats
+    BEGIN
+        UPDATE user_stats SET
+            challenges_attempted = challenges_attempted + 1,
+            challenges_completed = challenges_completed + NEW.completed,
+            best_score_sum = best_score_sum + COALESCE(NEW.best_score, 0)
+        WHERE user_id = NEW.user_id;
+    END
+    ''')
+    
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_user_challenge_stats_update AFTER UPDATE OF completed, best_score ON user_challenge_stats
+    BEGIN
+        UPDATE user_stats SET
+            challenges_completed = challenges_completed - OLD.completed + NEW.completed,
+            best_score_sum = best_score_sum - COALESCE(OLD.best_score, 0) + COALESCE(NEW.best_score, 0)
+        WHERE user_id = NEW.user_id;
+    END
+    ''')
+    
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_user_challenge_stats_delete AFTER DELETE ON user_challenge_stats
+    BEGIN
+        UPDATE user_stats SET
+            challenges_attempted = challenges_attempted - 1,
+            challenges_completed = challenges_completed - OLD.completed,
+            best_score_sum = best_score_sum - COALESCE(OLD.best_score, 0)
+        WHERE user_id = OLD.user_id;
+    END
+    ''')
+    
+    # Backfill from existing history
+    cursor.execute('''
+    INSERT OR REPLACE INTO user_challenge_stats (user_id, challenge_id, attempts, best_score, completed, last_attempt)
+    SELECT user_id, challenge_id, COUNT(*), MAX(score), COALESCE(MAX(successful), 0), MAX(created_at)
+    FROM attempts
+    GROUP BY user_id, challenge_id
+    ''')
+    cursor.execute('''
+    INSERT OR REPLACE INTO user_stats (user_id, total_attempts, successful_attempts, score_sum, score_count,
+                                       challenges_attempted, challenges_completed, best_score_sum)
+    SELECT a.user_id, a.total_attempts, a.successful_attempts, a.score_sum, a.score_count,
+           c.challenges_attempted, c.challenges_completed, c.best_score_sum
+    FROM (
+        SELECT user_id, COUNT(*) AS total_attempts, COALESCE(SUM(successful), 0) AS successful_attempts,
+               COALESCE(SUM(score), 0) AS score_sum, COUNT(score) AS score_count
+        FROM attempts GROUP BY user_id
+    ) a
+    JOIN (
+        SELECT user_id, COUNT(*) AS challenges_attempted, SUM(completed) AS challenges_completed,
+               COALESCE(SUM(best_score), 0) AS best_score_sum
+        FROM user_challenge_stats GROUP BY user_id
+    ) c ON a.user_id = c.user_id
+    ''')
+
+# Adds or removes one attempt row's contribution to its activity cube bucket
+_ACTIVITY_BUCKET = '''
+    INSERT INTO activity_cube (user_id, day, hour, weekday, difficulty, attempts, score_sum, score_count,
+                               time_spent_sum, timed_count)
+    VALUES ({row}.user_id,
+            strftime('%Y-%m-%d', {row}.created_at),
+            CAST(strftime('%H', {row}.created_at) AS INTEGER),
+            CAST(strftime('%w', {row}.created_at) AS INTEGER),
+            COALESCE((SELECT difficulty FROM challenges WHERE challenge_id = {row}.challenge_id), 0),
+            {sign} 1,
+            {sign} COALESCE({row}.score, 0),
+            {sign} ({row}.score IS NOT NULL),
+            {sign} CASE WHEN {row}.time_spent > 0 THEN {row}.time_spent ELSE 0 END,
+            {sign} COALESCE({row}.time_spent > 0, 0))
+    ON CONFLICT (user_id, day, hour, difficulty) DO UPDATE SET
+        attempts = attempts + excluded.attempts,
+        score_sum = score_sum + excluded.score_sum,
+        score_count = score_count + excluded.score_count,
+        time_spent_sum = time_spent_sum + excluded.time_spent_sum,
+        timed_count = timed_count + excluded.timed_count;
+'''
+
+_ACTIVITY_PRUNE = '''
+    DELETE FROM activity_cube
+    WHERE user_id = OLD.user_id AND day = strftime('%Y-%m-%d', OLD.created_at) AND attempts <= 0;
+'''
+
+# Moves a challenge's attempts between difficulty buckets: {old} is emptied into {new}
+_ACTIVITY_REBUCKET = '''
+    INSERT INTO activity_cube (user_id, day, hour, weekday, difficulty, attempts, score_sum, score_count,
+                               time_spent_sum, timed_count)
+    SELECT a.user_id,
+           strftime('%Y-%m-%d', a.created_at) AS day,
+           CAST(strftime('%H', a.created_at) AS INTEGER) AS hour,
+           CAST(strftime('%w', a.created_at) AS INTEGER),
+           bucket.difficulty,
+           bucket.sign * COUNT(*),
+           bucket.sign * COALESCE(SUM(a.score), 0),
+           bucket.sign * COUNT(a.score),
+           bucket.sign * COALESCE(SUM(CASE WHEN a.time_spent > 0 THEN a.time_spent ELSE 0 END), 0),
+           bucket.sign * COALESCE(SUM(a.time_spent > 0), 0)
+    FROM attempts a, (SELECT {old} AS difficulty, -1 AS sign UNION ALL SELECT {new}, 1) bucket
+    WHERE a.challenge_id = OLD.challenge_id
+    GROUP BY a.user_id, day, hour, bucket.difficulty, bucket.sign
+    ON CONFLICT (user_id, day, hour, difficulty) DO UPDATE SET
+        attempts = attempts + excluded.attempts,
+        score_sum = score_sum + excluded.score_sum,
+        score_count = score_count + excluded.score_count,
+        time_spent_sum = time_spent_sum + excluded.time_spent_sum,
+        timed_count = timed_count + excluded.timed_count;
+    DELETE FROM activity_cube
+    WHERE user_id IN (SELECT user_id FROM attempts WHERE challenge_id = OLD.challenge_id)
+      AND difficulty = {old} AND attempts <= 0;
+'''
+
+def migration_004_activity_cube(cursor: sqlite3.Cursor) -> None:
+    """Add a pre-bucketed activity table (user x day x hour x difficulty) maintained by triggers."""
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS activity_cube (
+        user_id TEXT,
+        day TEXT,
+        hour INTEGER,
+        weekday INTEGER,
+        difficulty INTEGER,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        score_sum REAL NOT NULL DEFAULT 0,
+        score_count INTEGER NOT NULL DEFAULT 0,
+        time_spent_sum INTEGER NOT NULL DEFAULT 0,
+        timed_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, day, hour, difficulty)
+    )
+    ''')
+    
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS trg_attempts_activity_insert AFTER INSERT ON attempts
+    BEGIN
+        {_ACTIVITY_BUCKET.format(row="NEW", sign="+")}
+    END
+    ''')
+    
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS trg_attempts_activity_update
+    AFTER UPDATE OF user_id, challenge_id, score, time_spent, created_at ON attempts
+    BEGIN
+        {_ACTIVITY_BUCKET.format(row="OLD", sign="-")}
+        {_ACTIVITY_PRUNE}
+        {_ACTIVITY_BUCKET.format(row="NEW", sign="+")}
+    END
+    ''')
+    
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS trg_attempts_activity_delete AFTER DELETE ON attempts
+    BEGIN
+        {_ACTIVITY_BUCKET.format(row="OLD", sign="-")}
+        {_ACTIVITY_PRUNE}
+    END
+    ''')
+    
+    # Backfill from existing history
+    cursor.execute('''
+    INSERT OR REPLACE INTO activity_cube (user_id, day, hour, weekday, difficulty, attempts, score_sum, score_count,
+                                          time_spent_sum, timed_count)
+    SELECT a.user_id,
+           strftime('%Y-%m-%d', a.created_at) AS day,
+           CAST(strftime('%H', a.created_at) AS INTEGER) AS hour,
+           CAST(strftime('%w', a.created_at) AS INTEGER),
+           COALESCE(c.difficulty, 0) AS difficulty,
+           COUNT(*),
+           COALESCE(SUM(a.score), 0),
+           COUNT(a.score),
+           COALESCE(SUM(CASE WHEN a.time_spent > 0 THEN a.time_spent ELSE 0 END), 0),
+           COALESCE(SUM(a.time_spent > 0), 0)
+    FROM attempts a
+    LEFT JOIN challenges c ON a.challenge_id = c.challenge_id
+    GROUP BY a.user_id, day, hour, difficulty
+    ''')
+
+def migration_005_jobs(cursor: sqlite3.Cursor) -> None:
+    """Add the background jobs table."""
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS jobs (
+        job_id TEXT PRIMARY KEY,
+        user_id TEXT,
+        kind TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'queued',
+        params TEXT,
+        progress TEXT,
+        result TEXT,
+        error TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        started_at TIMESTAMP,
+        finished_at TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (user_id)
+    )
+    ''')
+    # A user's recent jobs of one kind (status polling)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_user_kind_created ON jobs(user_id, kind, created_at)')
+    # Unfinished jobs (cleanup after a restart)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)')
+
+def migration_006_challenge_test_cases(cursor: sqlite3.Cursor) -> None:
+    """Store each challenge's generated test cases, so grading does not regenerate them."""
+    # NULL (or an empty list stored by older versions) means not generated yet
+    cursor.execute('ALTER TABLE challenges ADD COLUMN test_cases TEXT')
+
+def migration_007_activity_cube_difficulty(cursor: sqlite3.Cursor) -> None:
+    """Re-bucket a challenge's activity when its difficulty changes or it is deleted."""
+    # The attempt triggers look up the challenge's current difficulty to find an old
+    # attempt's bucket, which is only right while the cube follows that difficulty
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS trg_challenges_activity_difficulty
+    AFTER UPDATE OF difficulty ON challenges
+    WHEN COALESCE(OLD.difficulty, 0) IS NOT COALESCE(NEW.difficulty, 0)
+    BEGIN
+        {_ACTIVITY_REBUCKET.format(old="COALESCE(OLD.difficulty, 0)", new="COALESCE(NEW.difficulty, 0)")}
+    END
+    ''')
+    
+    # Attempts of a deleted challenge fall back to difficulty 0, as in the attempt triggers
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS trg_challenges_activity_delete
+    AFTER DELETE ON challenges
+    WHEN COALESCE(OLD.difficulty, 0) != 0
+    BEGIN
+        {_ACTIVITY_REBUCKET.format(old="OLD.difficulty", new="0")}
+    END
+    ''')
+
+def migration_008_replays(cursor: sqlite3.Cursor) -> None:
+    """Record finished user_skills replays, so in-memory proficiency engines can reload."""
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS replays (
+        replay_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        model TEXT,
+        finished_at TIMESTAMP
+    )
+    ''')
+
+def migration_009_job_owner(cursor: sqlite3.Cursor) -> None:
+    """Record which job queue process owns each job, so a restart only fails its own jobs."""
+    cursor.execute('ALTER TABLE jobs ADD COLUMN owner TEXT')
+
+# Ordered list of (version, description, migration); append new migrations at the end
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Cursor], None]]] = [
+    (1, "Initial schema and seed data", migration_001_initial_schema),
+    (2, "Indexes for hot attempt, skill and learning path queries", migration_002_hot_query_indexes),
+    (3, "Per-user progress rollups", migration_003_user_stats_rollups),
+    (4, "Activity cube for learning pattern analytics", migration_004_activity_cube),
+    (5, "Background jobs", migration_005_jobs),
+    (6, "Cached challenge test cases", migration_006_challenge_test_cases),
+    (7, "Activity cube follows challenge difficulty changes", migration_007_activity_cube_difficulty),
+    (8, "Replay log", migration_008_replays),
+    (9, "Background job owners", migration_009_job_owner)
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Get the schema version recorded in the database (0 for a fresh database)."""
+    table = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+    ).fetchone()
+    if not table:
+        return 0
+    row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    return row[0] or 0
+
+def run_migrations(conn: sqlite3.Connection) -> int:
+    """
+    Apply any pending migrations and return the resulting schema version.
+
+    When the database is already current this is a single read with no DDL or writes.
+    """
+    if get_schema_version(conn) >= LATEST_VERSION:
+        return LATEST_VERSION
+
+    cursor = conn.cursor()
+    # Take the write lock up front so concurrent processes migrate one at a time
+    cursor.execute('BEGIN IMMEDIATE')
+    try:
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP
+        )
+        ''')
+        # Another process may have migrated while we waited for the lock
+        current = get_schema_version(conn)
+        for version, description, migration in MIGRATIONS:
+            if version <= current:
+                continue
+            migration(cursor)
+            cursor.execute(
+                'INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)',
+                (version, description, datetime.datetime.now().isoformat())
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return LATEST_VERSION
@@ -0,0 +1,114 @@
+# praxis/database/pool.py
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+from config import (
+    DB_PATH, DB_POOL_SIZE, DB_BUSY_TIMEOUT_MS, DB_CACHE_SIZE_KB, DB_MMAP_SIZE_MB
+)
+
+class ConnectionPool:
+    """Thread-safe pool of SQLite connections to one database file, configured for WAL."""
+
+    def __init__(self, db_path: str = DB_PATH, max_idle: int = DB_POOL_SIZE):
+        """
+        Initialize the pool.
+
+        Args:
+            db_path: Path to the SQLite database file
+            max_idle: Maximum number of idle connections kept open for reuse
+        """
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self._idle: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        # Set by the Database once the schema has been created on this file
+        self.schema_ready = False
+
+        # Counters for diagnostics
+        self.created = 0
+        self.reused = 0
+        self.in_use = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection and apply the performance pragmas."""
+        # Connections are handed between Streamlit script threads, so the
+        # same-thread check is disabled; the pool guarantees one user at a time.
+        conn = sqlite3.connect(self.db_path, timeout=DB_BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+        # WAL lets readers proceed while a writer holds the lock
+        conn.execute('PRAGMA journal_mode = WAL')
+        # NORMAL is durable across application crashes in WAL mode and avoids an fsync per commit
+        conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute(f'PRAGMA busy_timeout = {int(DB_BUSY_TIMEOUT_MS)}')
+        # Negative cache_size is in KiB
+        conn.execute(f'PRAGMA cache_size = {-int(DB_CACHE_SIZE_KB)}')
+        conn.execute(f'PRAGMA mmap_size = {int(DB_MMAP_SIZE_MB) * 1024 * 1024}')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Take an idle connection from the pool, opening a new one if none is available."""
+        with self._lock:
+            self.in_use += 1
+            if self._idle:
+                self.reused += 1
+                return self._idle.pop()
+            self.created += 1
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self.in_use -= 1
+            raise
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool, discarding any uncommitted work."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # A broken connection is not worth keeping
+            conn.close()
+            with self._lock:
+                self.in_use -= 1
+            return
+
+        with self._lock:
+            self.in_use -= 1
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close_all(self) -> None:
+        """Close every idle connection (connections in use are closed on release)."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self.max_idle = 0
+        for conn in idle:
+            conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Report pool usage."""
+        with self._lock:
+            return {
+                "idle": len(self._idle),
+                "in_use": self.in_use,
+                "created": self.created,
+                "reused": self.reused
+            }
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+def get_connection_pool(db_path: Optional[str] = None) -> ConnectionPool:
+    """Return the process-wide connection pool for a database file, creating it on first use."""
+    db_path = db_path or DB_PATH
+    pool = _pools.get(db_path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(db_path)
+            if pool is None:
+                pool = ConnectionPool(db_path)
+                _pools[db_path] = pool
+    return pool
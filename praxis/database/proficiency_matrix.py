@@ -0,0 +1,358 @@
+# praxis/database/proficiency_matrix.py
+import time
+import atexit
+import sqlite3
+import datetime
+import threading
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # the matrix engine is optional; Database falls back to SQL
+    np = None
+
+from config import (
+    DB_PATH, SKILL_EMA_DECAY, PROFICIENCY_ENGINE_ENABLED, PROFICIENCY_CHECKPOINT_SECONDS,
+    PROFICIENCY_CHECKPOINT_CELLS
+)
+
+class ProficiencyMatrix:
+    """
+    Users x skills proficiency held as dense NumPy arrays.
+
+    Mirrors the user_skills table: values holds proficiencies, present marks the cells
+    that have a row, and dirty marks cells changed since the last checkpoint. Attempt
+    updates apply the same exponential moving average as Database.update_user_skills,
+    but for a whole batch at once, and cohort statistics are computed over many users
+    without a query per user. When a replay (database.replay) rewrites user_skills, the
+    next update or checkpoint reloads the matrix instead of writing stale cells back.
+    """
+
+    def __init__(self, decay: float = SKILL_EMA_DECAY):
+        """Initialize an empty matrix; call load() to fill it from the database."""
+        if np is None:
+            raise RuntimeError("NumPy is required for the proficiency matrix")
+        self.decay = decay
+        self._lock = threading.RLock()
+        self._user_rows: Dict[str, int] = {}
+        self._user_ids: List[str] = []
+        self._skill_cols: Dict[int, int] = {}
+        self._skill_ids: List[int] = []
+        self._skill_info: Dict[int, Tuple[str, str]] = {}
+        # challenge_id -> (skill columns, relevances)
+        self._challenge_skills: Dict[str, Tuple[Any, Any]] = {}
+        self._pending_mappings: Dict[str, Dict[int, float]] = {}
+        self._watermarks = {'skills': 0, 'challenge_skills': 0, 'replays': 0}
+        self.values = np.zeros((0, 0))
+        self.present = np.zeros((0, 0), dtype=bool)
+        self.dirty = np.zeros((0, 0), dtype=bool)
+        self.last_checkpoint = time.monotonic()
+
+    @classmethod
+    def from_database(cls, conn: sqlite3.Connection) -> "ProficiencyMatrix":
+        """Build a matrix holding the current contents of user_skills."""
+        matrix = cls()
+        matrix.load(conn)
+        return matrix
+
+    # Shape management
+    def _ensure_capacity(self, users: int, skills: int) -> None:
+        """Grow the arrays (doubling) so they hold at least this many users and skills."""
+        rows, cols = self.values.shape
+        if users <= rows and skills <= cols:
+            return
+        new_rows = max(users, rows * 2 if users > rows else rows, 16)
+        new_cols = max(skills, cols * 2 if skills > cols else cols, 16)
+        for name, dtype in (('values', float), ('present', bool), ('dirty', bool)):
+            grown = np.zeros((new_rows, new_cols), dtype=dtype)
+            grown[:rows, :cols] = getattr(self, name)
+            setattr(self, name, grown)
+
+    def _row(self, user_id: str) -> int:
+        row = self._user_rows.get(user_id)
+        if row is None:
+            row = self._user_rows[user_id] = len(self._user_ids)
+            self._user_ids.append(user_id)
+            self._ensure_capacity(len(self._user_ids), len(self._skill_ids))
+        return row
+
+    def _col(self, skill_id: int) -> int:
+        col = self._skill_cols.get(skill_id)
+        if col is None:
+            col = self._skill_cols[skill_id] = len(self._skill_ids)
+            self._skill_ids.append(skill_id)
+            self._ensure_capacity(len(self._user_ids), len(self._skill_ids))
+        return col
+
+    # Loading
+    def load(self, conn: sqlite3.Connection) -> None:
+        """Replace the matrix contents with user_skills."""
+        with self._lock:
+            self._watermarks['replays'] = self._latest_replay(conn)
+            self._refresh(conn)
+            rows = conn.execute('SELECT user_id, skill_id, proficiency FROM user_skills').fetchall()
+            for user_id, skill_id, _ in rows:
+                self._row(user_id)
+                self._col(skill_id)
+            self.values[:] = 0
+            self.present[:] = False
+            self.dirty[:] = False
+            if rows:
+                r = np.fromiter((self._user_rows[row[0]] for row in rows), dtype=np.int64, count=len(rows))
+                c = np.fromiter((self._skill_cols[row[1]] for row in rows), dtype=np.int64, count=len(rows))
+                self.values[r, c] = np.array([row[2] or 0.0 for row in rows])
+                self.present[r, c] = True
+
+    @staticmethod
+    def _latest_replay(conn: sqlite3.Connection) -> int:
+        return conn.execute('SELECT COALESCE(MAX(replay_id), 0) FROM replays').fetchone()[0]
+
+    def _sync(self, conn: sqlite3.Connection) -> None:
+        """Reload if a replay swapped in new proficiencies since the last load, else refresh."""
+        if self._latest_replay(conn) != self._watermarks['replays']:
+            # Pending cells predate the swap and the replay already folded in their attempts
+            self.load(conn)
+        else:
+            self._refresh(conn)
+
+    def _refresh(self, conn: sqlite3.Connection) -> None:
+        """Pick up new skills and challenge skill mappings since the last refresh."""
+        for skill_id, name, category in conn.execute(
+                'SELECT skill_id, name, category FROM skills WHERE skill_id > ? ORDER BY skill_id',
+                (self._watermarks['skills'],)):
+            self._skill_info[skill_id] = (name, category)
+            self._watermarks['skills'] = skill_id
+
+        for rowid, challenge_id, skill_id, relevance in conn.execute(
+                'SELECT rowid, challenge_id, skill_id, relevance FROM challenge_skills WHERE rowid > ? ORDER BY rowid',
+                (self._watermarks['challenge_skills'],)):
+            mapping = self._pending_mappings.get(challenge_id)
+            if mapping is None:
+                mapping = self._pending_mappings[challenge_id] = self._mapping_dict(challenge_id)
+            mapping[skill_id] = relevance or 0.0
+            self._watermarks['challenge_skills'] = rowid
+
+        # Rebuild the arrays of challenges whose mappings changed
+        for challenge_id, mapping in self._pending_mappings.items():
+            mapping = {skill_id: relevance for skill_id, relevance in mapping.items() if skill_id in self._skill_info}
+            self._challenge_skills[challenge_id] = (
+                np.array([self._col(skill_id) for skill_id in mapping], dtype=np.int64),
+                np.array(list(mapping.values()), dtype=float)
+            )
+        self._pending_mappings.clear()
+
+    def _mapping_dict(self, challenge_id: str) -> Dict[int, float]:
+        """Current skill_id -> relevance mapping of a challenge."""
+        cols, relevances = self._challenge_skills.get(challenge_id, ((), ()))
+        return {self._skill_ids[col]: relevance for col, relevance in zip(cols, relevances)}
+
+    # Updates
+    def apply_attempts(self, conn: sqlite3.Connection, updates: Iterable[Tuple[str, str, float]]) -> int:
+        """
+        Apply the skill EMA for a batch of attempts, in order.
+
+        Equivalent to calling the SQL update once per attempt: a skill's first score is
+        taken as is and later ones move it by (1 - decay). Several attempts on the same
+        user and skill within the batch are folded into one weighted sum.
+
+        Args:
+            conn: Database connection, used to pick up new challenge skill mappings and replays
+            updates: (user_id, challenge_id, score) tuples
+
+        Returns:
+            Number of (user, skill) updates applied
+        """
+        with self._lock:
+            self._sync(conn)
+            rows, cols, targets = [], [], []
+            for user_id, challenge_id, score in updates:
+                mapping = self._challenge_skills.get(challenge_id)
+                if mapping is None or not len(mapping[0]):
+                    continue
+                skill_cols, relevances = mapping
+                rows.append(np.full(len(skill_cols), self._row(user_id), dtype=np.int64))
+                cols.append(skill_cols)
+                targets.append(relevances * score)
+            if not rows:
+                return 0
+
+            rows = np.concatenate(rows)
+            cols = np.concatenate(cols)
+            targets = np.concatenate(targets)
+            d = self.decay
+
+            # Group the updates per cell, keeping their order within each cell
+            keys = rows * self.values.shape[1] + cols
+            order = np.argsort(keys, kind='stable')
+            keys, targets = keys[order], targets[order]
+            cells, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+            rank = np.arange(len(keys)) - np.repeat(starts, counts)
+            remaining = np.repeat(counts, counts) - 1 - rank
+
+            cell_rows, cell_cols = np.divmod(cells, self.values.shape[1])
+            present = self.present[cell_rows, cell_cols]
+            # The i-th of k updates to a cell keeps weight (1 - d) * d^(k-1-i); a cell
+            # without a row takes its first score outright, so that one keeps d^(k-1)
+            weights = (1 - d) * d ** remaining
+            first_insert = (rank == 0) & ~np.repeat(present, counts)
+            weights[first_insert] = d ** remaining[first_insert]
+
+            contributions = np.bincount(np.repeat(np.arange(len(cells)), counts), weights=weights * targets)
+            previous = np.where(present, self.values[cell_rows, cell_cols] * d ** counts, 0.0)
+            self.values[cell_rows, cell_cols] = previous + contributions
+            self.present[cell_rows, cell_cols] = True
+            self.dirty[cell_rows, cell_cols] = True
+            return len(keys)
+
+    def set_scores(self, conn: sqlite3.Connection, user_id: str, skill_scores: Dict[int, float]) -> None:
+        """Mirror proficiencies that were written to user_skills directly."""
+        with self._lock:
+            # The skills may have just been created; pick up their names first
+            self._sync(conn)
+            row = self._row(user_id)
+            for skill_id, score in skill_scores.items():
+                col = self._col(skill_id)
+                self.values[row, col] = score
+                self.present[row, col] = True
+
+    def checkpoint(self, conn: sqlite3.Connection) -> int:
+        """Write changed cells to user_skills in one transaction and return how many were written."""
+        with self._lock:
+            self._sync(conn)
+            cell_rows, cell_cols = np.nonzero(self.dirty)
+            if len(cell_rows):
+                now = datetime.datetime.now().isoformat()
+                try:
+                    conn.executemany('''
+                        INSERT INTO user_skills (user_id, skill_id, proficiency, last_updated)
+                        VALUES (?, ?, ?, ?)
+                        ON CONFLICT (user_id, skill_id) DO UPDATE SET
+                            proficiency = excluded.proficiency,
+                            last_updated = excluded.last_updated
+                    ''', [
+                        (self._user_ids[row], self._skill_ids[col], float(self.values[row, col]), now)
+                        for row, col in zip(cell_rows.tolist(), cell_cols.tolist())
+                    ])
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                self.dirty[cell_rows, cell_cols] = False
+            self.last_checkpoint = time.monotonic()
+            return len(cell_rows)
+
+    def maybe_checkpoint(self, conn: sqlite3.Connection, seconds: float = PROFICIENCY_CHECKPOINT_SECONDS,
+                         cells: int = PROFICIENCY_CHECKPOINT_CELLS) -> int:
+        """Checkpoint if enough cells changed or enough time passed since the last checkpoint."""
+        with self._lock:
+            if not self.dirty.any():
+                return 0
+            if time.monotonic() - self.last_checkpoint < seconds and np.count_nonzero(self.dirty) < cells:
+                return 0
+            return self.checkpoint(conn)
+
+    # Per-user reads, shaped like the Database methods they replace
+    def user_skills(self, user_id: str, limit: Optional[int] = None, ascending: bool = False) -> List[Tuple]:
+        """A user's (skill_id, name, category, proficiency) rows ordered by proficiency."""
+        with self._lock:
+            row = self._user_rows.get(user_id)
+            if row is None:
+                return []
+            n = len(self._skill_ids)
+            cols = np.nonzero(self.present[row, :n])[0]
+            values = self.values[row, cols]
+            order = np.argsort(values if ascending else -values, kind='stable')
+            if limit is not None:
+                order = order[:limit]
+            return [
+                (self._skill_ids[col], *self._skill_info.get(self._skill_ids[col], (None, None)), float(value))
+                for col, value in zip(cols[order].tolist(), values[order].tolist())
+            ]
+
+    # Cohort queries
+    def _cohort(self, user_ids: Optional[Iterable[str]]) -> Tuple[Any, Any]:
+        """Value and presence sub-matrices for a group of users (all users when None)."""
+        n_users, n_skills = len(self._user_ids), len(self._skill_ids)
+        if user_ids is None:
+            rows = np.arange(n_users)
+        else:
+            rows = np.array([self._user_rows[user_id] for user_id in user_ids if user_id in self._user_rows],
+                            dtype=np.int64)
+        return self.values[rows, :n_skills], self.present[rows, :n_skills]
+
+    def cohort_summary(self, user_ids: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Per-skill statistics over a group of users, weakest average first.
+
+        Only users with a proficiency for a skill count towards it.
+
+        Args:
+            user_ids: Users in the cohort; None for everyone
+
+        Returns:
+            List of dictionaries with skill_id, name, category, users, mean, p25, median, p75, min and max
+        """
+        with self._lock:
+            values, present = self._cohort(user_ids)
+            users = present.sum(axis=0)
+            practised = np.nonzero(users)[0]
+            if not len(practised):
+                return []
+            masked = np.where(present[:, practised], values[:, practised], np.nan)
+            means = np.nanmean(masked, axis=0)
+            p25, median, p75 = np.nanpercentile(masked, [25, 50, 75], axis=0)
+            minimum, maximum = np.nanmin(masked, axis=0), np.nanmax(masked, axis=0)
+
+            summary = []
+            for i, col in enumerate(practised.tolist()):
+                skill_id = self._skill_ids[col]
+                name, category = self._skill_info.get(skill_id, (None, None))
+                summary.append({
+                    'skill_id': skill_id,
+                    'name': name,
+                    'category': category,
+                    'users': int(users[col]),
+                    'mean': float(means[i]),
+                    'p25': float(p25[i]),
+                    'median': float(median[i]),
+                    'p75': float(p75[i]),
+                    'min': float(minimum[i]),
+                    'max': float(maximum[i])
+                })
+            return sorted(summary, key=lambda skill: skill['mean'])
+
+    def cohort_weakest_skills(self, user_ids: Optional[Iterable[str]] = None, limit: int = 5,
+                              min_users: int = 1) -> List[Dict[str, Any]]:
+        """The skills with the lowest average proficiency across a group, among those practised by min_users."""
+        return [skill for skill in self.cohort_summary(user_ids) if skill['users'] >= min_users][:limit]
+
+_matrices: Dict[str, ProficiencyMatrix] = {}
+_matrices_lock = threading.Lock()
+
+def get_proficiency_matrix(conn: sqlite3.Connection, db_path: Optional[str] = None) -> Optional[ProficiencyMatrix]:
+    """
+    Return the process-wide proficiency matrix for a database file, loading it on first use.
+
+    Returns None unless PROFICIENCY_ENGINE_ENABLED is set and NumPy is installed. Pending
+    updates are checkpointed when the process exits.
+    """
+    if not PROFICIENCY_ENGINE_ENABLED or np is None:
+        return None
+    db_path = db_path or DB_PATH
+    matrix = _matrices.get(db_path)
+    if matrix is None:
+        with _matrices_lock:
+            matrix = _matrices.get(db_path)
+            if matrix is None:
+                matrix = ProficiencyMatrix.from_database(conn)
+                _matrices[db_path] = matrix
+                atexit.register(_checkpoint_at_exit, matrix, db_path)
+    return matrix
+
+def _checkpoint_at_exit(matrix: ProficiencyMatrix, db_path: str) -> None:
+    """Flush pending updates with a fresh connection when the process exits."""
+    conn = sqlite3.connect(db_path)
+    try:
+        matrix.checkpoint(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,163 @@
+# praxis/database/recommendations.py
+import heapq
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from config import DB_PATH, RECOMMENDER_MAX_USERS
+
+class RecommendationIndex:
+    """
+    In-memory recommendation index for one database file.
+
+    Keeps a skill -> {challenge: relevance} inverted index and the set of attempted
+    challenges for recently active users. Both are refreshed incrementally from rowid
+    watermarks on every call, so challenges, skill mappings and attempts written by any
+    process show up on the next recommendation without rescanning the tables. Deleted
+    challenges are noticed from the challenge count and dropped.
+    """
+
+    def __init__(self, max_users: int = RECOMMENDER_MAX_USERS):
+        """Initialize an empty index; it is filled from the database on first use."""
+        self._lock = threading.Lock()
+        self._loaded = False
+        # challenge_id -> difficulty
+        self._challenges: Dict[str, int] = {}
+        self._skill_challenges: Dict[int, Dict[str, float]] = {}
+        self._skill_names: Dict[int, str] = {}
+        self._attempted: "OrderedDict[str, Set[str]]" = OrderedDict()
+        self.max_users = max_users
+        # Highest rowid (skill_id for skills) seen per table
+        self._watermarks = {'challenges': 0, 'challenge_skills': 0, 'skills': 0, 'attempts': 0}
+
+    def refresh(self, conn: sqlite3.Connection) -> None:
+        """Pull rows added since the last refresh into the index."""
+        with self._lock:
+            self._refresh(conn)
+
+    def _refresh(self, conn: sqlite3.Connection) -> None:
+        if not self._loaded:
+            # Only attempts made from now on are tracked; users' earlier attempts are
+            # loaded from their rollup when they first ask for recommendations
+            self._watermarks['attempts'] = conn.execute('SELECT COALESCE(MAX(rowid), 0) FROM attempts').fetchone()[0]
+            self._loaded = True
+
+        marks = self._watermarks
+        for rowid, challenge_id, difficulty in conn.execute(
+                'SELECT rowid, challenge_id, difficulty FROM challenges WHERE rowid > ? ORDER BY rowid',
+                (marks['challenges'],)):
+            self._challenges[challenge_id] = difficulty or 0
+            marks['challenges'] = rowid
+        # Every challenge is indexed once, so more indexed than stored means some were deleted
+        if len(self._challenges) > conn.execute('SELECT COUNT(*) FROM challenges').fetchone()[0]:
+            self._drop_deleted_challenges(conn)
+
+        # INSERT OR REPLACE gives a re-mapped pair a new rowid, so relevance updates are picked up too
+        for rowid, challenge_id, skill_id, relevance in conn.execute(
+                'SELECT rowid, challenge_id, skill_id, relevance FROM challenge_skills WHERE rowid > ? ORDER BY rowid',
+                (marks['challenge_skills'],)):
+            self._skill_challenges.setdefault(skill_id, {})[challenge_id] = relevance or 0.0
+            marks['challenge_skills'] = rowid
+
+        for skill_id, name in conn.execute(
+                'SELECT skill_id, name FROM skills WHERE skill_id > ? ORDER BY skill_id', (marks['skills'],)):
+            self._skill_names[skill_id] = name
+            marks['skills'] = skill_id
+
+        for rowid, user_id, challenge_id in conn.execute(
+                'SELECT rowid, user_id, challenge_id FROM attempts WHERE rowid > ? ORDER BY rowid',
+                (marks['attempts'],)):
+            attempted = self._attempted.get(user_id)
+            if attempted is not None:
+                attempted.add(challenge_id)
+            marks['attempts'] = rowid
+
+    def _drop_deleted_challenges(self, conn: sqlite3.Connection) -> None:
+        """Remove challenges that are no longer in the database from the index."""
+        existing = {row[0] for row in conn.execute('SELECT challenge_id FROM challenges')}
+        for challenge_id in [challenge_id for challenge_id in self._challenges if challenge_id not in existing]:
+            del self._challenges[challenge_id]
+        for challenges in self._skill_challenges.values():
+            for challenge_id in [challenge_id for challenge_id in challenges if challenge_id not in existing]:
+                del challenges[challenge_id]
+
+    def _attempted_by(self, conn: sqlite3.Connection, user_id: str) -> Set[str]:
+        """The user's attempted challenges, loading them on first use (least recently used users are dropped)."""
+        attempted = self._attempted.get(user_id)
+        if attempted is None:
+            attempted = {row[0] for row in conn.execute(
+                'SELECT challenge_id FROM user_challenge_stats WHERE user_id = ?', (user_id,))}
+            self._attempted[user_id] = attempted
+            while len(self._attempted) > self.max_users:
+                self._attempted.popitem(last=False)
+        self._attempted.move_to_end(user_id)
+        return attempted
+
+    def recommend(self, conn: sqlite3.Connection, user_id: str, weak_skills: List[Tuple[int, float]],
+                  limit: int = 5) -> List[Tuple[str, float, List[int]]]:
+        """
+        Rank unattempted challenges by how well they cover the user's weak skills.
+
+        A challenge scores the sum of relevance x weakness (1 - proficiency) over the weak
+        skills it trains, scaled by how close its difficulty is to the level those skills
+        suggest. Ties go to the easier challenge.
+
+        Args:
+            conn: Database connection
+            user_id: ID of the user
+            weak_skills: (skill_id, proficiency) pairs, proficiency between 0 and 1
+            limit: Maximum number of recommendations
+
+        Returns:
+            (challenge_id, score, covered weak skill IDs) tuples, best first
+        """
+        with self._lock:
+            self._refresh(conn)
+            attempted = self._attempted_by(conn, user_id)
+
+            weights = [(skill_id, max(1.0 - min(max(proficiency or 0.0, 0.0), 1.0), 0.05))
+                       for skill_id, proficiency in weak_skills]
+            # Weaker skills call for easier challenges (difficulty 1-5)
+            target_difficulty = 1 + 4 * (1 - sum(weight for _, weight in weights) / len(weights))
+
+            coverage: Dict[str, float] = {}
+            for skill_id, weight in weights:
+                for challenge_id, relevance in self._skill_challenges.get(skill_id, {}).items():
+                    coverage[challenge_id] = coverage.get(challenge_id, 0.0) + relevance * weight
+
+            fits: Dict[int, float] = {}
+            scored = []
+            for challenge_id, score in coverage.items():
+                difficulty = self._challenges.get(challenge_id)
+                if difficulty is None or challenge_id in attempted:
+                    continue
+                fit = fits.get(difficulty)
+                if fit is None:
+                    fit = fits[difficulty] = 0.5 + 0.5 / (1.0 + abs(difficulty - target_difficulty))
+                scored.append((score * fit, -difficulty, challenge_id))
+
+            return [
+                (challenge_id, score,
+                 [skill_id for skill_id, _ in weights if challenge_id in self._skill_challenges.get(skill_id, {})])
+                for score, _, challenge_id in heapq.nlargest(limit, scored)
+            ]
+
+    def skill_name(self, skill_id: int) -> Optional[str]:
+        """Name of an indexed skill."""
+        return self._skill_names.get(skill_id)
+
+_indexes: Dict[str, RecommendationIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_recommendation_index(db_path: Optional[str] = None) -> RecommendationIndex:
+    """Return the process-wide recommendation index for a database file."""
+    db_path = db_path or DB_PATH
+    index = _indexes.get(db_path)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(db_path)
+            if index is None:
+                index = RecommendationIndex()
+                _indexes[db_path] = index
+    return index
@@ -0,0 +1,356 @@
+# praxis/database/replay.py
+"""
+Recompute user_skills from the attempts history.
+
+Attempts are streamed in (user_id, created_at) order in fixed-size chunks and fed
+through a proficiency model, one partition of users per worker process. Results go to
+a staging table and replace user_skills in a single transaction once every partition
+has finished, so readers see either the old or the new proficiencies.
+
+Run from the praxis directory:
+    python -m database.replay --workers 4
+    python -m database.replay --users <user_id> <user_id> --prune
+    python -m database.replay --model mypackage.models:DecayedMean
+
+Each replay is logged in the replays table. Servers running the in-memory proficiency
+engine reload user_skills when they see a new entry, discarding in-memory updates made
+before the swap (the replay already folded their attempts in).
+"""
+import abc
+import time
+import datetime
+import bisect
+import argparse
+import importlib
+import multiprocessing
+from typing import Dict, List, Any, Callable, Iterator, Optional, Sequence, Tuple
+
+from config import DB_PATH, SKILL_EMA_DECAY, REPLAY_WORKERS, REPLAY_CHUNK_SIZE
+from database.pool import get_connection_pool
+from database.migrations import run_migrations
+
+STAGING_TABLE = "user_skills_replay"
+
+class ProficiencyModel(abc.ABC):
+    """Base class for replay models: how one attempt moves a user's proficiency in one skill."""
+
+    @abc.abstractmethod
+    def update(self, proficiency: Optional[float], score: float, relevance: float) -> float:
+        """
+        Return the new proficiency after an attempt.
+
+        Args:
+            proficiency: Current proficiency, or None for the user's first attempt at the skill
+            score: Attempt score between 0 and 1
+            relevance: How much the challenge exercises the skill, between 0 and 1
+        """
+
+class EmaModel(ProficiencyModel):
+    """The exponential moving average applied by Database.update_user_skills."""
+
+    def __init__(self, decay: float = SKILL_EMA_DECAY):
+        self.decay = decay
+
+    def update(self, proficiency: Optional[float], score: float, relevance: float) -> float:
+        if proficiency is None:
+            return score * relevance
+        return proficiency * self.decay + score * relevance * (1 - self.decay)
+
+# Models available by name; others are given as "module:attribute"
+MODELS: Dict[str, Callable[[], ProficiencyModel]] = {
+    "ema": EmaModel
+}
+
+def load_model(spec: str) -> ProficiencyModel:
+    """Resolve a model name or "module:attribute" (a ProficiencyModel class, factory or instance)."""
+    if spec in MODELS:
+        return MODELS[spec]()
+    module_name, _, attribute = spec.partition(":")
+    if not attribute:
+        raise ValueError(f"Unknown proficiency model {spec!r}; use one of {sorted(MODELS)} or module:attribute")
+    model = getattr(importlib.import_module(module_name), attribute)
+    return model() if callable(model) and not isinstance(model, ProficiencyModel) else model
+
+def _load_relevance(conn) -> Dict[str, List[Tuple[int, float]]]:
+    """challenge_id -> [(skill_id, relevance)], for skills that exist, as the live update sees them."""
+    relevance: Dict[str, List[Tuple[int, float]]] = {}
+    for challenge_id, skill_id, value in conn.execute('''
+        SELECT cs.challenge_id, cs.skill_id, cs.relevance
+        FROM challenge_skills cs
+        JOIN skills s ON cs.skill_id = s.skill_id
+    '''):
+        relevance.setdefault(challenge_id, []).append((skill_id, value or 0.0))
+    return relevance
+
+def _attempt_chunks(conn, lower: Optional[str], upper: Optional[str], user_ids: Optional[Sequence[str]],
+                    watermark: int, chunk_size: int) -> Iterator[List[Tuple]]:
+    """
+    Yield a partition's scored attempts in (user_id, created_at, rowid) order, chunk_size at a time.
+
+    Each chunk is a separate keyset query on idx_attempts_user_created, so no read
+    transaction is held between chunks and memory stays at one chunk.
+    """
+    after: Optional[Tuple[str, str, int]] = None
+    while True:
+        conditions = ['rowid <= ?', 'score IS NOT NULL']
+        params: List[Any] = [watermark]
+        if user_ids is not None:
+            # Drop the users already done so each query only visits the remaining ones
+            remaining = user_ids[bisect.bisect_left(user_ids, after[0]):] if after else user_ids
+            if not remaining:
+                return
+            conditions.append(f"user_id IN ({', '.join('?' for _ in remaining)})")
+            params.extend(remaining)
+        else:
+            # The row value below does not bound the index scan, so start it at the current user
+            start = lower
+            if after and (start is None or after[0] > start):
+                start = after[0]
+            if start is not None:
+                conditions.append('user_id >= ?')
+                params.append(start)
+            if upper is not None:
+                conditions.append('user_id < ?')
+                params.append(upper)
+        if after:
+            conditions.append('(user_id, created_at, rowid) > (?, ?, ?)')
+            params.extend(after)
+
+        rows = conn.execute(f'''
+            SELECT user_id, challenge_id, score, created_at, rowid
+            FROM attempts
+            WHERE {' AND '.join(conditions)}
+            ORDER BY user_id, created_at, rowid
+            LIMIT ?
+        ''', params + [chunk_size]).fetchall()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < chunk_size:
+            return
+        after = (rows[-1][0], rows[-1][3], rows[-1][4])
+
+def _write_staging(conn, rows: List[Tuple]) -> None:
+    """Append finished users' proficiencies to the staging table."""
+    try:
+        conn.executemany(
+            f'INSERT INTO {STAGING_TABLE} (user_id, skill_id, proficiency, last_updated) VALUES (?, ?, ?, ?)', rows
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+def _replay_partition(task: Tuple) -> Dict[str, int]:
+    """
+    Worker process: replay one partition of users into the staging table.
+
+    Attempts arrive grouped by user, so only the current user's skills are held in
+    memory; finished users are buffered and written chunk_size rows at a time.
+    """
+    db_path, model_spec, lower, upper, user_ids, watermark, chunk_size = task
+    model = load_model(model_spec)
+    pool = get_connection_pool(db_path)
+    conn = pool.acquire()
+    try:
+        relevance = _load_relevance(conn)
+        stats = {'attempts': 0, 'users': 0, 'rows': 0}
+        pending: List[Tuple] = []
+        current_user = None
+        skills: Dict[int, Tuple[float, str]] = {}
+
+        for chunk in _attempt_chunks(conn, lower, upper, user_ids, watermark, chunk_size):
+            for user_id, challenge_id, score, created_at, _ in chunk:
+                if user_id != current_user:
+                    pending.extend((current_user, skill_id, value, updated)
+                                   for skill_id, (value, updated) in skills.items())
+                    current_user, skills = user_id, {}
+                    stats['users'] += 1
+                for skill_id, skill_relevance in relevance.get(challenge_id, ()):
+                    previous = skills.get(skill_id)
+                    skills[skill_id] = (model.update(previous[0] if previous else None, score, skill_relevance),
+                                        created_at)
+                stats['attempts'] += 1
+            if len(pending) >= chunk_size:
+                _write_staging(conn, pending)
+                stats['rows'] += len(pending)
+                pending = []
+
+        pending.extend((current_user, skill_id, value, updated) for skill_id, (value, updated) in skills.items())
+        if pending:
+            _write_staging(conn, pending)
+            stats['rows'] += len(pending)
+        return stats
+    finally:
+        pool.release(conn)
+
+def _user_partitions(conn, watermark: int, partitions: int) -> List[Tuple[Optional[str], Optional[str]]]:
+    """Split the users with attempts into about equal (lower, upper) user_id ranges."""
+    users = conn.execute('SELECT COUNT(DISTINCT user_id) FROM attempts WHERE rowid <= ?', (watermark,)).fetchone()[0]
+    step = max(users // max(partitions, 1), 1)
+    bounds: List[Optional[str]] = [None]
+    # Stream the distinct users off the index, keeping only every step-th as a boundary
+    for i, (user_id,) in enumerate(conn.execute('SELECT DISTINCT user_id FROM attempts ORDER BY user_id')):
+        if i and i % step == 0 and len(bounds) < partitions:
+            bounds.append(user_id)
+    bounds.append(None)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def _catch_up(conn, model: ProficiencyModel, user_ids: Optional[Sequence[str]], watermark: int) -> int:
+    """Apply attempts recorded after the replay started to the staging table; returns how many."""
+    relevance = _load_relevance(conn)
+    query = 'SELECT user_id, challenge_id, score, created_at FROM attempts WHERE rowid > ? AND score IS NOT NULL'
+    rows = conn.execute(query + ' ORDER BY rowid', (watermark,)).fetchall()
+    selected = set(user_ids) if user_ids is not None else None
+
+    applied = 0
+    for user_id, challenge_id, score, created_at in rows:
+        if selected is not None and user_id not in selected:
+            continue
+        for skill_id, skill_relevance in relevance.get(challenge_id, ()):
+            row = conn.execute(f'SELECT proficiency FROM {STAGING_TABLE} WHERE user_id = ? AND skill_id = ?',
+                               (user_id, skill_id)).fetchone()
+            conn.execute(f'''
+                INSERT INTO {STAGING_TABLE} (user_id, skill_id, proficiency, last_updated) VALUES (?, ?, ?, ?)
+                ON CONFLICT (user_id, skill_id) DO UPDATE SET
+                    proficiency = excluded.proficiency,
+                    last_updated = excluded.last_updated
+            ''', (user_id, skill_id, model.update(row[0] if row else None, score, skill_relevance), created_at))
+        applied += 1
+    return applied
+
+def _swap_in(conn, model: ProficiencyModel, model_spec: str, user_ids: Optional[Sequence[str]], watermark: int,
+             prune: bool) -> int:
+    """
+    Replace user_skills with the staging table in one transaction and log the replay.
+
+    The write lock is taken first, so attempts recorded during the replay are folded
+    in and no new ones can land before the swap commits.
+    """
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        caught_up = _catch_up(conn, model, user_ids, watermark)
+        if prune:
+            if user_ids is None:
+                conn.execute('DELETE FROM user_skills')
+            else:
+                for i in range(0, len(user_ids), 500):
+                    batch = user_ids[i:i + 500]
+                    conn.execute(f"DELETE FROM user_skills WHERE user_id IN ({', '.join('?' for _ in batch)})", batch)
+        # WHERE true keeps the upsert clause from being parsed as a join constraint
+        conn.execute(f'''
+            INSERT INTO user_skills (user_id, skill_id, proficiency, last_updated)
+            SELECT user_id, skill_id, proficiency, last_updated FROM {STAGING_TABLE} WHERE true
+            ON CONFLICT (user_id, skill_id) DO UPDATE SET
+                proficiency = excluded.proficiency,
+                last_updated = excluded.last_updated
+        ''')
+        conn.execute(f'DROP TABLE {STAGING_TABLE}')
+        conn.execute('INSERT INTO replays (model, finished_at) VALUES (?, ?)',
+                     (model_spec, datetime.datetime.now().isoformat()))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return caught_up
+
+def replay_user_skills(db_path: str = DB_PATH, user_ids: Optional[Sequence[str]] = None, model: str = "ema",
+                       workers: int = REPLAY_WORKERS, chunk_size: int = REPLAY_CHUNK_SIZE, prune: bool = False,
+                       on_progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+    """
+    Rebuild user_skills by replaying attempts through a proficiency model.
+
+    Args:
+        db_path: Path to the SQLite database file
+        user_ids: Users to rebuild; None for every user with attempts
+        model: Model name from MODELS or "module:attribute"
+        workers: Worker processes; users are split into ranges across them
+        chunk_size: Attempts read per query and staging rows written per transaction
+        prune: Also delete the rebuilt users' proficiencies that no attempt produces
+            (e.g. scores saved from code review); by default those are kept
+        on_progress: Called with (partitions done, total partitions)
+
+    Returns:
+        Dictionary with attempts, users and rows replayed, caught_up attempts and seconds taken
+    """
+    started = time.perf_counter()
+    replay_model = load_model(model)
+    pool = get_connection_pool(db_path)
+    conn = pool.acquire()
+    try:
+        run_migrations(conn)
+        conn.execute(f'DROP TABLE IF EXISTS {STAGING_TABLE}')
+        conn.execute(f'''
+            CREATE TABLE {STAGING_TABLE} (
+                user_id TEXT,
+                skill_id INTEGER,
+                proficiency REAL,
+                last_updated TIMESTAMP,
+                PRIMARY KEY (user_id, skill_id)
+            )
+        ''')
+        conn.commit()
+        # Attempts after this rowid are applied during the swap
+        watermark = conn.execute('SELECT COALESCE(MAX(rowid), 0) FROM attempts').fetchone()[0]
+
+        # More partitions than workers, so one busy range does not hold up the rest
+        partitions = max(workers, 1) * 4
+        if user_ids is not None:
+            user_ids = sorted(set(user_ids))
+            size = max(-(-len(user_ids) // partitions), 1)
+            tasks = [(db_path, model, None, None, user_ids[i:i + size], watermark, chunk_size)
+                     for i in range(0, len(user_ids), size)]
+        else:
+            tasks = [(db_path, model, lower, upper, None, watermark, chunk_size)
+                     for lower, upper in _user_partitions(conn, watermark, partitions)]
+
+        totals = {'attempts': 0, 'users': 0, 'rows': 0}
+        if workers > 1 and len(tasks) > 1:
+            # Spawned workers start without the parent's open connections
+            with multiprocessing.get_context("spawn").Pool(min(workers, len(tasks))) as worker_pool:
+                for done, stats in enumerate(worker_pool.imap_unordered(_replay_partition, tasks), 1):
+                    for key in totals:
+                        totals[key] += stats[key]
+                    if on_progress:
+                        on_progress(done, len(tasks))
+        else:
+            for done, task in enumerate(tasks, 1):
+                stats = _replay_partition(task)
+                for key in totals:
+                    totals[key] += stats[key]
+                if on_progress:
+                    on_progress(done, len(tasks))
+
+        totals['caught_up'] = _swap_in(conn, replay_model, model, user_ids, watermark, prune)
+    except Exception:
+        conn.execute(f'DROP TABLE IF EXISTS {STAGING_TABLE}')
+        conn.commit()
+        raise
+    finally:
+        pool.release(conn)
+
+    totals['seconds'] = time.perf_counter() - started
+    return totals
+
+def main() -> None:
+    """Replay attempts into user_skills from the command line."""
+    parser = argparse.ArgumentParser(description="Recompute user_skills from the attempts history")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--users", nargs="+", help="Only rebuild these user IDs")
+    parser.add_argument("--model", default="ema", help=f"One of {sorted(MODELS)} or module:attribute")
+    parser.add_argument("--workers", type=int, default=REPLAY_WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=REPLAY_CHUNK_SIZE)
+    parser.add_argument("--prune", action="store_true",
+                        help="Delete rebuilt users' proficiencies that no attempt produces")
+    args = parser.parse_args()
+
+    result = replay_user_skills(
+        args.db, args.users, args.model, args.workers, args.chunk_size, args.prune,
+        on_progress=lambda done, total: print(f"\r{done}/{total} partitions", end="", flush=True)
+    )
+    print()
+    print(f"Replayed {result['attempts']:,} attempts for {result['users']:,} users into {result['rows']:,} "
+          f"skill rows ({result['caught_up']} late attempts) in {result['seconds']:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# praxis/database/skill_registry.py
+import sqlite3
+import threading
+from typing import Dict, Iterable, Optional
+
+from config import DB_PATH
+
+def normalize_skill_name(name: str) -> str:
+    """Normalise a skill name for lookups: collapse whitespace and ignore case."""
+    return " ".join(name.split()).casefold()
+
+class SkillRegistry:
+    """In-memory index of skill names to skill IDs for one database file."""
+
+    def __init__(self):
+        """Initialize an empty index; it is filled from the skills table on first use."""
+        self._ids: Dict[str, int] = {}
+        # Highest skill_id loaded so far. skill_id is AUTOINCREMENT, so skills created
+        # by other processes always appear above it and can be picked up incrementally.
+        self._watermark = 0
+        self._lock = threading.Lock()
+
+    def refresh(self, conn: sqlite3.Connection) -> None:
+        """Load skills created since the last refresh, including those from other processes."""
+        with self._lock:
+            rows = conn.execute(
+                'SELECT skill_id, name FROM skills WHERE skill_id > ? ORDER BY skill_id',
+                (self._watermark,)
+            ).fetchall()
+            self._add(rows)
+
+    def _add(self, rows: Iterable) -> None:
+        """Index (skill_id, name) rows; the oldest skill wins when names normalise alike."""
+        for skill_id, name in rows:
+            self._ids.setdefault(normalize_skill_name(name), skill_id)
+            self._watermark = max(self._watermark, skill_id)
+
+    def resolve(self, conn: sqlite3.Connection, names: Iterable[str],
+                category: str = "auto_detected") -> Dict[str, int]:
+        """
+        Map skill names to skill IDs, creating any missing skills in one batched insert.
+
+        Newly created skills are committed immediately, so call this before starting
+        other writes on the same connection.
+
+        Args:
+            conn: Database connection
+            names: Skill names as given by the caller
+            category: Category for skills that have to be created
+
+        Returns:
+            Dictionary mapping each given name to its skill ID
+        """
+        names = [name for name in names if name and name.strip()]
+        missing = self._missing(names)
+        if missing:
+            # Another process may have created them since our last look
+            self.refresh(conn)
+            missing = self._missing(names)
+
+        if missing:
+            # One new skill per normalised name, stored with collapsed whitespace
+            new_skills = {}
+            for name in missing:
+                new_skills.setdefault(normalize_skill_name(name), " ".join(name.split()))
+
+            placeholders = ", ".join(["(?, ?)"] * len(new_skills))
+            params = [value for name in new_skills.values() for value in (name, category)]
+            with self._lock:
+                rows = conn.execute(
+                    f'INSERT INTO skills (name, category) VALUES {placeholders} '
+                    f'ON CONFLICT (name) DO NOTHING RETURNING skill_id, name',
+                    params
+                ).fetchall()
+                conn.commit()
+                self._add(rows)
+
+            # Names that conflicted were inserted concurrently elsewhere
+            if self._missing(names):
+                self.refresh(conn)
+
+        return {name: self._ids[normalize_skill_name(name)] for name in names
+                if normalize_skill_name(name) in self._ids}
+
+    def _missing(self, names: Iterable[str]) -> list:
+        """Names that are not in the index yet."""
+        return [name for name in names if normalize_skill_name(name) not in self._ids]
+
+_registries: Dict[str, SkillRegistry] = {}
+_registries_lock = threading.Lock()
+
+def get_skill_registry(db_path: Optional[str] = None) -> SkillRegistry:
+    """Return the process-wide skill registry for a database file."""
+    db_path = db_path or DB_PATH
+    registry = _registries.get(db_path)
+    if registry is None:
+        with _registries_lock:
+            registry = _registries.get(db_path)
+            if registry is None:
+                registry = SkillRegistry()
+                _registries[db_path] = registry
+    return registry
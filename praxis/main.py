@@ -32,66 +32,66 @@ def main():
     # Initialize database connection
     db = Database()
     
-    # Sidebar layout
-    show_logo()
-    
-    # API Key input
-    api_key = st.sidebar.text_input("Groq API Key", type="password")
-    
-    # User login/logout section in sidebar
-    render_sidebar_auth(db)
+    try:
+        # Sidebar layout
+        show_logo()
     
-    # Learning approach explanation
-    show_learning_approach()
+        # API Key input
+        api_key = st.sidebar.text_input("Groq API Key", type="password")
     
-    # Navigation in sidebar for logged-in users
-    if st.session_state.user_id:
-        render_sidebar_navigation()
+        # User login/logout section in sidebar
+        render_sidebar_auth(db)
     
-    # Mode selection
-    app_mode = st.sidebar.selectbox(
-        "Choose Mode",
-        APP_MODES,
-        key="app_mode_select",
-        on_change=lambda: setattr(st.session_state, 'mode', st.session_state.app_mode_select)
-    )
+        # Learning approach explanation
+        show_learning_approach()
     
-    # About section
-    show_about()
+        # Navigation in sidebar for logged-in users
+        if st.session_state.user_id:
+            render_sidebar_navigation()
+    
+        # Mode selection
+        app_mode = st.sidebar.selectbox(
+            "Choose Mode",
+            APP_MODES,
+            key="app_mode_select",
+            on_change=lambda: setattr(st.session_state, 'mode', st.session_state.app_mode_select)
+        )
     
-    try:
-        # Initialize the assistant if API key is provided
-        if not api_key:
-            st.warning("Please enter your Groq API key in the sidebar to continue.")
-            st.markdown("""
-            ### How to get a Groq API Key:
-            1. Sign up at [groq.com](https://console.groq.com/signup)
-            2. Navigate to API Keys in your account
-            3. Create a new API key
-            4. Paste it in the sidebar
-            """)
-            return
+        # About section
+        show_about()
+    
+        try:
+            # Initialize the assistant if API key is provided
+            if not api_key:
+                st.warning("Please enter your Groq API key in the sidebar to continue.")
+                st.markdown("""
+                ### How to get a Groq API Key:
+                1. Sign up at [groq.com](https://console.groq.com/signup)
+                2. Navigate to API Keys in your account
+                3. Create a new API key
+                4. Paste it in the sidebar
+                """)
+                return
             
-        # Initialize the assistant
-        assistant = EducationalCodeAssistant(api_key=api_key, db=db)
+            # Initialize the assistant
+            assistant = EducationalCodeAssistant(api_key=api_key, db=db)
         
-        # Route to appropriate page based on session state
-        route_to_page(db, assistant)
+            # Route to appropriate page based on session state
+            route_to_page(db, assistant)
         
-    except Exception as e:
-        st.error(f"An error occurred: {str(e)}")
-        st.markdown(
-            """
-            #### Troubleshooting:
-            - Make sure you've entered a valid Groq API key
-            - Check your internet connection
-            - Try a simpler code request
-            - Verify that the Groq API service is available
-            """
-        )
-    
-    # Close database connection on app exit
-    if db:
+        except Exception as e:
+            st.error(f"An error occurred: {str(e)}")
+            st.markdown(
+                """
+                #### Troubleshooting:
+                - Make sure you've entered a valid Groq API key
+                - Check your internet connection
+                - Try a simpler code request
+                - Verify that the Groq API service is available
+                """
+            )
+    finally:
+        # Return the database connection to the pool, even on early return or rerun
         db.close()
 
 def initialize_session_state():
@@ -168,6 +168,10 @@ def render_sidebar_navigation() -> None:
     if st.sidebar.button("Start New Challenge"):
         reset_app()
         go_to_page("start")
+    
+    from ui.admin import is_admin
+    if is_admin(st.session_state.username) and st.sidebar.button("LLM Usage"):
+        go_to_page("admin")
 
 def route_to_page(db, assistant) -> None:
     """Route to the appropriate page based on the session state."""
@@ -196,6 +200,11 @@ def route_to_page(db, assistant) -> None:
         from ui.history import render_history_page
         render_history_page(db, assistant, go_to_page)
     
+    # LLM usage admin page
+    elif st.session_state.page == "admin" and st.session_state.user_id:
+        from ui.admin import render_admin_page
+        render_admin_page(db, assistant, go_to_page)
+    
     # Challenge workflow pages
     elif st.session_state.mode == "Learning Path":
         if st.session_state.page == "challenge":
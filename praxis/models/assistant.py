@@ -2,11 +2,51 @@
 import os
 import re
 import json
+import time
+import hashlib
+import threading
 import requests
-from typing import Dict, List, Any, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Callable
 
-from config import GROQ_API_URL, GROQ_DEFAULT_MODEL
+from config import (
+    GROQ_API_URL, GROQ_DEFAULT_MODEL, GROQ_POOL_CONNECTIONS, GROQ_POOL_MAXSIZE,
+    GROQ_CONNECT_TIMEOUT, GROQ_READ_TIMEOUT, GROQ_MAX_RETRIES, GROQ_BACKOFF_MAX, LLM_CACHE_ENABLED,
+    LLM_SINGLE_FLIGHT_ENABLED
+)
 from models.skill_analyzer import SkillAnalyzer
+from models.path_builder import parse_path_challenges, build_learning_path
+from utils.response_cache import ResponseCache, get_response_cache
+from utils.llm_metrics import get_llm_metrics
+from utils.single_flight import get_single_flight
+from utils.rate_limiter import (
+    RateLimitExceeded, get_rate_limiter, estimate_tokens, retry_after_seconds, backoff_delay
+)
+
+# Rate limiting and transient server errors worth retrying
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Process-wide HTTP session shared by every assistant instance, so Streamlit
+# reruns and concurrent users reuse kept-alive connections to the Groq endpoint.
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+def get_http_session() -> requests.Session:
+    """Return the shared pooled HTTP session, creating it on first use."""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=GROQ_POOL_CONNECTIONS,
+                    pool_maxsize=GROQ_POOL_MAXSIZE,
+                    pool_block=False
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _http_session = session
+    return _http_session
 
 class EducationalCodeAssistant:
     def __init__(self, api_key: Optional[str] = None, db=None):
@@ -21,6 +61,8 @@ class EducationalCodeAssistant:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        # Identifies the key (never the key itself) wherever state must not be shared across keys
+        self.api_key_id = hashlib.sha256(self.api_key.encode()).hexdigest()[:16]
         
         # Model configurations
         self.llama3_70b = GROQ_DEFAULT_MODEL
@@ -32,8 +74,88 @@ class EducationalCodeAssistant:
         # Initialize skill analyzer
         self.skill_analyzer = SkillAnalyzer(self)
     
-    def _send_request(self, model: str, messages: List[Dict[str, str]], temperature: float = 0.2, max_tokens: int = 4000) -> Dict:
-        """Send a request to the Groq API."""
+    def _post(self, payload: Dict[str, Any], prompt_tokens: int, stream: bool = False) -> Tuple[requests.Response, int]:
+        """
+        POST a completion request within this API key's rate limit, retrying 429s and transient failures.
+        
+        Waits for Retry-After (or the rate-limit reset headers) when the API sends one and
+        uses jittered exponential backoff otherwise. A 429 pauses every session using the
+        same key; sessions with other keys are unaffected. The prompt tokens reserved for
+        an attempt that failed are returned before retrying.
+        
+        Returns:
+            The successful response and the number of retries it took. Exceptions raised
+            after retrying carry the count in their retries attribute.
+        """
+        limiter = get_rate_limiter(self.api_key_id)
+        retries = 0
+        while True:
+            try:
+                limiter.acquire(prompt_tokens)
+            except RateLimitExceeded as e:
+                e.retries = retries
+                raise
+            
+            try:
+                response = get_http_session().post(
+                    self.api_url,
+                    headers=self.headers,
+                    json=payload,
+                    timeout=(GROQ_CONNECT_TIMEOUT, GROQ_READ_TIMEOUT),
+                    stream=stream
+                )
+                limiter.update_from_headers(response.headers)
+                if response.ok:
+                    return response, retries
+                limiter.refund(prompt_tokens)
+                if response.status_code not in RETRYABLE_STATUS or retries >= GROQ_MAX_RETRIES:
+                    response.raise_for_status()
+                
+                delay = retry_after_seconds(response.headers)
+                if delay is None:
+                    delay = backoff_delay(retries)
+                if response.status_code == 429:
+                    limiter.pause(delay)
+                response.close()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                limiter.refund(prompt_tokens)
+                if retries >= GROQ_MAX_RETRIES:
+                    e.retries = retries
+                    raise
+                delay = backoff_delay(retries)
+            except requests.exceptions.RequestException as e:
+                # HTTP errors were refunded above when their status was checked
+                if not isinstance(e, requests.exceptions.HTTPError):
+                    limiter.refund(prompt_tokens)
+                e.retries = retries
+                raise
+            
+            retries += 1
+            time.sleep(min(delay, GROQ_BACKOFF_MAX))
+    
+    def _send_request(self, model: str, messages: List[Dict[str, str]], temperature: float = 0.2, max_tokens: int = 4000,
+                      use_cache: bool = False, stream: bool = False, operation: str = "unknown"):
+        """
+        Send a request to the Groq API, optionally serving it from the response cache.
+        
+        With stream=True the completion is requested in streaming mode and a generator
+        of content deltas is returned instead of the response dictionary. Every call is
+        recorded in the LLM metrics registry under its operation name.
+        """
+        if stream:
+            return self._stream_request(model, messages, temperature, max_tokens, operation)
+        
+        metrics = get_llm_metrics()
+        start = time.perf_counter()
+        
+        cache_key = None
+        if use_cache and LLM_CACHE_ENABLED:
+            cache_key = ResponseCache.make_key(model, messages, temperature, max_tokens)
+            cached = get_response_cache().get(cache_key)
+            if cached is not None:
+                metrics.record(operation, model, (time.perf_counter() - start) * 1000, cache_hit=True)
+                return cached
+        
         payload = {
             "model": model,
             "messages": messages,
@@ -41,12 +163,117 @@ class EducationalCodeAssistant:
             "max_tokens": max_tokens
         }
         
+        # Identical requests already in flight from other sessions with the same API key
+        # share one upstream call; sessions with other keys never see its result or error
+        if LLM_SINGLE_FLIGHT_ENABLED:
+            key = f"{self.api_key_id}:{cache_key or ResponseCache.make_key(model, messages, temperature, max_tokens)}"
+            led = False
+            
+            def complete() -> Dict:
+                nonlocal led
+                led = True
+                return self._complete(model, payload, operation, start, cache_key)
+            
+            try:
+                result, shared = get_single_flight().do(key, complete)
+            except Exception as e:
+                # The caller that made the request has already recorded its failure
+                if not led:
+                    metrics.record(operation, model, (time.perf_counter() - start) * 1000,
+                                   error=type(e).__name__, coalesced=True)
+                raise
+            if shared:
+                metrics.record(operation, model, (time.perf_counter() - start) * 1000, coalesced=True)
+            return result
+        
+        return self._complete(model, payload, operation, start, cache_key)
+    
+    def _complete(self, model: str, payload: Dict[str, Any], operation: str, start: float,
+                  cache_key: Optional[str] = None) -> Dict:
+        """Perform a non-streaming completion request, record it and cache the result."""
+        metrics = get_llm_metrics()
+        prompt_tokens = estimate_tokens(payload['messages'])
         try:
-            response = requests.post(self.api_url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            response, retries = self._post(payload, prompt_tokens)
+            result = response.json()
+        except (requests.exceptions.RequestException, RateLimitExceeded) as e:
+            metrics.record(operation, model, (time.perf_counter() - start) * 1000,
+                           retries=getattr(e, 'retries', 0), error=type(e).__name__)
             raise Exception(f"API request failed: {str(e)}")
+        
+        # requests measures elapsed up to the response headers, i.e. time to first byte
+        usage = result.get('usage') or {}
+        get_rate_limiter(self.api_key_id).settle(prompt_tokens, usage.get('total_tokens', 0))
+        metrics.record(
+            operation, model, (time.perf_counter() - start) * 1000,
+            ttfb_ms=response.elapsed.total_seconds() * 1000,
+            prompt_tokens=usage.get('prompt_tokens', 0),
+            completion_tokens=usage.get('completion_tokens', 0),
+            retries=retries
+        )
+        
+        # Only cache well-formed completions
+        if cache_key and result.get('choices'):
+            get_response_cache().set(cache_key, result)
+        
+        return result
+    
+    def _stream_request(self, model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: int,
+                        operation: str = "unknown") -> Iterator[str]:
+        """
+        Stream a chat completion from the Groq API, yielding content deltas as they arrive.
+        
+        Failures are only retried before the first chunk; once content has been yielded
+        a retry would repeat it.
+        """
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True
+        }
+        
+        start = time.perf_counter()
+        ttfb_ms = None
+        usage = {}
+        retries = 0
+        error = None
+        prompt_tokens = estimate_tokens(messages)
+        try:
+            response, retries = self._post(payload, prompt_tokens, stream=True)
+            
+            with response:
+                # Server-sent events: one "data: {json}" line per chunk, terminated by "data: [DONE]"
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    # Groq reports usage on the final chunk under x_groq; OpenAI-style servers use usage
+                    usage = chunk.get('x_groq', {}).get('usage') or chunk.get('usage') or usage
+                    if chunk.get('choices'):
+                        delta = chunk['choices'][0].get('delta', {}).get('content')
+                        if delta:
+                            if ttfb_ms is None:
+                                ttfb_ms = (time.perf_counter() - start) * 1000
+                            yield delta
+        except (requests.exceptions.RequestException, RateLimitExceeded, json.JSONDecodeError) as e:
+            # A malformed chunk fails the stream like a failed request
+            retries = getattr(e, 'retries', retries)
+            error = type(e).__name__
+            raise Exception(f"API request failed: {str(e)}")
+        finally:
+            # Also runs when the consumer stops reading early
+            get_rate_limiter(self.api_key_id).settle(prompt_tokens, usage.get('total_tokens', 0))
+            get_llm_metrics().record(
+                operation, model, (time.perf_counter() - start) * 1000, ttfb_ms=ttfb_ms,
+                prompt_tokens=usage.get('prompt_tokens', 0),
+                completion_tokens=usage.get('completion_tokens', 0),
+                retries=retries, error=error, stream=True
+            )
     
     def enhance_prompt(self, user_prompt: str) -> str:
         """Use Groq to enhance and structure the user prompt for better code generation."""
@@ -66,15 +293,15 @@ class EducationalCodeAssistant:
             {"role": "user", "content": f"Enhance this coding prompt for better code generation: {user_prompt}"}
         ]
         
-        response = self._send_request(self.mixtral, messages, temperature=0.3)
+        response = self._send_request(self.mixtral, messages, temperature=0.3, use_cache=True, operation="enhance_prompt")
         
         if 'choices' in response and len(response['choices']) > 0:
             return response['choices'][0]['message']['content']
         else:
             raise Exception("Failed to get a valid response from Groq API")
     
-    def generate_learning_challenge(self, enhanced_prompt: str) -> str:
-        """Generate a learning challenge based on the user's request to encourage them to try themselves."""
+    def _learning_challenge_messages(self, enhanced_prompt: str) -> List[Dict[str, str]]:
+        """Build the prompt for a learning challenge."""
         system_prompt = """
         You are an educational coding mentor. Given a programming problem:
         1. Break down the problem into logical steps
@@ -86,20 +313,29 @@ class EducationalCodeAssistant:
         7. Format your response conversationally as a supportive mentor would
         """
         
-        messages = [
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": enhanced_prompt}
         ]
+    
+    def generate_learning_challenge(self, enhanced_prompt: str) -> str:
+        """Generate a learning challenge based on the user's request to encourage them to try themselves."""
+        messages = self._learning_challenge_messages(enhanced_prompt)
         
-        response = self._send_request(self.mixtral, messages, temperature=0.4, max_tokens=4000)
+        response = self._send_request(self.mixtral, messages, temperature=0.4, max_tokens=4000, operation="learning_challenge")
         
         if 'choices' in response and len(response['choices']) > 0:
             return response['choices'][0]['message']['content']
         else:
             raise Exception("Failed to get a valid response from Groq API")
     
-    def analyze_user_attempt(self, problem_description: str, user_code: str) -> str:
-        """Analyze the user's code attempt and provide targeted feedback."""
+    def stream_learning_challenge(self, enhanced_prompt: str) -> Iterator[str]:
+        """Stream a learning challenge as content deltas."""
+        messages = self._learning_challenge_messages(enhanced_prompt)
+        return self._send_request(self.mixtral, messages, temperature=0.4, max_tokens=4000, stream=True, operation="learning_challenge")
+    
+    def _user_attempt_messages(self, problem_description: str, user_code: str) -> List[Dict[str, str]]:
+        """Build the prompt for feedback on a user's code attempt."""
         system_prompt = """
         You are an educational coding mentor reviewing a student's code attempt. Your goal is to provide constructive feedback:
         1. Identify what parts of the solution are correct and well-implemented
@@ -111,18 +347,27 @@ class EducationalCodeAssistant:
         7. Do NOT provide complete code solutions
         """
         
-        messages = [
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": f"Problem description: {problem_description}\n\nUser's code attempt:\n```\n{user_code}\n```\n\nPlease analyze this code attempt and provide educational feedback."}
         ]
+    
+    def analyze_user_attempt(self, problem_description: str, user_code: str) -> str:
+        """Analyze the user's code attempt and provide targeted feedback."""
+        messages = self._user_attempt_messages(problem_description, user_code)
         
-        response = self._send_request(self.llama3_70b, messages, temperature=0.3, max_tokens=4000)
+        response = self._send_request(self.llama3_70b, messages, temperature=0.3, max_tokens=4000, operation="attempt_analysis")
         
         if 'choices' in response and len(response['choices']) > 0:
             return response['choices'][0]['message']['content']
         else:
             raise Exception("Failed to get a valid response from Groq API")
     
+    def stream_user_attempt_analysis(self, problem_description: str, user_code: str) -> Iterator[str]:
+        """Stream feedback on the user's code attempt as content deltas."""
+        messages = self._user_attempt_messages(problem_description, user_code)
+        return self._send_request(self.llama3_70b, messages, temperature=0.3, max_tokens=4000, stream=True, operation="attempt_analysis")
+    
     def generate_solution_flowchart(self, enhanced_prompt: str) -> str:
         """Generate a flowchart visualizing the solution approach."""
         system_prompt = """
@@ -140,7 +385,7 @@ class EducationalCodeAssistant:
             {"role": "user", "content": f"Create a detailed solution flowchart for this problem:\n\n{enhanced_prompt}"}
         ]
         
-        response = self._send_request(self.llama3_70b, messages, temperature=0.2, max_tokens=4000)
+        response = self._send_request(self.llama3_70b, messages, temperature=0.2, max_tokens=4000, use_cache=True, operation="flowchart")
         
         if 'choices' in response and len(response['choices']) > 0:
             result = response['choices'][0]['message']['content']
@@ -160,8 +405,8 @@ class EducationalCodeAssistant:
         else:
             raise Exception("Failed to get a valid response from Groq API")
     
-    def generate_code(self, enhanced_prompt: str) -> str:
-        """Use Groq to generate code based on the enhanced prompt."""
+    def _code_messages(self, enhanced_prompt: str) -> List[Dict[str, str]]:
+        """Build the prompt for generating a model solution."""
         system_prompt = """
         You are an expert code generator creating educational code examples. Given a programming problem:
         1. Write clean, efficient, and well-documented code
@@ -171,12 +416,16 @@ class EducationalCodeAssistant:
         5. Explain your implementation approach
         """
         
-        messages = [
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": enhanced_prompt}
         ]
+    
+    def generate_code(self, enhanced_prompt: str) -> str:
+        """Use Groq to generate code based on the enhanced prompt."""
+        messages = self._code_messages(enhanced_prompt)
         
-        response = self._send_request(self.llama3_70b, messages, temperature=0.2, max_tokens=8000)
+        response = self._send_request(self.llama3_70b, messages, temperature=0.2, max_tokens=8000, operation="generate_code")
         
         if 'choices' in response and len(response['choices']) > 0:
             # Clean up code - extract from markdown if needed
@@ -184,6 +433,15 @@ class EducationalCodeAssistant:
         else:
             raise Exception("Failed to get a valid response from Groq API")
     
+    def stream_code(self, enhanced_prompt: str) -> Iterator[str]:
+        """
+        Stream the raw model solution as content deltas.
+        
+        Pass the assembled text through _extract_code to get the same result as generate_code.
+        """
+        messages = self._code_messages(enhanced_prompt)
+        return self._send_request(self.llama3_70b, messages, temperature=0.2, max_tokens=8000, stream=True, operation="generate_code")
+    
     def _extract_code(self, text: str) -> str:
         """Extract code from markdown code blocks if present."""
         # Look for triple backtick code blocks
@@ -216,7 +474,7 @@ class EducationalCodeAssistant:
             {"role": "user", "content": f"Analyze the time and space complexity of this code:\n\n{code}"}
         ]
         
-        response = self._send_request(self.llama3_70b, messages, temperature=0.1, max_tokens=4000)
+        response = self._send_request(self.llama3_70b, messages, temperature=0.1, max_tokens=4000, use_cache=True, operation="complexity")
         
         if 'choices' in response and len(response['choices']) > 0:
             result = response['choices'][0]['message']['content']
@@ -274,7 +532,7 @@ class EducationalCodeAssistant:
             {"role": "user", "content": f"Review this code and suggest improvements:\n\n{code}"}
         ]
         
-        response = self._send_request(self.llama3_70b, messages, temperature=0.3, max_tokens=6000)
+        response = self._send_request(self.llama3_70b, messages, temperature=0.3, max_tokens=6000, operation="review")
         
         if 'choices' in response and len(response['choices']) > 0:
             result = response['choices'][0]['message']['content']
@@ -320,7 +578,7 @@ class EducationalCodeAssistant:
             {"role": "user", "content": f"User's {language} code:\n```\n{user_code}\n```\n\nModel solution:\n```\n{model_solution}\n```\n\nPlease score the user's code from 0 to 1."}
         ]
         
-        response = self._send_request(self.mixtral, messages, temperature=0.1, max_tokens=50)
+        response = self._send_request(self.mixtral, messages, temperature=0.1, max_tokens=50, use_cache=True, operation="score")
         
         if 'choices' in response and len(response['choices']) > 0:
             result = response['choices'][0]['message']['content']
@@ -368,7 +626,7 @@ class EducationalCodeAssistant:
             {"role": "user", "content": f"User's strongest skills:\n{strong_skills_str}\n\nUser's weakest skills:\n{weak_skills_str}\n\nPlease provide a comprehensive analysis of the user's coding strengths and weaknesses."}
         ]
         
-        response = self._send_request(self.mixtral, messages, temperature=0.3, max_tokens=2000)
+        response = self._send_request(self.mixtral, messages, temperature=0.3, max_tokens=2000, operation="strengths_weaknesses")
         
         if 'choices' in response and len(response['choices']) > 0:
             analysis = response['choices'][0]['message']['content']
@@ -385,8 +643,9 @@ class EducationalCodeAssistant:
         else:
             return None
     
-    def generate_personalized_learning_path(self, user_id: str, language: str) -> Optional[str]:
-        """Generate a personalized learning path based on user's skills."""
+    def generate_personalized_learning_path(self, user_id: str, language: str,
+                                            on_challenge: Optional[Callable[[Dict[str, Any]], None]] = None) -> Optional[str]:
+        """Generate a personalized learning path based on user's skills, reporting each stored challenge to on_challenge."""
         if not self.db:
             return None
         
@@ -415,47 +674,20 @@ class EducationalCodeAssistant:
             {"role": "user", "content": f"Create a learning path in {language} to improve these skills: {', '.join(weak_skill_names)}"}
         ]
         
-        response = self._send_request(self.llama3_70b, messages, temperature=0.4, max_tokens=4000)
+        response = self._send_request(self.llama3_70b, messages, temperature=0.4, max_tokens=4000, operation="learning_path")
         
         if 'choices' in response and len(response['choices']) > 0:
             content = response['choices'][0]['message']['content']
             
-            # Extract JSON
             try:
-                json_pattern = r'\[[\s\S]*\]'
-                json_match = re.search(json_pattern, content)
-                if json_match:
-                    path_json = json_match.group(0)
-                    path_challenges = json.loads(path_json)
-                    
-                    # Create a learning path
-                    path_title = f"Improving {', '.join(weak_skill_names[:2])}"
-                    path_desc = f"A personalized learning path to improve skills in {', '.join(weak_skill_names)}"
-                    
-                    path_id = self.db.get_or_create_learning_path(path_title, path_desc, language)
-                    
-                    # Add challenges to the path
-                    for i, challenge in enumerate(path_challenges):
-                        # Create the challenge
-                        challenge_desc = f"Create code in {language} that: {challenge['description']}"
-                        enhanced_prompt = self.enhance_prompt(challenge_desc)
-                        
-                        challenge_id = self.db.store_challenge(
-                            challenge['title'], 
-                            enhanced_prompt, 
-                            language, 
-                            difficulty=challenge.get('difficulty', 2)
-                        )
-                        
-                        # Map skills to challenge
-                        if 'skills' in challenge:
-                            skill_relevance = {skill: 0.8 for skill in challenge['skills']}
-                            self.db.map_challenge_skills(challenge_id, skill_relevance)
-                        
-                        # Add to learning path
-                        self.db.add_challenge_to_path(path_id, challenge_id, i)
-                    
-                    return path_id
+                path_challenges = parse_path_challenges(content)
+                
+                # Create a learning path
+                path_title = f"Improving {', '.join(weak_skill_names[:2])}"
+                path_desc = f"A personalized learning path to improve skills in {', '.join(weak_skill_names)}"
+                
+                return build_learning_path(self, self.db, path_title, path_desc, language, path_challenges,
+                                           on_challenge=on_challenge)
             except Exception as e:
                 print(f"Error creating learning path: {str(e)}")
                 return None
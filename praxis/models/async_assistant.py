@@ -0,0 +1,91 @@
+# praxis/models/async_assistant.py
+import asyncio
+from typing import Dict, List, Any, Optional, Callable, Awaitable
+
+class AsyncEducationalCodeAssistant:
+    """Asyncio variant of the assistant API for running independent LLM calls concurrently."""
+
+    def __init__(self, assistant):
+        """Wrap a synchronous EducationalCodeAssistant."""
+        self.assistant = assistant
+        self.skill_analyzer = assistant.skill_analyzer
+        self.llama3_70b = assistant.llama3_70b
+        self.mixtral = assistant.mixtral
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking assistant call in a worker thread."""
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def _send_request(self, model: str, messages: List[Dict[str, str]], temperature: float = 0.2,
+                            max_tokens: int = 4000, **kwargs) -> Dict:
+        """Send a request to the Groq API without blocking the event loop."""
+        return await self.run(self.assistant._send_request, model, messages, temperature, max_tokens, **kwargs)
+
+    async def enhance_prompt(self, user_prompt: str) -> str:
+        """Async version of EducationalCodeAssistant.enhance_prompt."""
+        return await self.run(self.assistant.enhance_prompt, user_prompt)
+
+    async def generate_learning_challenge(self, enhanced_prompt: str) -> str:
+        """Async version of EducationalCodeAssistant.generate_learning_challenge."""
+        return await self.run(self.assistant.generate_learning_challenge, enhanced_prompt)
+
+    async def analyze_user_attempt(self, problem_description: str, user_code: str) -> str:
+        """Async version of EducationalCodeAssistant.analyze_user_attempt."""
+        return await self.run(self.assistant.analyze_user_attempt, problem_description, user_code)
+
+    async def generate_solution_flowchart(self, enhanced_prompt: str) -> str:
+        """Async version of EducationalCodeAssistant.generate_solution_flowchart."""
+        return await self.run(self.assistant.generate_solution_flowchart, enhanced_prompt)
+
+    async def generate_code(self, enhanced_prompt: str) -> str:
+        """Async version of EducationalCodeAssistant.generate_code."""
+        return await self.run(self.assistant.generate_code, enhanced_prompt)
+
+    async def analyze_complexity(self, code: str) -> Dict[str, str]:
+        """Async version of EducationalCodeAssistant.analyze_complexity."""
+        return await self.run(self.assistant.analyze_complexity, code)
+
+    async def review_code(self, code: str) -> Dict[str, Any]:
+        """Async version of EducationalCodeAssistant.review_code."""
+        return await self.run(self.assistant.review_code, code)
+
+    async def score_user_attempt(self, user_code: str, model_solution: str, language: str) -> float:
+        """Async version of EducationalCodeAssistant.score_user_attempt."""
+        return await self.run(self.assistant.score_user_attempt, user_code, model_solution, language)
+
+    async def analyze_code(self, code: str, language: str) -> Dict[str, Any]:
+        """Async version of SkillAnalyzer.analyze_code."""
+        return await self.run(self.skill_analyzer.analyze_code, code, language)
+
+def run_concurrently(
+    jobs: Dict[str, Callable[[], Awaitable[Any]]],
+    on_result: Callable[[str, Any, Optional[Exception]], None],
+    max_concurrency: Optional[int] = None
+) -> None:
+    """
+    Launch independent async jobs together and report each one as soon as it finishes.
+
+    Args:
+        jobs: Mapping of job name to a zero-argument coroutine factory
+        on_result: Callback receiving (name, result, error) in completion order;
+            it runs on the calling thread, so it may safely render Streamlit elements
+        max_concurrency: Optional cap on the number of jobs in flight
+    """
+    async def _run_all() -> None:
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+        async def _run_job(name: str, factory: Callable[[], Awaitable[Any]]):
+            try:
+                if semaphore:
+                    async with semaphore:
+                        return name, await factory(), None
+                return name, await factory(), None
+            except Exception as e:
+                return name, None, e
+
+        tasks = [_run_job(name, factory) for name, factory in jobs.items()]
+        for next_done in asyncio.as_completed(tasks):
+            name, result, error = await next_done
+            on_result(name, result, error)
+
+    asyncio.run(_run_all())
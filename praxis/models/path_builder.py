@@ -0,0 +1,151 @@
+# praxis/models/path_builder.py
+import re
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Callable
+
+from config import PATH_ENHANCE_CONCURRENCY
+
+# Job kind for learning path generation in the background job queue
+PATH_JOB_KIND = "learning_path"
+
+def focus_path_messages(language: str, focus_areas: List[str], difficulty: int) -> List[Dict[str, str]]:
+    """Build the prompt for a learning path on chosen focus areas."""
+    system_prompt = f"""
+    You are a programming curriculum designer. Create a learning path for {language} focusing on {', '.join(focus_areas)}.
+
+    Design a sequence of 5-7 coding challenges that build skills incrementally.
+    For each challenge, provide:
+    1. A clear title
+    2. A brief description of what to implement
+    3. The primary skills it develops
+    4. Approximate difficulty (1-5, with {difficulty} as the average)
+
+    Format as a JSON array of challenge objects.
+    """
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"Create a {language} learning path focusing on {', '.join(focus_areas)}"}
+    ]
+
+def parse_path_challenges(content: str) -> List[Dict[str, Any]]:
+    """Extract the JSON array of challenge objects from a learning path response."""
+    json_match = re.search(r'\[[\s\S]*\]', content)
+    if not json_match:
+        raise ValueError("The learning path response did not contain a list of challenges")
+    return json.loads(json_match.group(0))
+
+def enhance_challenges(assistant, language: str, challenges: List[Dict[str, Any]],
+                       on_enhanced: Optional[Callable[[int, str], None]] = None,
+                       max_workers: int = PATH_ENHANCE_CONCURRENCY) -> List[str]:
+    """
+    Enhance every challenge prompt concurrently, with at most max_workers calls in flight.
+
+    Args:
+        assistant: The LLM assistant
+        language: Programming language
+        challenges: Challenge objects with a description
+        on_enhanced: Called with (position, enhanced prompt) as each call finishes
+        max_workers: Maximum number of concurrent enhancement calls
+
+    Returns:
+        The enhanced prompts in challenge order
+    """
+    prompts: List[Optional[str]] = [None] * len(challenges)
+    if not challenges:
+        return []
+
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(challenges)), thread_name_prefix="path-enhance")
+    try:
+        futures = {
+            pool.submit(assistant.enhance_prompt, f"Create code in {language} that: {challenge['description']}"): i
+            for i, challenge in enumerate(challenges)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            prompts[i] = future.result()
+            if on_enhanced:
+                on_enhanced(i, prompts[i])
+    finally:
+        # On failure, drop the calls that have not started yet
+        pool.shutdown(wait=True, cancel_futures=True)
+    return prompts
+
+def build_learning_path(assistant, db, title: str, description: str, language: str,
+                        challenges: List[Dict[str, Any]], difficulty: int = 2,
+                        on_challenge: Optional[Callable[[Dict[str, Any]], None]] = None) -> str:
+    """
+    Create a learning path and its challenges, enhancing the challenge prompts concurrently.
+
+    The path is written in one transaction once every prompt is ready, so a failed
+    enhancement leaves no partial path behind.
+
+    Args:
+        assistant: The LLM assistant
+        db: Database connection
+        title: Path title
+        description: Path description
+        language: Programming language
+        challenges: Challenge objects with title, description and optional skills and difficulty
+        difficulty: Path difficulty, also the default for challenges without one
+        on_challenge: Called with a summary of each challenge as its prompt is ready
+
+    Returns:
+        The learning path ID
+    """
+    def report(i: int, enhanced_prompt: str) -> None:
+        if on_challenge:
+            on_challenge({
+                'title': challenges[i]['title'],
+                'description': challenges[i]['description'],
+                'difficulty': challenges[i].get('difficulty', difficulty),
+                'position': i,
+                'total': len(challenges)
+            })
+
+    enhanced_prompts = enhance_challenges(assistant, language, challenges, on_enhanced=report)
+
+    path_id, _ = db.create_learning_path_bulk(title, description, language, [
+        {
+            'title': challenge['title'],
+            'enhanced_prompt': enhanced_prompt,
+            'difficulty': challenge.get('difficulty', difficulty),
+            'skills': {skill: 0.8 for skill in challenge.get('skills') or []}
+        }
+        for challenge, enhanced_prompt in zip(challenges, enhanced_prompts)
+    ], difficulty)
+    return path_id
+
+def run_focus_path_job(context, params: Dict[str, Any], api_key: str) -> Dict[str, Any]:
+    """Background job: design and build a learning path on the chosen focus areas."""
+    from models.assistant import EducationalCodeAssistant
+
+    assistant = EducationalCodeAssistant(api_key=api_key, db=context.db)
+    language = params['language']
+    focus_areas = params['focus_areas']
+    difficulty = params['difficulty']
+
+    response = assistant._send_request(assistant.llama3_70b, focus_path_messages(language, focus_areas, difficulty),
+                                       temperature=0.4, max_tokens=4000, operation="learning_path")
+    if not ('choices' in response and len(response['choices']) > 0):
+        raise Exception("Failed to get a valid response from Groq API")
+
+    path_challenges = parse_path_challenges(response['choices'][0]['message']['content'])
+    title = f"{language} - {', '.join(focus_areas[:2])}"
+    description = f"A learning path for {language} focusing on {', '.join(focus_areas)}"
+
+    path_id = build_learning_path(assistant, context.db, title, description, language, path_challenges,
+                                  difficulty, on_challenge=context.report)
+    return {'path_id': path_id, 'title': title}
+
+def run_personalized_path_job(context, params: Dict[str, Any], api_key: str) -> Dict[str, Any]:
+    """Background job: build a learning path targeting the user's weakest skills."""
+    from models.assistant import EducationalCodeAssistant
+
+    assistant = EducationalCodeAssistant(api_key=api_key, db=context.db)
+    path_id = assistant.generate_personalized_learning_path(params['user_id'], params['language'],
+                                                            on_challenge=context.report)
+    if not path_id:
+        raise Exception("Could not create learning path. Try again later.")
+    return {'path_id': path_id}
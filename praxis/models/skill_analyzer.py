@@ -33,7 +33,7 @@ class SkillAnalyzer:
             {"role": "user", "content": f"Analyze this coding problem and identify relevant skills with relevance scores:\n\n{enhanced_prompt}"}
         ]
         
-        response = self.assistant._send_request(self.assistant.mixtral, messages, temperature=0.2, max_tokens=1000)
+        response = self.assistant._send_request(self.assistant.mixtral, messages, temperature=0.2, max_tokens=1000, use_cache=True, operation="skill_analysis")
         
         if 'choices' in response and len(response['choices']) > 0:
             content = response['choices'][0]['message']['content']
@@ -86,7 +86,7 @@ class SkillAnalyzer:
             {"role": "user", "content": f"Analyze this {language} code:\n\n{code}"}
         ]
         
-        response = self.assistant._send_request(self.assistant.mixtral, messages, temperature=0.2, max_tokens=2000)
+        response = self.assistant._send_request(self.assistant.mixtral, messages, temperature=0.2, max_tokens=2000, operation="code_skill_analysis")
         
         if 'choices' in response and len(response['choices']) > 0:
             content = response['choices'][0]['message']['content']
@@ -142,7 +142,7 @@ class SkillAnalyzer:
             {"role": "user", "content": f"The user needs to improve these skills:\n\n{weak_skills_str}\n\nPlease provide tailored learning recommendations."}
         ]
         
-        response = self.assistant._send_request(self.assistant.llama3_70b, messages, temperature=0.4, max_tokens=2000)
+        response = self.assistant._send_request(self.assistant.llama3_70b, messages, temperature=0.4, max_tokens=2000, operation="skill_recommendations")
         
         if 'choices' in response and len(response['choices']) > 0:
             return response['choices'][0]['message']['content']
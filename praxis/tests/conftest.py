@@ -0,0 +1,45 @@
+# praxis/tests/conftest.py
+import os
+import sys
+
+import pytest
+
+# Modules import each other relative to the praxis directory (e.g. "from config import ...")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import build_synthetic_db
+from database.db_manager import Database
+
+@pytest.fixture
+def db(tmp_path):
+    """A Database on a freshly migrated file in a temporary directory."""
+    database = Database(str(tmp_path / "praxis.db"))
+    yield database
+    database.close()
+    database.pool.close_all()
+
+@pytest.fixture
+def no_engine(monkeypatch):
+    """Read and write user_skills through SQL even when the in-memory proficiency engine is enabled."""
+    monkeypatch.setattr(Database, "_proficiency_matrix", lambda self: None)
+
+@pytest.fixture
+def synthetic(tmp_path):
+    """A small synthetic database (see benchmarks.synthetic) and the IDs it generated."""
+    db_path = str(tmp_path / "synthetic.db")
+    ids = build_synthetic_db(db_path, users=12, challenges=10, attempts=300, paths=2, path_length=3,
+                             days=30, seed=7)
+    database = Database(db_path)
+    yield database, ids
+    database.close()
+    database.pool.close_all()
+
+@pytest.fixture(scope="session")
+def python_runner():
+    """A one-off sandbox runner with short limits; skips the test where code cannot be isolated."""
+    from utils.code_runner import PythonRunner
+    runner = PythonRunner(timeout=3, cpu_seconds=2, memory_mb=256)
+    outcome = runner.run_case("def f():\n    return 1\n", {"inputs": []})
+    if outcome.get("sandbox_unavailable"):
+        pytest.skip(outcome["error"])
+    return runner
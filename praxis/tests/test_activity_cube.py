@@ -0,0 +1,63 @@
+# praxis/tests/test_activity_cube.py
+import pytest
+
+from database.migrations import migration_004_activity_cube
+
+KEY = ['user_id', 'day', 'hour', 'difficulty']
+
+def cube(conn):
+    """activity_cube rows keyed by (user_id, day, hour, difficulty)."""
+    cursor = conn.execute('SELECT * FROM activity_cube')
+    columns = [column[0] for column in cursor.description]
+    return {tuple(row[columns.index(key)] for key in KEY): dict(zip(columns, row)) for row in cursor}
+
+def assert_matches_rebuild(conn):
+    """The trigger-maintained cube must equal one recomputed from scratch by the migration's backfill."""
+    maintained = cube(conn)
+    conn.execute('DELETE FROM activity_cube')
+    migration_004_activity_cube(conn.cursor())
+    conn.commit()
+    rebuilt = cube(conn)
+    assert maintained.keys() == rebuilt.keys()
+    for key, row in rebuilt.items():
+        assert maintained[key] == pytest.approx(row), key
+
+def test_bulk_loaded_history_matches_rebuild(synthetic):
+    db, _ = synthetic
+    assert_matches_rebuild(db.conn)
+
+def test_attempt_changes_match_rebuild(synthetic):
+    db, ids = synthetic
+    conn = db.conn
+    db.store_attempt(ids["user_ids"][0], ids["challenge_ids"][0], "pass", "", 0.5, 0, 1)
+    conn.execute("UPDATE attempts SET created_at = datetime(created_at, '+3 hours') WHERE rowid % 7 = 0")
+    conn.execute('UPDATE attempts SET score = NULL, time_spent = 0 WHERE rowid % 11 = 0')
+    conn.execute('UPDATE attempts SET challenge_id = ? WHERE rowid % 13 = 0', (ids["challenge_ids"][1],))
+    conn.execute('DELETE FROM attempts WHERE rowid % 5 = 0')
+    conn.commit()
+    assert_matches_rebuild(conn)
+
+def test_challenge_difficulty_change_matches_rebuild(synthetic):
+    db, ids = synthetic
+    conn = db.conn
+    for i, challenge_id in enumerate(ids["challenge_ids"][:4]):
+        conn.execute('UPDATE challenges SET difficulty = ? WHERE challenge_id = ?', ((i % 5) + 1, challenge_id))
+    conn.execute('UPDATE challenges SET difficulty = NULL WHERE challenge_id = ?', (ids["challenge_ids"][4],))
+    conn.commit()
+    assert_matches_rebuild(conn)
+
+    # Later attempt changes find the buckets under the new difficulty
+    conn.execute('DELETE FROM attempts WHERE challenge_id IN (?, ?)', ids["challenge_ids"][:2])
+    conn.commit()
+    assert_matches_rebuild(conn)
+
+def test_deleted_challenge_matches_rebuild(synthetic):
+    db, ids = synthetic
+    conn = db.conn
+    conn.execute('DELETE FROM challenges WHERE challenge_id = ?', (ids["challenge_ids"][0],))
+    conn.commit()
+    assert_matches_rebuild(conn)
+
+    conn.execute('DELETE FROM attempts WHERE challenge_id = ?', (ids["challenge_ids"][0],))
+    conn.commit()
+    assert_matches_rebuild(conn)
@@ -0,0 +1,136 @@
+# praxis/tests/test_grading.py
+import ast
+
+import pytest
+
+from utils import completion_utils
+from utils.code_runner import LanguageRunner, SandboxUnavailable, run_test_cases
+from utils.sandbox_harness import entry_point_candidates
+
+IS_PRIME = '''
+def is_prime(n):
+    return n > 1 and all(n % d for d in range(2, int(n ** 0.5) + 1))
+'''
+
+COUNT_PRIMES = '''
+def count_primes(n):
+    return sum(1 for i in range(n + 1) if is_prime(i))
+'''
+
+DEMO = '''
+def main():
+    print(count_primes(10))
+
+main()
+'''
+
+CASES = [
+    {"inputs": [10], "expected_output": 4},
+    {"inputs": [2], "expected_output": 1},
+    {"inputs": [1], "expected_output": 0}
+]
+
+class FakeDatabase:
+    """Stores challenge test cases in memory, like the challenges.test_cases column."""
+
+    def __init__(self):
+        self.test_cases = {}
+        self.writes = 0
+
+    def get_challenge_test_cases(self, challenge_id):
+        return self.test_cases.get(challenge_id)
+
+    def set_challenge_test_cases(self, challenge_id, test_cases):
+        self.test_cases[challenge_id] = test_cases
+        self.writes += 1
+
+class FakeAssistant:
+    """Scores every attempt with a fixed LLM similarity score."""
+
+    def __init__(self, score=0.5):
+        self.score = score
+
+    def score_user_attempt(self, code, solution, language):
+        return self.score
+
+@pytest.fixture
+def generated(monkeypatch):
+    """Replace LLM test case generation with a list the test controls, counting calls."""
+    state = {"cases": [dict(case) for case in CASES], "calls": 0}
+
+    def generate_test_cases(problem_description, solution, assistant):
+        state["calls"] += 1
+        return [dict(case) for case in state["cases"]]
+
+    monkeypatch.setattr(completion_utils, "generate_test_cases", generate_test_cases)
+    monkeypatch.setattr(completion_utils, "_generation_failures", {})
+    return state
+
+@pytest.mark.parametrize("code", [IS_PRIME + COUNT_PRIMES, COUNT_PRIMES + IS_PRIME])
+def test_helpers_rank_after_the_functions_calling_them(code):
+    assert entry_point_candidates(ast.parse(code)) == ["count_primes", "is_prime"]
+
+def test_demo_main_ranks_last():
+    assert entry_point_candidates(ast.parse(IS_PRIME + COUNT_PRIMES + DEMO))[-1] == "main"
+
+@pytest.mark.parametrize("code", [IS_PRIME + COUNT_PRIMES, COUNT_PRIMES + IS_PRIME, IS_PRIME + COUNT_PRIMES + DEMO])
+def test_cases_call_the_named_function(python_runner, code):
+    cases = [dict(case, function="count_primes") for case in CASES]
+    results = run_test_cases(code, cases, "python", python_runner)
+    assert all(result["passed"] for result in results.values()), results
+
+@pytest.mark.parametrize("solution", [COUNT_PRIMES + IS_PRIME, IS_PRIME + COUNT_PRIMES + DEMO])
+def test_validated_cases_record_the_solution_entry_point(python_runner, monkeypatch, generated, solution):
+    monkeypatch.setattr(completion_utils, "get_runner", lambda lang: python_runner)
+    monkeypatch.setattr(completion_utils, "run_test_cases",
+                        lambda code, cases, lang: run_test_cases(code, cases, lang, python_runner))
+    db = FakeDatabase()
+
+    test_cases = completion_utils.get_challenge_test_cases(db, FakeAssistant(), "c1", "", solution, "python")
+
+    assert len(test_cases) == len(CASES)
+    assert {case["function"] for case in test_cases} == {"count_primes"}
+    # An attempt defining its functions in the other order is graded on the same function
+    attempt = IS_PRIME + COUNT_PRIMES
+    assert completion_utils.grade_attempt(db, FakeAssistant(), "c1", "", attempt, solution, "python") == (1.0, True)
+
+def test_wrong_expected_outputs_are_dropped(python_runner, monkeypatch, generated):
+    monkeypatch.setattr(completion_utils, "run_test_cases",
+                        lambda code, cases, lang: run_test_cases(code, cases, lang, python_runner))
+    generated["cases"].append({"inputs": [10], "expected_output": 5})
+
+    test_cases = completion_utils.validate_test_cases(IS_PRIME + COUNT_PRIMES, generated["cases"], "python")
+
+    assert [case["inputs"] for case in test_cases] == [case["inputs"] for case in CASES]
+
+def test_empty_case_list_is_not_stored_and_retried_later(monkeypatch, generated):
+    monkeypatch.setattr(completion_utils, "validate_test_cases", lambda solution, cases, lang: [])
+    db = FakeDatabase()
+
+    for _ in range(2):
+        assert completion_utils.get_challenge_test_cases(db, FakeAssistant(), "c1", "", "", "python") == []
+    assert db.writes == 0
+    # The failure is remembered for TEST_CASE_RETRY_SECONDS
+    assert generated["calls"] == 1
+
+    monkeypatch.setattr(completion_utils, "TEST_CASE_RETRY_SECONDS", 0)
+    monkeypatch.setattr(completion_utils, "validate_test_cases", lambda solution, cases, lang: cases)
+    assert completion_utils.get_challenge_test_cases(db, FakeAssistant(), "c1", "", "", "python") == CASES
+    assert db.writes == 1
+    assert generated["calls"] == 2
+
+def test_grading_falls_back_to_llm_score_without_sandbox(monkeypatch):
+    class UnavailableRunner(LanguageRunner):
+        def run_case(self, code, case):
+            return {"error": "Sandbox unavailable: test", "sandbox_unavailable": True}
+
+    runner = UnavailableRunner()
+    monkeypatch.setattr(completion_utils, "get_runner", lambda lang: runner)
+    monkeypatch.setattr(completion_utils, "run_test_cases",
+                        lambda code, cases, lang: run_test_cases(code, cases, lang, runner))
+    db = FakeDatabase()
+    db.test_cases["c1"] = CASES
+
+    with pytest.raises(SandboxUnavailable):
+        run_test_cases("", CASES, "python", runner)
+    assert completion_utils.grade_attempt(db, FakeAssistant(0.9), "c1", "", "", "", "python") == (0.9, True)
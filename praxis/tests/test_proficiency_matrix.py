@@ -0,0 +1,119 @@
+# praxis/tests/test_proficiency_matrix.py
+import pytest
+
+pytest.importorskip("numpy")
+
+from database import proficiency_matrix
+from database.proficiency_matrix import ProficiencyMatrix
+
+def stored_proficiencies(conn):
+    return {(user_id, skill_id): proficiency for user_id, skill_id, proficiency in
+            conn.execute('SELECT user_id, skill_id, proficiency FROM user_skills')}
+
+def matrix_proficiencies(matrix):
+    return {
+        (user_id, skill_id): float(matrix.values[row, col])
+        for user_id, row in matrix._user_rows.items()
+        for skill_id, col in matrix._skill_cols.items()
+        if matrix.present[row, col]
+    }
+
+def assert_same(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        assert actual[key] == pytest.approx(value, abs=1e-9), key
+
+@pytest.fixture
+def history(synthetic, no_engine):
+    """The synthetic database and a batch of attempts that revisits the same users and challenges."""
+    db, ids = synthetic
+    users, challenges = ids["user_ids"], ids["challenge_ids"]
+    updates = [(users[i % 4], challenges[(i * 7) % len(challenges)], (i % 10) / 10) for i in range(120)]
+    # A user with no proficiencies yet
+    updates.append((users[-1] + "-new", challenges[0], 0.8))
+    return db, updates
+
+@pytest.mark.parametrize("batch_size", [1, 7, None])
+def test_apply_attempts_matches_the_sql_upsert(history, batch_size):
+    db, updates = history
+    matrix = ProficiencyMatrix.from_database(db.conn)
+
+    db.update_user_skills_bulk(updates)
+    batch_size = batch_size or len(updates)
+    for i in range(0, len(updates), batch_size):
+        matrix.apply_attempts(db.conn, updates[i:i + batch_size])
+
+    assert_same(matrix_proficiencies(matrix), stored_proficiencies(db.conn))
+
+def test_checkpoint_writes_only_changed_cells(history):
+    db, updates = history
+    matrix = ProficiencyMatrix.from_database(db.conn)
+    matrix.apply_attempts(db.conn, updates)
+    changed = int(matrix.dirty.sum())
+
+    assert matrix.checkpoint(db.conn) == changed
+    assert_same(stored_proficiencies(db.conn), matrix_proficiencies(matrix))
+    assert matrix.checkpoint(db.conn) == 0
+
+def test_new_skill_mappings_are_picked_up(history):
+    db, updates = history
+    matrix = ProficiencyMatrix.from_database(db.conn)
+    challenge_id = updates[0][1]
+    db.map_challenge_skills(challenge_id, {"Brand New Skill": 0.5})
+
+    db.update_user_skills_bulk(updates[:10])
+    matrix.apply_attempts(db.conn, updates[:10])
+
+    assert_same(matrix_proficiencies(matrix), stored_proficiencies(db.conn))
+
+def test_cohort_summary_matches_sql(history):
+    db, _ = history
+    matrix = ProficiencyMatrix.from_database(db.conn)
+    expected = {
+        skill_id: (users, mean, low, high) for skill_id, users, mean, low, high in db.conn.execute('''
+            SELECT skill_id, COUNT(*), AVG(proficiency), MIN(proficiency), MAX(proficiency)
+            FROM user_skills GROUP BY skill_id
+        ''')
+    }
+
+    summary = matrix.cohort_summary()
+
+    assert [skill['mean'] for skill in summary] == sorted(skill['mean'] for skill in summary)
+    assert {skill['skill_id'] for skill in summary} == expected.keys()
+    for skill in summary:
+        assert (skill['users'], skill['mean'], skill['min'], skill['max']) == pytest.approx(expected[skill['skill_id']])
+        assert skill['name'] is not None
+
+@pytest.fixture
+def engine_db(db, monkeypatch):
+    """A Database served by the in-memory proficiency engine, without the exit checkpoint."""
+    monkeypatch.setattr(proficiency_matrix, "PROFICIENCY_ENGINE_ENABLED", True)
+    monkeypatch.setattr(proficiency_matrix.atexit, "register", lambda *args: None)
+    monkeypatch.setattr(proficiency_matrix, "_matrices", {})
+    return db
+
+def test_directly_set_scores_of_new_skills_have_names(engine_db):
+    user_id = engine_db.create_user("reviewer", "password")
+    engine_db.get_user_skills(user_id)
+
+    engine_db.save_user_skill_scores(user_id, {"Brand New Skill": 0.7, "Sorting": 0.2})
+
+    assert [row[1:] for row in engine_db.get_user_skills(user_id)] == [
+        ("Brand New Skill", "code_review", 0.7), ("Sorting", "algorithm", 0.2)
+    ]
+    assert engine_db.get_user_weakest_skills(user_id, 1)[0][1] == "Sorting"
+
+def test_engine_reads_match_sql_reads(engine_db, monkeypatch):
+    user_id = engine_db.create_user("learner", "password")
+    challenge_id = engine_db.store_challenge("Loops", "Loops", "Python")
+    engine_db.map_challenge_skills(challenge_id, {"Loops": 1.0, "Recursion": 0.4})
+    for score in (0.2, 0.9, 0.5):
+        engine_db.update_user_skills(user_id, challenge_id, score)
+    from_engine = engine_db.get_user_skills(user_id)
+
+    engine_db._proficiency_matrix().checkpoint(engine_db.conn)
+    monkeypatch.setattr(proficiency_matrix, "PROFICIENCY_ENGINE_ENABLED", False)
+    from_sql = engine_db.get_user_skills(user_id)
+
+    assert [row[:3] for row in from_engine] == [row[:3] for row in from_sql]
+    assert [row[3] for row in from_engine] == pytest.approx([row[3] for row in from_sql])
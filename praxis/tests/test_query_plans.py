@@ -0,0 +1,75 @@
+# praxis/tests/test_query_plans.py
+import sqlite3
+from typing import Callable, List
+
+import pytest
+
+from database.db_manager import Database
+
+@pytest.fixture
+def db(db, no_engine):
+    """The shared Database fixture, reading user_skills through SQL rather than the in-memory engine."""
+    return db
+
+def captured_queries(db: Database, call: Callable[[], object]) -> List[str]:
+    """The SELECT statements a Database method runs, with their parameters bound."""
+    statements: List[str] = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        db.conn.set_trace_callback(None)
+    return [sql for sql in statements if sql.lstrip().upper().startswith(("SELECT", "WITH"))]
+
+def query_plan(conn: sqlite3.Connection, sql: str) -> str:
+    """The EXPLAIN QUERY PLAN details of a query, one step per line."""
+    return "\n".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+
+def method_plan(db: Database, call: Callable[[], object]) -> str:
+    """The query plan of the single query a Database method runs."""
+    queries = captured_queries(db, call)
+    assert len(queries) == 1, queries
+    return query_plan(db.conn, queries[0])
+
+def assert_no_full_scan(plan: str, table: str) -> None:
+    """Fail if the plan reads a whole table instead of searching an index."""
+    for step in plan.splitlines():
+        assert not (step.startswith(f"SCAN {table}") and "USING" not in step), plan
+
+def test_recent_attempts_use_user_created_index(db):
+    plan = method_plan(db, lambda: db.get_user_recent_attempts("user", 5))
+    assert "idx_attempts_user_created" in plan
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
+    assert_no_full_scan(plan, "a")
+
+def test_last_attempt_on_challenge_uses_user_challenge_index(db):
+    plan = method_plan(db, lambda: db.get_last_attempt("user", "challenge"))
+    assert "idx_attempts_user_challenge_created" in plan
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
+    assert_no_full_scan(plan, "attempts")
+
+def test_skill_progress_uses_user_created_index(db):
+    plan = method_plan(db, lambda: db.get_skill_progress_over_time("user", 1))
+    assert "idx_attempts_user_created" in plan
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
+    assert_no_full_scan(plan, "a")
+    assert_no_full_scan(plan, "cs")
+
+@pytest.mark.parametrize("method", ["get_user_weakest_skills", "get_user_strongest_skills"])
+def test_weakest_and_strongest_skills_use_proficiency_index(db, method):
+    plan = method_plan(db, lambda: getattr(db, method)("user", 5))
+    assert "idx_user_skills_user_proficiency" in plan
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
+    assert_no_full_scan(plan, "us")
+
+def test_learning_path_challenges_use_position_index(db):
+    plan = method_plan(db, lambda: db.get_learning_path_challenges("path"))
+    assert "idx_learning_path_items_position" in plan
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
+    assert_no_full_scan(plan, "lpi")
+
+def test_user_challenge_history_uses_rollup_index(db):
+    plan = method_plan(db, lambda: db.get_user_challenge_history("user"))
+    assert "idx_user_challenge_stats_last" in plan
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
+    assert_no_full_scan(plan, "ucs")
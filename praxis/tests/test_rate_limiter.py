@@ -0,0 +1,132 @@
+# praxis/tests/test_rate_limiter.py
+import email.utils
+import time
+
+import pytest
+import requests
+
+from models import assistant as assistant_module
+from models.assistant import EducationalCodeAssistant
+from utils import rate_limiter
+from utils.rate_limiter import RateLimiter, RateLimitExceeded, parse_duration, retry_after_seconds
+
+def test_acquire_spends_and_refund_returns_tokens():
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=1000)
+    limiter.acquire(300)
+    assert limiter.stats()['tokens_available'] == pytest.approx(700, abs=1)
+
+    limiter.refund(300)
+    assert limiter.stats()['tokens_available'] == pytest.approx(1000, abs=1)
+    # Refunds never overfill the bucket
+    limiter.refund(5000)
+    assert limiter.stats()['tokens_available'] == pytest.approx(1000)
+
+def test_settle_charges_the_difference_with_actual_usage():
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=1000)
+    limiter.acquire(100)
+    limiter.settle(100, 400)
+    assert limiter.stats()['tokens_available'] == pytest.approx(600, abs=1)
+
+def test_exhausted_budget_raises_instead_of_waiting_too_long():
+    limiter = RateLimiter(requests_per_minute=1, tokens_per_minute=0, max_wait=0.05)
+    limiter.acquire(0)
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire(0)
+
+def test_pause_holds_requests():
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=0, max_wait=1)
+    limiter.pause(0.1)
+    assert limiter.acquire(0) == pytest.approx(0.1, abs=0.05)
+    assert limiter.stats()['throttled_requests'] == 1
+
+@pytest.mark.parametrize("headers, expected", [
+    ({"Retry-After": "2"}, 2.0),
+    ({"Retry-After": "-1"}, 0.0),
+    ({"x-ratelimit-reset-tokens": "7.66s", "x-ratelimit-reset-requests": "2m59.56s"}, 179.56),
+    ({"x-ratelimit-reset-requests": "250ms"}, 0.25),
+    ({}, None)
+])
+def test_retry_after_seconds(headers, expected):
+    if expected is None:
+        assert retry_after_seconds(headers) is None
+    else:
+        assert retry_after_seconds(headers) == pytest.approx(expected)
+
+def test_retry_after_http_date():
+    when = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert retry_after_seconds({"Retry-After": when}) == pytest.approx(30, abs=2)
+
+def test_parse_duration_rejects_garbage():
+    assert parse_duration("soon") is None
+    assert parse_duration("1h") == 3600
+
+def test_limiters_are_kept_per_api_key(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_rate_limiters", rate_limiter.OrderedDict())
+    first = rate_limiter.get_rate_limiter("key-1")
+    assert rate_limiter.get_rate_limiter("key-1") is first
+    assert rate_limiter.get_rate_limiter("key-2") is not first
+
+class FakeResponse:
+    """Just enough of requests.Response for EducationalCodeAssistant._post."""
+
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.ok = status_code < 400
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.exceptions.HTTPError(f"{self.status_code} error", response=self)
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def api(monkeypatch):
+    """An assistant whose HTTP session replays queued responses, with a fresh limiter and short backoff."""
+    responses = []
+
+    class FakeSession:
+        def post(self, *args, **kwargs):
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=1000)
+    monkeypatch.setattr(assistant_module, "get_http_session", lambda: FakeSession())
+    monkeypatch.setattr(assistant_module, "get_rate_limiter", lambda key_id: limiter)
+    monkeypatch.setattr(assistant_module, "backoff_delay", lambda attempt: 0.01)
+    return EducationalCodeAssistant(api_key="key"), responses, limiter
+
+def test_429_honours_retry_after_and_refunds_the_failed_attempt(api):
+    assistant, responses, limiter = api
+    responses.extend([FakeResponse(429, {"Retry-After": "0.3"}), FakeResponse(200)])
+
+    start = time.monotonic()
+    response, retries = assistant._post({}, prompt_tokens=200)
+
+    assert (response.status_code, retries) == (200, 1)
+    assert time.monotonic() - start >= 0.3
+    # The whole key was paused for the Retry-After time
+    assert limiter._blocked_until >= start + 0.3
+    # Only the successful attempt keeps its reservation
+    assert limiter.stats()['tokens_available'] == pytest.approx(800, abs=5)
+
+def test_connection_errors_are_refunded_and_retried(api):
+    assistant, responses, limiter = api
+    responses.extend([requests.exceptions.ConnectionError("reset"), FakeResponse(200)])
+
+    assert assistant._post({}, prompt_tokens=200)[1] == 1
+    assert limiter.stats()['tokens_available'] == pytest.approx(800, abs=5)
+
+def test_client_errors_are_refunded_and_not_retried(api):
+    assistant, responses, limiter = api
+    responses.extend([FakeResponse(400), FakeResponse(200)])
+
+    with pytest.raises(requests.exceptions.HTTPError) as raised:
+        assistant._post({}, prompt_tokens=200)
+
+    assert raised.value.retries == 0
+    assert len(responses) == 1
+    assert limiter.stats()['tokens_available'] == pytest.approx(1000, abs=5)
@@ -0,0 +1,72 @@
+# praxis/tests/test_recommendations.py
+import pytest
+
+from database.recommendations import RecommendationIndex
+
+@pytest.fixture
+def catalog(db, no_engine):
+    """A user weak in Loops (0.1) and less so in Recursion (0.6), and challenges training them."""
+    user_id = db.create_user("learner", "password")
+    db.save_user_skill_scores(user_id, {"Loops": 0.1, "Recursion": 0.6})
+    challenges = {}
+    for name, difficulty, skills in [
+        ("loops_easy", 2, {"Loops": 1.0}),
+        ("loops_hard", 5, {"Loops": 1.0}),
+        ("mixed", 3, {"Recursion": 1.0, "Loops": 0.5}),
+        ("unrelated", 2, {"Sorting": 1.0})
+    ]:
+        challenges[name] = db.store_challenge(name, name, "Python", difficulty)
+        db.map_challenge_skills(challenges[name], skills)
+    return db, user_id, challenges
+
+def recommended(db, user_id, challenges, limit=5):
+    names = {challenge_id: name for name, challenge_id in challenges.items()}
+    return [names[row[0]] for row in db.get_recommended_challenges(user_id, limit)]
+
+def test_ranks_by_weak_skill_coverage_and_difficulty_fit(catalog):
+    db, user_id, challenges = catalog
+    # Weights are 1 - proficiency (Loops 0.9, Recursion 0.4), so the target difficulty is 2.4:
+    # loops_easy 0.9 * 0.857, mixed (0.4 + 0.45) * 0.8125, loops_hard 0.9 * 0.639
+    assert recommended(db, user_id, challenges) == ["loops_easy", "mixed", "loops_hard"]
+    assert recommended(db, user_id, challenges, limit=2) == ["loops_easy", "mixed"]
+
+def test_rows_list_the_covered_weak_skills(catalog):
+    db, user_id, challenges = catalog
+    rows = {row[0]: row for row in db.get_recommended_challenges(user_id)}
+    mixed = rows[challenges["mixed"]]
+    assert mixed[1:5] == ("mixed", "mixed", 3, "Python")
+    assert sorted(mixed[5].split(",")) == ["Loops", "Recursion"]
+
+def test_matches_a_fresh_index(catalog):
+    db, user_id, _ = catalog
+    weak = [(skill[0], skill[3]) for skill in db.get_user_weakest_skills(user_id, 3)]
+    shared = RecommendationIndex()
+    shared.recommend(db.conn, user_id, weak)
+    db.store_attempt(user_id, db.store_challenge("later", "later", "Python", 2), "", "", 0.5, 10, 1)
+    assert shared.recommend(db.conn, user_id, weak) == RecommendationIndex().recommend(db.conn, user_id, weak)
+
+def test_refresh_picks_up_new_challenges_and_mappings(catalog):
+    db, user_id, challenges = catalog
+    assert recommended(db, user_id, challenges)[0] == "loops_easy"
+
+    challenges["loops_ideal"] = db.store_challenge("loops_ideal", "loops_ideal", "Python", 2)
+    db.map_challenge_skills(challenges["loops_ideal"], {"Loops": 1.0, "Recursion": 1.0})
+    # A re-mapped pair gets a new rowid, so relevance changes are seen too
+    db.map_challenge_skills(challenges["loops_hard"], {"Loops": 0.1})
+
+    assert recommended(db, user_id, challenges) == ["loops_ideal", "loops_easy", "mixed", "loops_hard"]
+
+def test_attempted_challenges_are_excluded(catalog):
+    db, user_id, challenges = catalog
+    recommended(db, user_id, challenges)
+    db.store_attempt(user_id, challenges["loops_easy"], "", "", 0.2, 10, 1)
+    assert "loops_easy" not in recommended(db, user_id, challenges)
+
+def test_deleted_challenges_are_dropped(catalog):
+    db, user_id, challenges = catalog
+    recommended(db, user_id, challenges)
+    db.conn.execute('DELETE FROM challenges WHERE challenge_id = ?', (challenges["loops_easy"],))
+    db.conn.commit()
+    # A challenge added in the same refresh does not hide the deletion
+    challenges["replacement"] = db.store_challenge("replacement", "replacement", "Python", 5)
+    assert recommended(db, user_id, challenges, limit=2) == ["mixed", "loops_hard"]
@@ -0,0 +1,92 @@
+# praxis/tests/test_replay.py
+import pytest
+
+from database import proficiency_matrix
+from database.replay import EmaModel, ProficiencyModel, replay_user_skills
+
+def proficiencies(conn):
+    return {(user_id, skill_id): proficiency for user_id, skill_id, proficiency in
+            conn.execute('SELECT user_id, skill_id, proficiency FROM user_skills')}
+
+def assert_same(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        assert actual[key] == pytest.approx(value, abs=1e-9), key
+
+@pytest.fixture
+def live(synthetic, no_engine):
+    """The synthetic database with user_skills rebuilt by the live per-attempt update, and that result."""
+    db, ids = synthetic
+    db.conn.execute('DELETE FROM user_skills')
+    db.conn.commit()
+    db.update_user_skills_bulk(db.conn.execute(
+        'SELECT user_id, challenge_id, score FROM attempts WHERE score IS NOT NULL ORDER BY created_at, rowid'
+    ).fetchall())
+    return db, ids, proficiencies(db.conn)
+
+def scramble(db):
+    db.conn.execute('UPDATE user_skills SET proficiency = 0.5')
+    db.conn.commit()
+
+@pytest.mark.parametrize("workers, chunk_size", [(1, 1000), (1, 7), (2, 13)])
+def test_replay_matches_the_live_update(live, workers, chunk_size):
+    db, _, expected = live
+    scramble(db)
+
+    result = replay_user_skills(db.db_path, workers=workers, chunk_size=chunk_size)
+
+    assert_same(proficiencies(db.conn), expected)
+    assert result['attempts'] == db.conn.execute('SELECT COUNT(*) FROM attempts WHERE score IS NOT NULL').fetchone()[0]
+    assert db.conn.execute('SELECT COUNT(*) FROM replays').fetchone()[0] == 1
+
+def test_replaying_some_users_leaves_the_others(live):
+    db, ids, expected = live
+    scramble(db)
+    selected = set(ids["user_ids"][:3])
+
+    replay_user_skills(db.db_path, user_ids=list(selected), workers=1)
+
+    for key, value in proficiencies(db.conn).items():
+        assert value == pytest.approx(expected[key] if key[0] in selected else 0.5), key
+
+def test_prune_drops_proficiencies_no_attempt_produces(live):
+    db, ids, expected = live
+    user_id = ids["user_ids"][0]
+    db.save_user_skill_scores(user_id, {"Reviewed Only": 0.9})
+
+    replay_user_skills(db.db_path, user_ids=[user_id], workers=1)
+    assert any(key[0] == user_id and key not in expected for key in proficiencies(db.conn))
+
+    replay_user_skills(db.db_path, user_ids=[user_id], workers=1, prune=True)
+    assert_same(proficiencies(db.conn), expected)
+
+def test_engine_reloads_instead_of_writing_back_pre_replay_cells(live, monkeypatch):
+    db, ids, expected = live
+    pytest.importorskip("numpy")
+    monkeypatch.setattr(proficiency_matrix, "PROFICIENCY_ENGINE_ENABLED", True)
+    monkeypatch.setattr(proficiency_matrix.atexit, "register", lambda *args: None)
+    monkeypatch.setattr(proficiency_matrix, "_matrices", {})
+    matrix = proficiency_matrix.get_proficiency_matrix(db.conn, db.db_path)
+    # Pending in-memory updates that the replay below supersedes
+    matrix.values[:] = 0.5
+    matrix.dirty[matrix.present] = True
+
+    replay_user_skills(db.db_path, workers=1)
+    matrix.checkpoint(db.conn)
+
+    assert_same(proficiencies(db.conn), expected)
+    user_id = ids["user_ids"][0]
+    assert {(user_id, row[0]): row[3] for row in matrix.user_skills(user_id)} == pytest.approx(
+        {key: value for key, value in expected.items() if key[0] == user_id})
+
+def test_models_must_implement_update():
+    with pytest.raises(TypeError):
+        ProficiencyModel()
+
+    class Incomplete(ProficiencyModel):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+    assert EmaModel(0.5).update(0.4, 1.0, 0.8) == pytest.approx(0.6)
+    assert EmaModel(0.5).update(None, 1.0, 0.8) == pytest.approx(0.8)
@@ -0,0 +1,67 @@
+# praxis/tests/test_rollups.py
+import pytest
+
+from database.migrations import migration_003_user_stats_rollups
+
+def table(conn, name, key_columns):
+    """A table's rows keyed by their key columns."""
+    cursor = conn.execute(f'SELECT * FROM {name}')
+    columns = [column[0] for column in cursor.description]
+    return {tuple(row[columns.index(key)] for key in key_columns): dict(zip(columns, row)) for row in cursor}
+
+def rollups(conn):
+    # A user whose attempts were all deleted keeps an all-zero row, which a rebuild omits
+    user_stats = {key: row for key, row in table(conn, 'user_stats', ['user_id']).items() if row['total_attempts']}
+    return user_stats, table(conn, 'user_challenge_stats', ['user_id', 'challenge_id'])
+
+def rebuilt_rollups(conn):
+    """The rollups recomputed from scratch by the migration's backfill."""
+    conn.execute('DELETE FROM user_challenge_stats')
+    conn.execute('DELETE FROM user_stats')
+    migration_003_user_stats_rollups(conn.cursor())
+    conn.commit()
+    return rollups(conn)
+
+def assert_rows_equal(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key, row in expected.items():
+        assert actual[key] == pytest.approx(row), key
+
+def assert_matches_rebuild(conn):
+    user_stats, challenge_stats = rollups(conn)
+    rebuilt_user_stats, rebuilt_challenge_stats = rebuilt_rollups(conn)
+    assert_rows_equal(challenge_stats, rebuilt_challenge_stats)
+    assert_rows_equal(user_stats, rebuilt_user_stats)
+
+def test_bulk_loaded_history_matches_rebuild(synthetic):
+    db, _ = synthetic
+    assert_matches_rebuild(db.conn)
+
+def test_new_attempts_match_rebuild(synthetic):
+    db, ids = synthetic
+    user_id, challenge_id = ids["user_ids"][0], ids["challenge_ids"][0]
+    db.store_attempt(user_id, challenge_id, "pass", "", 0.95, 60, 2, True)
+    db.store_attempt(user_id, challenge_id, "pass", "", None, 60, 3)
+    new_challenge = db.store_challenge("New", "New", "Python")
+    db.store_attempt(ids["user_ids"][-1], new_challenge, "pass", "", 0.1, 30, 1)
+    assert_matches_rebuild(db.conn)
+
+def test_score_and_success_changes_match_rebuild(synthetic):
+    db, _ = synthetic
+    conn = db.conn
+    # Scores go both down and up, including to and from NULL
+    conn.execute('UPDATE attempts SET score = score / 2, successful = 0 WHERE rowid % 7 = 0')
+    conn.execute('UPDATE attempts SET score = 1.0, successful = 1 WHERE rowid % 11 = 0')
+    conn.execute('UPDATE attempts SET score = NULL WHERE rowid % 13 = 0')
+    conn.commit()
+    assert_matches_rebuild(conn)
+
+def test_deleted_attempts_match_rebuild(synthetic):
+    db, ids = synthetic
+    conn = db.conn
+    conn.execute('DELETE FROM attempts WHERE rowid % 5 = 0')
+    # Every attempt of one user, so their per-challenge rows go away entirely
+    conn.execute('DELETE FROM attempts WHERE user_id = ?', (ids["user_ids"][0],))
+    conn.commit()
+    assert_matches_rebuild(conn)
+    assert not conn.execute('SELECT 1 FROM user_challenge_stats WHERE user_id = ?', (ids["user_ids"][0],)).fetchone()
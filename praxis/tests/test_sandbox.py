@@ -0,0 +1,64 @@
+# praxis/tests/test_sandbox.py
+import os
+
+import pytest
+
+from utils.sandbox_harness import RESULT_MARKER
+from utils.sandbox_pool import SandboxPool
+
+def run(runner, body, inputs=()):
+    """Run a one-function snippet in the sandbox and return its raw outcome."""
+    code = "def f(*args):\n" + "".join(f"    {line}\n" for line in body.splitlines())
+    return runner.run_case(code, {"inputs": list(inputs)})
+
+def test_returns_the_function_output(python_runner):
+    outcome = run(python_runner, "return sum(args)", [2, 3])
+    assert outcome["output"] == 5
+    assert "error" not in outcome
+
+def test_wall_clock_timeout(python_runner):
+    outcome = run(python_runner, "import time\ntime.sleep(30)")
+    assert outcome["error"].startswith("Timed out")
+
+def test_cpu_limit_kills_busy_loops(python_runner):
+    outcome = run(python_runner, "while True:\n    pass")
+    assert "error" in outcome and "output" not in outcome
+
+def test_printed_result_marker_cannot_forge_a_result(python_runner):
+    forged = RESULT_MARKER.strip() + "0" * 32 + '{"output": 42}'
+    outcome = run(python_runner, f"print({forged!r})\nprint({RESULT_MARKER!r} + '{{\"output\": 42}}')\nreturn 1")
+    assert outcome["output"] == 1
+
+def test_database_file_is_not_reachable(python_runner, tmp_path):
+    secret = tmp_path / "praxis_data.db"
+    secret.write_text("secret")
+    outcome = run(python_runner, f"return open({str(secret)!r}).read()")
+    assert "error" in outcome
+    # Nor through the /proc links of the processes above the job
+    outcome = run(python_runner, "import os\nreturn os.listdir('/proc')")
+    assert "error" in outcome
+
+def test_network_and_process_creation_are_blocked(python_runner):
+    assert "error" in run(python_runner, "import os\nreturn os.fork()")
+    outcome = run(python_runner, "import socket\nreturn socket.create_connection(('127.0.0.1', 80), 1) and 1")
+    assert "error" in outcome
+
+def test_changes_do_not_leak_between_jobs(python_runner):
+    run(python_runner, "import math\nmath.pi = 3\nreturn 0")
+    assert run(python_runner, "import math\nreturn math.pi")["output"] != 3
+
+def test_pool_runs_cases_and_cleans_up_workers():
+    pool = SandboxPool(size=2, timeout=3, cpu_seconds=2, memory_mb=256, max_jobs_per_worker=2)
+    try:
+        outcomes = pool.run_cases("def f(x):\n    return x * 2\n", [{"inputs": [i]} for i in range(5)])
+        if any(outcome.get("sandbox_unavailable") for outcome in outcomes):
+            pytest.skip(outcomes[0]["error"])
+        assert [outcome["output"] for outcome in outcomes] == [0, 2, 4, 6, 8]
+        # Reaching max_jobs_per_worker recycles workers
+        assert pool.recycled >= 1
+        pids = [slot["worker"].pid for slot in pool._slots]
+    finally:
+        pool.shutdown()
+    for pid in pids:
+        with pytest.raises(ProcessLookupError):
+            os.killpg(pid, 0)
@@ -0,0 +1,101 @@
+# praxis/tests/test_single_flight.py
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from models import assistant as assistant_module
+from models.assistant import EducationalCodeAssistant
+from utils.single_flight import SingleFlight
+
+def run_concurrently(flight, calls, func):
+    """Start one flight.do per (key) in calls while func is blocked, then let it finish."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocked(key):
+        def call():
+            started.set()
+            release.wait(5)
+            return func(key)
+        return call
+
+    with ThreadPoolExecutor(len(calls)) as executor:
+        futures = [executor.submit(flight.do, key, blocked(key)) for key in calls]
+        started.wait(5)
+        # Wait until every caller has either started executing or joined a call in flight
+        while flight.stats()['executed'] + flight.stats()['coalesced'] < len(calls):
+            time.sleep(0.01)
+        release.set()
+        return futures
+
+def test_concurrent_calls_with_one_key_share_one_execution():
+    flight = SingleFlight()
+    executions = []
+
+    futures = run_concurrently(flight, ["a"] * 5, lambda key: executions.append(key) or "result")
+
+    outcomes = [future.result() for future in futures]
+    assert executions == ["a"]
+    assert sorted(shared for _, shared in outcomes) == [False, True, True, True, True]
+    assert {result for result, _ in outcomes} == {"result"}
+    assert flight.stats() == {'executed': 1, 'coalesced': 4, 'in_flight': 0}
+
+def test_calls_with_different_keys_run_separately():
+    flight = SingleFlight()
+
+    futures = run_concurrently(flight, ["a", "b", "a", "b"], lambda key: key.upper())
+
+    assert sorted(future.result()[0] for future in futures) == ["A", "A", "B", "B"]
+    assert flight.stats()['executed'] == 2
+
+def test_an_error_is_shared_only_with_callers_of_the_same_key():
+    flight = SingleFlight()
+    error = ValueError("upstream failed")
+
+    def fail_for_a(key):
+        if key == "a":
+            raise error
+        return key
+
+    futures = run_concurrently(flight, ["a", "a", "a", "b"], fail_for_a)
+
+    for future in futures[:3]:
+        with pytest.raises(ValueError) as raised:
+            future.result()
+        assert raised.value is error
+    assert futures[3].result() == ("b", False)
+
+def test_nothing_is_remembered_after_a_call_finishes():
+    flight = SingleFlight()
+    with pytest.raises(RuntimeError):
+        flight.do("a", lambda: (_ for _ in ()).throw(RuntimeError("first")))
+    assert flight.do("a", lambda: "second") == ("second", False)
+    assert flight.stats()['in_flight'] == 0
+
+def test_assistants_only_share_requests_made_with_the_same_api_key(monkeypatch):
+    flight = SingleFlight()
+    monkeypatch.setattr(assistant_module, "get_single_flight", lambda: flight)
+    monkeypatch.setattr(assistant_module, "LLM_SINGLE_FLIGHT_ENABLED", True)
+    release = threading.Event()
+    upstream_keys = []
+
+    def complete(self, model, payload, operation, start, cache_key=None):
+        upstream_keys.append(self.api_key)
+        release.wait(5)
+        return {"choices": [{"message": {"content": self.api_key}}]}
+
+    monkeypatch.setattr(EducationalCodeAssistant, "_complete", complete)
+    assistants = [EducationalCodeAssistant(api_key=key) for key in ("key-1", "key-1", "key-2")]
+    messages = [{"role": "user", "content": "same prompt"}]
+
+    with ThreadPoolExecutor(len(assistants)) as executor:
+        futures = [executor.submit(assistant._send_request, "model", messages) for assistant in assistants]
+        while flight.stats()['executed'] + flight.stats()['coalesced'] < len(assistants):
+            time.sleep(0.01)
+        release.set()
+        contents = [future.result()["choices"][0]["message"]["content"] for future in futures]
+
+    assert sorted(upstream_keys) == ["key-1", "key-2"]
+    assert contents == ["key-1", "key-1", "key-2"]
@@ -0,0 +1,64 @@
+# praxis/tests/test_skill_registry.py
+from database.skill_registry import SkillRegistry, get_skill_registry, normalize_skill_name
+
+def skill_rows(db):
+    return db.conn.execute('SELECT skill_id, name, category FROM skills ORDER BY skill_id').fetchall()
+
+def test_resolves_existing_skills_ignoring_case_and_whitespace(db):
+    registry = SkillRegistry()
+    before = skill_rows(db)
+    sorting = next(skill_id for skill_id, name, _ in before if name == "Sorting")
+
+    assert registry.resolve(db.conn, ["Sorting", "  sorting ", "SORTING"]) == {
+        "Sorting": sorting, "  sorting ": sorting, "SORTING": sorting
+    }
+    assert skill_rows(db) == before
+
+def test_creates_missing_skills_once(db):
+    registry = SkillRegistry()
+
+    ids = registry.resolve(db.conn, ["Bit  Tricks", "bit tricks", ""], category="code_review")
+
+    assert ids["Bit  Tricks"] == ids["bit tricks"]
+    assert "" not in ids
+    assert skill_rows(db)[-1] == (ids["bit tricks"], "Bit Tricks", "code_review")
+    # Resolving again neither inserts nor queries a new skill
+    count = len(skill_rows(db))
+    assert registry.resolve(db.conn, ["BIT TRICKS"]) == {"BIT TRICKS": ids["bit tricks"]}
+    assert len(skill_rows(db)) == count
+
+def test_refresh_picks_up_skills_created_elsewhere(db):
+    registry = SkillRegistry()
+    registry.refresh(db.conn)
+    # Another process creates a skill behind the registry's back
+    other = SkillRegistry()
+    created = other.resolve(db.conn, ["Memoization"])["Memoization"]
+
+    assert normalize_skill_name("Memoization") not in registry._ids
+    registry.refresh(db.conn)
+    assert registry.resolve(db.conn, ["memoization"]) == {"memoization": created}
+
+def test_missing_names_trigger_a_refresh_before_inserting(db):
+    registry = SkillRegistry()
+    registry.refresh(db.conn)
+    created = SkillRegistry().resolve(db.conn, ["Tries"])["Tries"]
+    count = len(skill_rows(db))
+
+    assert registry.resolve(db.conn, ["tries"]) == {"tries": created}
+    assert len(skill_rows(db)) == count
+
+def test_registry_is_shared_per_database_file(tmp_path):
+    first = get_skill_registry(str(tmp_path / "a.db"))
+    assert get_skill_registry(str(tmp_path / "a.db")) is first
+    assert get_skill_registry(str(tmp_path / "b.db")) is not first
+
+def test_database_maps_challenge_skills_through_the_registry(db):
+    challenge_id = db.store_challenge("Sum a list", "Sum a list", "Python")
+
+    db.map_challenge_skills(challenge_id, {"sorting": 0.5, "New Skill": 0.9})
+
+    mapped = dict(db.conn.execute('''
+        SELECT s.name, cs.relevance FROM challenge_skills cs JOIN skills s ON cs.skill_id = s.skill_id
+        WHERE cs.challenge_id = ?
+    ''', (challenge_id,)).fetchall())
+    assert mapped == {"Sorting": 0.5, "New Skill": 0.9}
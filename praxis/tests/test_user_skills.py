@@ -0,0 +1,70 @@
+# praxis/tests/test_user_skills.py
+import pytest
+
+from config import SKILL_EMA_DECAY
+
+def scored_attempts(db):
+    """Every scored attempt as (user_id, challenge_id, score), oldest first."""
+    return db.conn.execute(
+        'SELECT user_id, challenge_id, score FROM attempts WHERE score IS NOT NULL ORDER BY created_at, rowid'
+    ).fetchall()
+
+def per_row_proficiencies(db, attempts):
+    """The proficiencies the original per-row update computed: a read and a write per skill."""
+    relevance = {}
+    for challenge_id, skill_id, value in db.conn.execute('''
+        SELECT cs.challenge_id, cs.skill_id, cs.relevance
+        FROM challenge_skills cs
+        JOIN skills s ON cs.skill_id = s.skill_id
+    '''):
+        relevance.setdefault(challenge_id, []).append((skill_id, value))
+
+    proficiencies = {}
+    for user_id, challenge_id, score in attempts:
+        for skill_id, value in relevance.get(challenge_id, ()):
+            current = proficiencies.get((user_id, skill_id))
+            if current is None:
+                proficiencies[(user_id, skill_id)] = score * value
+            else:
+                proficiencies[(user_id, skill_id)] = current * SKILL_EMA_DECAY + score * value * (1 - SKILL_EMA_DECAY)
+    return proficiencies
+
+def stored_proficiencies(db):
+    return {(user_id, skill_id): proficiency for user_id, skill_id, proficiency in
+            db.conn.execute('SELECT user_id, skill_id, proficiency FROM user_skills')}
+
+@pytest.fixture
+def history(synthetic, no_engine):
+    """The synthetic database with user_skills emptied, and its attempts to apply."""
+    db, _ = synthetic
+    db.conn.execute('DELETE FROM user_skills')
+    db.conn.commit()
+    return db, scored_attempts(db)
+
+def assert_same(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        assert actual[key] == pytest.approx(value, abs=1e-12), key
+
+def test_upsert_matches_the_per_row_formula(history):
+    db, attempts = history
+    for user_id, challenge_id, score in attempts:
+        db.update_user_skills(user_id, challenge_id, score)
+    assert_same(stored_proficiencies(db), per_row_proficiencies(db, attempts))
+
+def test_bulk_update_matches_the_per_row_formula(history):
+    db, attempts = history
+    db.update_user_skills_bulk(attempts)
+    assert_same(stored_proficiencies(db), per_row_proficiencies(db, attempts))
+
+def test_mappings_to_deleted_skills_are_ignored(history):
+    db, attempts = history
+    skill_id = db.conn.execute('SELECT skill_id FROM challenge_skills LIMIT 1').fetchone()[0]
+    db.conn.execute('DELETE FROM skills WHERE skill_id = ?', (skill_id,))
+    db.conn.commit()
+
+    db.update_user_skills_bulk(attempts)
+
+    stored = stored_proficiencies(db)
+    assert not any(key[1] == skill_id for key in stored)
+    assert_same(stored, per_row_proficiencies(db, attempts))
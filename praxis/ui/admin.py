@@ -0,0 +1,221 @@
+# praxis/ui/admin.py
+import time
+import datetime
+import streamlit as st
+import plotly.graph_objects as go
+from typing import Callable
+
+from config import ADMIN_USERS
+from utils.llm_metrics import get_llm_metrics
+from utils.response_cache import get_response_cache
+from utils.rate_limiter import rate_limiter_stats
+from utils.single_flight import get_single_flight
+
+def is_admin(username) -> bool:
+    """Whether the logged-in user may open the admin page."""
+    return bool(username) and username in ADMIN_USERS
+
+def render_admin_page(db, assistant, go_to_page: Callable) -> None:
+    """
+    Render the LLM usage admin page.
+
+    Args:
+        db: Database connection
+        assistant: The LLM assistant
+        go_to_page: Function to navigate to a different page
+    """
+    st.title("LLM Usage")
+
+    if not is_admin(st.session_state.username):
+        st.warning("This page is only available to administrators.")
+        return
+
+    metrics = get_llm_metrics()
+    rows = metrics.snapshot()
+    uptime_minutes = (time.time() - metrics.started_at) / 60
+    st.caption(f"Metrics for this server process over the last {uptime_minutes:.0f} minutes.")
+
+    if not rows:
+        st.info("No LLM calls have been made since the server started.")
+    else:
+        total_calls = sum(row['calls'] for row in rows)
+        total_tokens = sum(row['total_tokens'] for row in rows)
+        cache_hits = sum(row['cache_hits'] for row in rows)
+        errors = sum(row['errors'] for row in rows)
+
+        col1, col2, col3, col4 = st.columns(4)
+        for col, value, label in (
+            (col1, f"{total_calls}", "LLM Calls"),
+            (col2, f"{total_tokens:,}", "Tokens Used"),
+            (col3, f"{cache_hits / total_calls * 100:.1f}%", "Cache Hit Rate"),
+            (col4, f"{errors}", "Errors")
+        ):
+            with col:
+                st.markdown(f"""
+                <div class="metric-card">
+                <div class="metric-value">{value}</div>
+                <div class="metric-label">{label}</div>
+                </div>
+                """, unsafe_allow_html=True)
+
+        # Token and latency budget by operation
+        fig = go.Figure()
+
+        fig.add_trace(go.Bar(
+            x=[row['operation'] for row in rows],
+            y=[row['total_tokens'] for row in rows],
+            name='Tokens',
+            marker_color='#fab387'
+        ))
+
+        fig.add_trace(go.Scatter(
+            x=[row['operation'] for row in rows],
+            y=[row['total_wall_s'] for row in rows],
+            mode='markers',
+            name='Total Wall Time (s)',
+            yaxis='y2',
+            marker=dict(size=10, color='#a6e3a1')
+        ))
+
+        fig.update_layout(
+            title="Tokens and Time by Operation",
+            xaxis=dict(title=dict(text='Operation')),
+            yaxis=dict(title=dict(text='Tokens'), rangemode='nonnegative'),
+            yaxis2=dict(title=dict(text='Seconds'), overlaying='y', side='right', rangemode='nonnegative'),
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+
+        st.plotly_chart(fig, use_container_width=True)
+
+        st.subheader("By Operation")
+        st.dataframe([
+            {
+                "Operation": row['operation'],
+                "Model": row['model'],
+                "Calls": row['calls'],
+                "Cache Hits": row['cache_hits'],
+                "Coalesced": row['coalesced'],
+                "Errors": row['errors'],
+                "Retries": row['retries'],
+                "Avg Wall (ms)": round(row['avg_wall_ms']),
+                "Avg TTFB (ms)": round(row['avg_ttfb_ms']) if row['avg_ttfb_ms'] is not None else None,
+                "Prompt Tokens": row['prompt_tokens'],
+                "Completion Tokens": row['completion_tokens']
+            }
+            for row in rows
+        ], use_container_width=True)
+
+        st.subheader("Recent Calls")
+        st.dataframe([
+            {
+                "Time": datetime.datetime.fromtimestamp(call['time']).strftime("%H:%M:%S"),
+                "Operation": call['operation'],
+                "Wall (ms)": round(call['wall_ms']),
+                "TTFB (ms)": round(call['ttfb_ms']) if call['ttfb_ms'] is not None else None,
+                "Tokens": (call['prompt_tokens'] or 0) + (call['completion_tokens'] or 0),
+                "Cached": call['cache_hit'],
+                "Coalesced": call['coalesced'],
+                "Streamed": call['stream'],
+                "Retries": call['retries'],
+                "Error": call['error'] or ""
+            }
+            for call in metrics.recent_calls()
+        ], use_container_width=True)
+
+    cache_stats = get_response_cache().stats()
+    with st.expander("Response Cache"):
+        st.json(cache_stats)
+
+    with st.expander("Rate Limiter"):
+        st.json(rate_limiter_stats())
+
+    with st.expander("Request Coalescing"):
+        st.json(get_single_flight().stats())
+
+    with st.expander("Prometheus Export"):
+        text = metrics.to_prometheus()
+        st.code(text, language="text")
+        st.download_button("Download metrics", text, file_name="praxis_llm_metrics.prom", mime="text/plain")
+
+    if st.button("Reset Metrics"):
+        metrics.reset()
+        st.rerun()
+
+    render_cohort_skills(db)
+
+def render_cohort_skills(db) -> None:
+    """Render per-skill proficiency statistics for a cohort of users."""
+    st.header("Cohort Skills")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        active_days = st.selectbox("Active in the last", [None, 7, 30, 90],
+                                   format_func=lambda days: "Any time" if days is None else f"{days} days")
+    with col2:
+        username_prefix = st.text_input("Usernames starting with", help="e.g. a class prefix such as cs101_")
+
+    user_ids = db.get_cohort_user_ids(active_days, username_prefix.strip() or None)
+    if not user_ids:
+        st.info("No users match this cohort.")
+        return
+
+    try:
+        summary = db.get_cohort_skill_summary(user_ids)
+    except RuntimeError as e:
+        st.warning(f"Cohort statistics are unavailable: {e}")
+        return
+
+    if not summary:
+        st.info(f"None of the {len(user_ids)} users in this cohort have skill data yet.")
+        return
+
+    st.caption(f"{len(user_ids)} users. Each skill counts only the users with a proficiency for it.")
+
+    # Spread of proficiency for the weakest skills
+    weakest = summary[:10]
+    fig = go.Figure()
+
+    fig.add_trace(go.Bar(
+        x=[skill['name'] for skill in weakest],
+        y=[skill['mean'] * 100 for skill in weakest],
+        name='Average',
+        marker_color='#f38ba8'
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=[skill['name'] for skill in weakest],
+        y=[skill['median'] * 100 for skill in weakest],
+        mode='markers',
+        name='Median',
+        error_y=dict(
+            type='data',
+            symmetric=False,
+            array=[(skill['p75'] - skill['median']) * 100 for skill in weakest],
+            arrayminus=[(skill['median'] - skill['p25']) * 100 for skill in weakest]
+        ),
+        marker=dict(size=10, color='#89b4fa')
+    ))
+
+    fig.update_layout(
+        title="Weakest Skills Across the Cohort (median with 25th-75th percentile)",
+        xaxis=dict(title=dict(text='Skill')),
+        yaxis=dict(title=dict(text='Proficiency (%)'), range=[0, 100]),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.dataframe([
+        {
+            "Skill": skill['name'],
+            "Category": skill['category'],
+            "Users": skill['users'],
+            "Average (%)": round(skill['mean'] * 100, 1),
+            "25th Percentile (%)": round(skill['p25'] * 100, 1),
+            "Median (%)": round(skill['median'] * 100, 1),
+            "75th Percentile (%)": round(skill['p75'] * 100, 1),
+            "Min (%)": round(skill['min'] * 100, 1),
+            "Max (%)": round(skill['max'] * 100, 1)
+        }
+        for skill in summary
+    ], use_container_width=True)
@@ -191,17 +191,7 @@ def render_analytics_page(db, assistant) -> None:
                 """, unsafe_allow_html=True)
             
             # Get data for the progress chart
-            cursor = db.conn.cursor()
-            cursor.execute('''
-                SELECT date(created_at) as date, AVG(score) as avg_score, COUNT(*) as attempts
-                FROM attempts
-                WHERE user_id = ?
-                GROUP BY date(created_at)
-                ORDER BY date ASC
-                LIMIT 30
-            ''', (st.session_state.user_id,))
-            
-            data = cursor.fetchall()
+            data = db.get_activity_patterns(st.session_state.user_id)['daily'][:30]
             
             if data:
                 dates = [row[0] for row in data]
@@ -269,6 +259,7 @@ def render_analytics_page(db, assistant) -> None:
                 st.plotly_chart(fig, use_container_width=True)
             
             # Attempts distribution
+            cursor = db.conn.cursor()
             cursor.execute("""
                 SELECT c.title, COUNT(a.attempt_id) as attempt_count, MAX(a.score) * 100 as max_score
                 FROM attempts a
@@ -502,7 +493,7 @@ def render_analytics_page(db, assistant) -> None:
                         {"role": "user", "content": f"Create a {selected_lang} coding challenge that develops skills in {', '.join(weak_skill_names)}"}
                     ]
                     
-                    response = assistant._send_request(assistant.llama3_70b, messages, temperature=0.4, max_tokens=1000)
+                    response = assistant._send_request(assistant.llama3_70b, messages, temperature=0.4, max_tokens=1000, operation="personalized_challenge")
                     
                     if 'choices' in response and len(response['choices']) > 0:
                         problem_desc = f"Create code in {selected_lang} that: {response['choices'][0]['message']['content']}"
@@ -546,18 +537,8 @@ def render_analytics_page(db, assistant) -> None:
         st.markdown("### Your Learning Patterns")
         
         # Get timing data
-        cursor = db.conn.cursor()
-        cursor.execute("""
-            SELECT 
-                strftime('%H', created_at) as hour, 
-                COUNT(*) as attempts
-            FROM attempts
-            WHERE user_id = ?
-            GROUP BY hour
-            ORDER BY hour
-        """, (st.session_state.user_id,))
-        
-        time_data = cursor.fetchall()
+        patterns = db.get_activity_patterns(st.session_state.user_id)
+        time_data = patterns['hourly']
         
         if not time_data:
             st.info("Complete more challenges to see your learning patterns!")
@@ -586,28 +567,11 @@ def render_analytics_page(db, assistant) -> None:
             st.plotly_chart(fig, use_container_width=True)
             
             # Day of week data
-            cursor.execute("""
-                SELECT 
-                    CASE cast(strftime('%w', created_at) as integer)
-                        WHEN 0 THEN 'Sunday'
-                        WHEN 1 THEN 'Monday'
-                        WHEN 2 THEN 'Tuesday'
-                        WHEN 3 THEN 'Wednesday'
-                        WHEN 4 THEN 'Thursday'
-                        WHEN 5 THEN 'Friday'
-                        WHEN 6 THEN 'Saturday'
-                    END as day_of_week,
-                    COUNT(*) as attempts
-                FROM attempts
-                WHERE user_id = ?
-                GROUP BY day_of_week
-                ORDER BY cast(strftime('%w', created_at) as integer)
-            """, (st.session_state.user_id,))
-            
-            day_data = cursor.fetchall()
+            day_names = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+            day_data = patterns['weekday']
             
             if day_data:
-                days = [row[0] for row in day_data]
+                days = [day_names[row[0]] for row in day_data]
                 day_counts = [row[1] for row in day_data]
                 
                 fig = go.Figure()
@@ -630,18 +594,7 @@ def render_analytics_page(db, assistant) -> None:
                 st.plotly_chart(fig, use_container_width=True)
             
             # Challenge completion time analysis
-            cursor.execute("""
-                SELECT 
-                    c.difficulty,
-                    AVG(a.time_spent) / 60 as avg_minutes
-                FROM attempts a
-                JOIN challenges c ON a.challenge_id = c.challenge_id
-                WHERE a.user_id = ? AND a.time_spent > 0
-                GROUP BY c.difficulty
-                ORDER BY c.difficulty
-            """, (st.session_state.user_id,))
-            
-            difficulty_data = cursor.fetchall()
+            difficulty_data = patterns['difficulty']
             
             if difficulty_data:
                 difficulties = [f"Level {row[0]}" for row in difficulty_data]
@@ -671,19 +624,12 @@ def render_analytics_page(db, assistant) -> None:
             
             with st.spinner("Generating insights..."):
                 # Get additional stats
-                cursor.execute("""
-                    SELECT 
-                        COUNT(DISTINCT strftime('%Y-%m-%d', created_at)) as active_days,
-                        AVG(score) * 100 as avg_score,
-                        (SELECT COUNT(*) FROM challenges c JOIN attempts a ON c.challenge_id = a.challenge_id WHERE a.user_id = ? AND a.successful = 1) as challenges_completed
-                    FROM attempts
-                    WHERE user_id = ?
-                """, (st.session_state.user_id, st.session_state.user_id))
-                
-                stats = cursor.fetchone()
-                
-                if stats:
-                    active_days, avg_score, completed = stats
+                active_days = patterns['active_days']
+                
+                if active_days:
+                    progress = db.get_user_progress(st.session_state.user_id)
+                    avg_score = progress['average_score'] * 100
+                    completed = progress['challenges_completed']
                     
                     system_prompt = """
                     You are a learning analytics expert. Based on the user's learning data, provide personalized insights about:
@@ -713,7 +659,7 @@ def render_analytics_page(db, assistant) -> None:
                         """}
                     ]
                     
-                    response = assistant._send_request(assistant.mixtral, messages, temperature=0.4, max_tokens=2000)
+                    response = assistant._send_request(assistant.mixtral, messages, temperature=0.4, max_tokens=2000, operation="learning_insights")
                     
                     if 'choices' in response and len(response['choices']) > 0:
                         insights = response['choices'][0]['message']['content']
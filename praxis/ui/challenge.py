@@ -5,7 +5,8 @@ import re
 from typing import Callable
 from streamlit_ace import st_ace
 
-from utils.visualization import render_mermaid
+from utils.visualization import render_mermaid, render_stream
+from utils.completion_utils import grade_attempt
 
 # Function implementations for handling button actions
 def handle_analyze_code(db, assistant, user_code: str, lang: str, go_to_page: Callable) -> None:
@@ -22,14 +23,15 @@ def handle_analyze_code(db, assistant, user_code: str, lang: str, go_to_page: Ca
     if not user_code or user_code.strip() == "":
         st.error("Please write some code before analyzing.")
     else:
-        with st.spinner("Analyzing your code..."):
-            # Generate feedback
-            feedback = assistant.analyze_user_attempt(
-                st.session_state.enhanced_prompt, 
-                user_code
-            )
-            st.session_state.feedback = feedback
-            
+        # Show feedback here directly, streaming it as it is generated
+        st.markdown("### Analysis Results")
+        feedback = render_stream(
+            assistant.stream_user_attempt_analysis(st.session_state.enhanced_prompt, user_code),
+            template='<div class="feedback-card">\n\n{}\n\n</div>'
+        )
+        st.session_state.feedback = feedback
+        
+        with st.spinner("Scoring your attempt..."):
             # If user is logged in, analyze and store the attempt
             if st.session_state.user_id and st.session_state.challenge_id:
                 # Track time spent
@@ -49,12 +51,12 @@ def handle_analyze_code(db, assistant, user_code: str, lang: str, go_to_page: Ca
                     # Store solution in database
                     db.update_challenge_solution(st.session_state.challenge_id, solution)
                 
-                # Score the attempt
+                # Score the attempt by running it against the challenge's test cases
                 if solution:
-                    score = assistant.score_user_attempt(user_code, solution, lang)
-                    
-                    # Check if successful
-                    successful = score > 0.8
+                    score, successful = grade_attempt(
+                        db, assistant, st.session_state.challenge_id, st.session_state.enhanced_prompt,
+                        user_code, solution, lang
+                    )
                     
                     # Store attempt in database
                     db.store_attempt(
@@ -76,18 +78,10 @@ def handle_analyze_code(db, assistant, user_code: str, lang: str, go_to_page: Ca
                     
                     # Reset timer
                     st.session_state.start_time = time.time()
-            
-            # Show feedback here directly
-            st.markdown("### Analysis Results")
-            st.markdown(f"""
-            <div class="feedback-card">
-            {st.session_state.feedback}
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Add a button to move to feedback page for more options
-            if st.button("Revise Solution"):
-                go_to_page("feedback")
+        
+        # Add a button to move to feedback page for more options
+        if st.button("Revise Solution"):
+            go_to_page("feedback")
 
 def handle_get_hint(assistant) -> None:
     """
@@ -111,7 +105,7 @@ def handle_get_hint(assistant) -> None:
             {"role": "user", "content": "I'm stuck. Can you give me just one small hint?"}
         ]
         
-        response = assistant._send_request(assistant.mixtral, messages, temperature=0.4, max_tokens=200)
+        response = assistant._send_request(assistant.mixtral, messages, temperature=0.4, max_tokens=200, operation="hint")
         
         if 'choices' in response and len(response['choices']) > 0:
             hint = response['choices'][0]['message']['content']
@@ -167,8 +161,9 @@ def handle_show_solution(db, assistant, lang: str, go_to_page: Callable) -> None
             if solution_result and solution_result[0]:
                 st.session_state.solution = solution_result[0]
             else:
-                # Generate solution
-                solution = assistant.generate_code(st.session_state.enhanced_prompt)
+                # Generate solution, streaming the first tokens right away
+                raw_solution = render_stream(assistant.stream_code(st.session_state.enhanced_prompt), clear_on_finish=True)
+                solution = assistant._extract_code(raw_solution)
                 st.session_state.solution = solution
                 
                 # Store solution in database
@@ -177,7 +172,8 @@ def handle_show_solution(db, assistant, lang: str, go_to_page: Callable) -> None
         else:
             # Generate solution if not already done
             if not st.session_state.solution:
-                solution = assistant.generate_code(st.session_state.enhanced_prompt)
+                raw_solution = render_stream(assistant.stream_code(st.session_state.enhanced_prompt), clear_on_finish=True)
+                solution = assistant._extract_code(raw_solution)
                 st.session_state.solution = solution
         
         # Show solution directly
@@ -232,12 +228,12 @@ def handle_submit_continue(db, assistant, user_code: str, lang: str, go_to_page:
                     # Store solution in database
                     db.update_challenge_solution(st.session_state.challenge_id, solution)
                 
-                # Score the attempt
+                # Score the attempt by running it against the challenge's test cases
                 if solution:
-                    score = assistant.score_user_attempt(user_code, solution, lang)
-                    
-                    # Check if successful
-                    successful = score > 0.8
+                    score, successful = grade_attempt(
+                        db, assistant, st.session_state.challenge_id, st.session_state.enhanced_prompt,
+                        user_code, solution, lang
+                    )
                     
                     # Store attempt in database
                     db.store_attempt(
@@ -359,14 +355,15 @@ def handle_analyze_code(db, assistant, user_code: str, lang: str, go_to_page: Ca
     if not user_code or user_code.strip() == "":
         st.error("Please write some code before analyzing.")
     else:
-        with st.spinner("Analyzing your code..."):
-            # Generate feedback
-            feedback = assistant.analyze_user_attempt(
-                st.session_state.enhanced_prompt, 
-                user_code
-            )
-            st.session_state.feedback = feedback
-            
+        # Show feedback here directly, streaming it as it is generated
+        st.markdown("### Analysis Results")
+        feedback = render_stream(
+            assistant.stream_user_attempt_analysis(st.session_state.enhanced_prompt, user_code),
+            template='<div class="feedback-card">\n\n{}\n\n</div>'
+        )
+        st.session_state.feedback = feedback
+        
+        with st.spinner("Scoring your attempt..."):
             # If user is logged in, analyze and store the attempt
             if st.session_state.user_id and st.session_state.challenge_id:
                 # Track time spent
@@ -386,12 +383,12 @@ def handle_analyze_code(db, assistant, user_code: str, lang: str, go_to_page: Ca
                     # Store solution in database
                     db.update_challenge_solution(st.session_state.challenge_id, solution)
                 
-                # Score the attempt
+                # Score the attempt by running it against the challenge's test cases
                 if solution:
-                    score = assistant.score_user_attempt(user_code, solution, lang)
-                    
-                    # Check if successful
-                    successful = score > 0.8
+                    score, successful = grade_attempt(
+                        db, assistant, st.session_state.challenge_id, st.session_state.enhanced_prompt,
+                        user_code, solution, lang
+                    )
                     
                     # Store attempt in database
                     db.store_attempt(
@@ -413,15 +410,7 @@ def handle_analyze_code(db, assistant, user_code: str, lang: str, go_to_page: Ca
                     
                     # Reset timer
                     st.session_state.start_time = time.time()
-            
-            # Show feedback here directly
-            st.markdown("### Analysis Results")
-            st.markdown(f"""
-            <div class="feedback-card">
-            {st.session_state.feedback}
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Add a button to move to feedback page for more options
-            if st.button("Revise Solution"):
-                go_to_page("feedback")
\ No newline at end of file
+        
+        # Add a button to move to feedback page for more options
+        if st.button("Revise Solution"):
+            go_to_page("feedback")
\ No newline at end of file
@@ -253,7 +253,7 @@ def generate_custom_challenge(db, assistant, weak_skill_names: list, language: s
         {"role": "user", "content": f"Create a {language} coding challenge that develops skills in {', '.join(weak_skill_names)}"}
     ]
     
-    response = assistant._send_request(assistant.llama3_70b, messages, temperature=0.4, max_tokens=1000)
+    response = assistant._send_request(assistant.llama3_70b, messages, temperature=0.4, max_tokens=1000, operation="custom_challenge")
     
     if 'choices' in response and len(response['choices']) > 0:
         problem_desc = f"Create code in {language} that: {response['choices'][0]['message']['content']}"
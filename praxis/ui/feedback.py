@@ -5,7 +5,8 @@ import time
 from typing import Callable
 from streamlit_ace import st_ace
 
-from utils.visualization import render_mermaid
+from utils.visualization import render_mermaid, render_stream
+from utils.completion_utils import grade_attempt
 
 def render_feedback_page(db, assistant, reset_app: Callable, go_to_page: Callable) -> None:
     """
@@ -111,17 +112,18 @@ def handle_submit_revised(db, assistant, revised_code: str, lang: str) -> None:
     if not revised_code or revised_code.strip() == "":
         st.error("Please update your code before submitting.")
     else:
-        with st.spinner("Analyzing your revised code..."):
-            # Update user code
-            st.session_state.user_code = revised_code
-            
-            # Generate new feedback
-            feedback = assistant.analyze_user_attempt(
-                st.session_state.enhanced_prompt,
-                revised_code
-            )
-            st.session_state.feedback = feedback
-            
+        # Update user code
+        st.session_state.user_code = revised_code
+        
+        # Generate new feedback, streaming it as it is generated
+        st.markdown("### Updated Analysis")
+        feedback = render_stream(
+            assistant.stream_user_attempt_analysis(st.session_state.enhanced_prompt, revised_code),
+            template='<div class="feedback-card">\n\n{}\n\n</div>'
+        )
+        st.session_state.feedback = feedback
+        
+        with st.spinner("Scoring your revised code..."):
             # If user is logged in, store the attempt
             if st.session_state.user_id and st.session_state.challenge_id:
                 # Track time spent
@@ -141,12 +143,12 @@ def handle_submit_revised(db, assistant, revised_code: str, lang: str) -> None:
                     # Store solution in database
                     db.update_challenge_solution(st.session_state.challenge_id, solution)
                 
-                # Score the attempt
+                # Score the attempt by running it against the challenge's test cases
                 if solution:
-                    score = assistant.score_user_attempt(revised_code, solution, lang)
-                    
-                    # Check if successful
-                    successful = score > 0.8
+                    score, successful = grade_attempt(
+                        db, assistant, st.session_state.challenge_id, st.session_state.enhanced_prompt,
+                        revised_code, solution, lang
+                    )
                     
                     # Store attempt in database
                     db.store_attempt(
@@ -169,14 +171,8 @@ def handle_submit_revised(db, assistant, revised_code: str, lang: str) -> None:
                     # Reset timer
                     st.session_state.start_time = time.time()
             
-            # Stay on feedback page but update content
-            st.success("Feedback updated!")
-            st.markdown("### Updated Analysis")
-            st.markdown(f"""
-            <div class="feedback-card">
-            {feedback}
-            </div>
-            """, unsafe_allow_html=True)
+        # Stay on feedback page but update content
+        st.success("Feedback updated!")
 
 def handle_get_hint(assistant, revised_code: str) -> None:
     """
@@ -202,7 +198,7 @@ def handle_get_hint(assistant, revised_code: str) -> None:
             {"role": "user", "content": f"My code:\n{revised_code}\n\nFeedback I got:\n{st.session_state.feedback}\n\nCan you give me a targeted hint?"}
         ]
         
-        response = assistant._send_request(assistant.mixtral, messages, temperature=0.4, max_tokens=200)
+        response = assistant._send_request(assistant.mixtral, messages, temperature=0.4, max_tokens=200, operation="hint")
         
         if 'choices' in response and len(response['choices']) > 0:
             hint = response['choices'][0]['message']['content']
@@ -264,8 +260,9 @@ def handle_view_solution(db, assistant, revised_code: str, lang: str, go_to_page
             if solution_result and solution_result[0]:
                 st.session_state.solution = solution_result[0]
             else:
-                # Generate solution
-                solution = assistant.generate_code(st.session_state.enhanced_prompt)
+                # Generate solution, streaming the first tokens right away
+                raw_solution = render_stream(assistant.stream_code(st.session_state.enhanced_prompt), clear_on_finish=True)
+                solution = assistant._extract_code(raw_solution)
                 st.session_state.solution = solution
                 
                 # Store solution in database
@@ -273,7 +270,8 @@ def handle_view_solution(db, assistant, revised_code: str, lang: str, go_to_page
         else:
             # Generate solution
             if not st.session_state.solution:
-                solution = assistant.generate_code(st.session_state.enhanced_prompt)
+                raw_solution = render_stream(assistant.stream_code(st.session_state.enhanced_prompt), clear_on_finish=True)
+                solution = assistant._extract_code(raw_solution)
                 st.session_state.solution = solution
         
         # Show solution
@@ -6,6 +6,7 @@ from typing import Callable
 from streamlit_ace import st_ace
 
 from utils.visualization import render_mermaid
+from utils.completion_utils import grade_attempt
 
 def render_flowchart_page(db, assistant, reset_app: Callable, go_to_page: Callable) -> None:
     """
@@ -153,12 +154,12 @@ def handle_analyze_code(db, assistant, final_code: str, lang: str) -> None:
                     # Store solution in database
                     db.update_challenge_solution(st.session_state.challenge_id, solution)
                 
-                # Score the attempt
+                # Score the attempt by running it against the challenge's test cases
                 if solution:
-                    score = assistant.score_user_attempt(final_code, solution, lang)
-                    
-                    # Check if successful
-                    successful = score > 0.8
+                    score, successful = grade_attempt(
+                        db, assistant, st.session_state.challenge_id, st.session_state.enhanced_prompt,
+                        final_code, solution, lang
+                    )
                     
                     # Store attempt in database
                     db.store_attempt(
@@ -213,7 +214,7 @@ def handle_get_hint(assistant, final_code: str) -> None:
             {"role": "user", "content": f"My current code:\n{final_code}\n\nCan you give me a hint on how to implement the solution based on the flowchart?"}
         ]
         
-        response = assistant._send_request(assistant.mixtral, messages, temperature=0.4, max_tokens=200)
+        response = assistant._send_request(assistant.mixtral, messages, temperature=0.4, max_tokens=200, operation="hint")
         
         if 'choices' in response and len(response['choices']) > 0:
             hint = response['choices'][0]['message']['content']
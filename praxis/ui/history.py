@@ -14,29 +14,16 @@ def render_history_page(db, assistant, go_to_page: Callable) -> None:
     st.title("Challenge History")
     
     # Get all attempted challenges
-    cursor = db.conn.cursor()
-    cursor.execute("""
-        SELECT c.challenge_id, c.title, c.description, 
-               MAX(a.score) as best_score, 
-               COUNT(a.attempt_id) as attempts,
-               MAX(a.successful) as completed,
-               MAX(a.created_at) as last_attempt
-        FROM attempts a
-        JOIN challenges c ON a.challenge_id = c.challenge_id
-        WHERE a.user_id = ?
-        GROUP BY c.challenge_id
-        ORDER BY last_attempt DESC
-    """, (st.session_state.user_id,))
-    
-    history = cursor.fetchall()
+    history = db.get_user_challenge_history(st.session_state.user_id)
     
     if not history:
         st.info("You haven't attempted any challenges yet!")
     else:
         # Summary stats
-        total_challenges = len(history)
-        completed_challenges = sum(1 for _, _, _, _, _, completed, _ in history if completed)
-        avg_score = sum(score for _, _, _, score, _, _, _ in history if score is not None) / total_challenges if total_challenges > 0 else 0
+        progress = db.get_user_progress(st.session_state.user_id)
+        total_challenges = progress['challenges_attempted']
+        completed_challenges = progress['challenges_completed']
+        avg_score = progress['average_best_score']
         
         st.markdown("### Your Challenge Stats")
         
@@ -161,13 +148,7 @@ def resume_challenge(db, assistant, challenge_id: str, description: str, go_to_p
         st.session_state.enhanced_prompt = enhanced_prompt
         
         # Get the last attempt
-        cursor.execute("""
-            SELECT code, attempt_number 
-            FROM attempts 
-            WHERE user_id = ? AND challenge_id = ? 
-            ORDER BY created_at DESC LIMIT 1
-        """, (st.session_state.user_id, challenge_id))
-        attempt_result = cursor.fetchone()
+        attempt_result = db.get_last_attempt(st.session_state.user_id, challenge_id)
         
         if attempt_result:
             code, attempt_number = attempt_result
@@ -0,0 +1,93 @@
+# praxis/ui/jobs.py
+import streamlit as st
+from typing import Any, Callable, Dict, Optional
+
+from config import JOB_POLL_SECONDS
+from database.db_manager import Database
+from models.path_builder import PATH_JOB_KIND, run_focus_path_job, run_personalized_path_job
+from utils.job_queue import get_job_queue
+
+# Session state key holding the learning path job being watched
+PATH_JOB_KEY = "path_job_id"
+
+def submit_path_job(assistant, mode: str, params: Dict[str, Any]) -> str:
+    """
+    Queue learning path generation in the background and watch it from this session.
+
+    Args:
+        assistant: The LLM assistant, whose API key the job uses
+        mode: "focus" for a path on chosen focus areas, "personalized" for the user's weakest skills
+        params: Job parameters for the chosen mode
+
+    Returns:
+        The job ID
+    """
+    handler = run_personalized_path_job if mode == "personalized" else run_focus_path_job
+    job_id = get_job_queue().submit(
+        st.session_state.user_id, PATH_JOB_KIND, handler, dict(params, mode=mode), assistant.api_key
+    )
+    st.session_state[PATH_JOB_KEY] = job_id
+    return job_id
+
+def resume_path_job(db) -> None:
+    """Pick up the user's unfinished learning path job, e.g. after navigating away and back."""
+    if st.session_state.get(PATH_JOB_KEY) or not st.session_state.user_id:
+        return
+    # Starting the queue fails jobs orphaned by a restart, so they are not picked up below
+    get_job_queue()
+    for job in db.get_user_jobs(st.session_state.user_id, PATH_JOB_KIND, limit=1):
+        if job['status'] in ('queued', 'running'):
+            st.session_state[PATH_JOB_KEY] = job['job_id']
+
+def render_path_job_status(on_complete: Optional[Callable[[Dict[str, Any]], None]] = None) -> None:
+    """
+    Show the progress of the watched learning path job, polling until it finishes.
+
+    Args:
+        on_complete: Called with the finished job before the page reruns
+    """
+    # Outcome of a job that finished during the previous run
+    message = st.session_state.pop("path_job_message", None)
+    if message:
+        level, text = message
+        getattr(st, level)(text)
+
+    job_id = st.session_state.get(PATH_JOB_KEY)
+    if not job_id:
+        return
+
+    @st.fragment(run_every=JOB_POLL_SECONDS)
+    def poll() -> None:
+        # Fragment reruns happen outside main(), so use a connection of our own
+        db = Database()
+        try:
+            job = db.get_job(job_id)
+        finally:
+            db.close()
+
+        if job is None or job['status'] in ('completed', 'failed'):
+            st.session_state[PATH_JOB_KEY] = None
+            if job and job['status'] == 'completed':
+                st.session_state.path_job_message = ("success", "Learning path created successfully!")
+                if on_complete:
+                    on_complete(job)
+            else:
+                error = job['error'] if job else "the job could not be found"
+                st.session_state.path_job_message = ("error", f"Error creating learning path: {error}")
+            st.rerun()
+
+        done = job['progress']
+        total = done[-1]['total'] if done else None
+        st.markdown("#### Generating your learning path")
+        if total:
+            st.progress(len(done) / total, text=f"{len(done)} of {total} challenges ready")
+        else:
+            st.info("Designing the challenge sequence...")
+
+        # Prompts finish in any order; list them in path order
+        for item in sorted(done, key=lambda item: item['position']):
+            difficulty_stars = "⭐" * item['difficulty'] if isinstance(item.get('difficulty'), int) else ""
+            st.markdown(f"**{item['position'] + 1}. {item['title']}** {difficulty_stars}")
+            st.caption(item['description'])
+
+    poll()
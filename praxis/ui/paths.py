@@ -2,6 +2,8 @@
 import streamlit as st
 from typing import Callable
 
+from ui.jobs import PATH_JOB_KEY, submit_path_job, resume_path_job, render_path_job_status
+
 def render_paths_page(db, assistant, go_to_page: Callable) -> None:
     """
     Render the learning paths page.
@@ -13,19 +15,12 @@ def render_paths_page(db, assistant, go_to_page: Callable) -> None:
     """
     st.title("Learning Paths")
     
-    # Get available learning paths
-    cursor = db.conn.cursor()
-    cursor.execute("""
-        SELECT lp.path_id, lp.title, lp.description, lp.difficulty, pl.name as language,
-               COUNT(lpi.challenge_id) as challenge_count
-        FROM learning_paths lp
-        JOIN programming_languages pl ON lp.lang_id = pl.lang_id
-        LEFT JOIN learning_path_items lpi ON lp.path_id = lpi.path_id
-        GROUP BY lp.path_id
-        ORDER BY lp.created_at DESC
-    """)
+    # Progress of a path being generated in the background
+    resume_path_job(db)
+    render_path_job_status()
     
-    paths = cursor.fetchall()
+    # Get available learning paths
+    paths = db.get_learning_paths()
     
     if not paths:
         st.info("No learning paths available yet. Generate one from your profile!")
@@ -76,76 +71,18 @@ def render_paths_page(db, assistant, go_to_page: Callable) -> None:
     
     difficulty = st.slider("Difficulty Level", 1, 5, 3)
     
-    if st.button("Generate Path", type="primary"):
+    generating = bool(st.session_state.get(PATH_JOB_KEY))
+    if st.button("Generate Path", type="primary", disabled=generating):
         if not selected_focus:
             st.error("Please select at least one focus area")
         else:
-            with st.spinner("Generating learning path..."):
-                system_prompt = f"""
-                You are a programming curriculum designer. Create a learning path for {new_path_lang} focusing on {', '.join(selected_focus)}.
-                
-                Design a sequence of 5-7 coding challenges that build skills incrementally.
-                For each challenge, provide:
-                1. A clear title
-                2. A brief description of what to implement
-                3. The primary skills it develops
-                4. Approximate difficulty (1-5, with {difficulty} as the average)
-                
-                Format as a JSON array of challenge objects.
-                """
-                
-                messages = [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Create a {new_path_lang} learning path focusing on {', '.join(selected_focus)}"}
-                ]
-                
-                response = assistant._send_request(assistant.llama3_70b, messages, temperature=0.4, max_tokens=4000)
-                
-                if 'choices' in response and len(response['choices']) > 0:
-                    import re
-                    import json
-                    
-                    content = response['choices'][0]['message']['content']
-                    
-                    # Extract JSON
-                    try:
-                        json_pattern = r'\[[\s\S]*\]'
-                        json_match = re.search(json_pattern, content)
-                        if json_match:
-                            path_json = json_match.group(0)
-                            path_challenges = json.loads(path_json)
-                            
-                            # Create a learning path
-                            path_title = f"{new_path_lang} - {', '.join(selected_focus[:2])}"
-                            path_desc = f"A learning path for {new_path_lang} focusing on {', '.join(selected_focus)}"
-                            
-                            path_id = db.get_or_create_learning_path(path_title, path_desc, new_path_lang, difficulty)
-                            
-                            # Add challenges to the path
-                            for i, challenge in enumerate(path_challenges):
-                                # Create the challenge
-                                challenge_desc = f"Create code in {new_path_lang} that: {challenge['description']}"
-                                enhanced_prompt = assistant.enhance_prompt(challenge_desc)
-                                
-                                challenge_id = db.store_challenge(
-                                    challenge['title'], 
-                                    enhanced_prompt, 
-                                    new_path_lang, 
-                                    difficulty=challenge.get('difficulty', difficulty)
-                                )
-                                
-                                # Map skills to challenge
-                                if 'skills' in challenge:
-                                    skill_relevance = {skill: 0.8 for skill in challenge['skills']}
-                                    db.map_challenge_skills(challenge_id, skill_relevance)
-                                
-                                # Add to learning path
-                                db.add_challenge_to_path(path_id, challenge_id, i)
-                            
-                            st.success("Learning path created successfully!")
-                            st.rerun()
-                    except Exception as e:
-                        st.error(f"Error creating learning path: {str(e)}")
+            # Runs in the background; the status above polls it
+            submit_path_job(assistant, "focus", {
+                "language": new_path_lang,
+                "focus_areas": selected_focus,
+                "difficulty": difficulty
+            })
+            st.rerun()
 
 def start_challenge(db, assistant, challenge_id: str, description: str, go_to_page: Callable) -> None:
     """
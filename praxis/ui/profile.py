@@ -3,6 +3,7 @@ import streamlit as st
 from typing import Callable
 
 from utils.visualization import render_skill_chart, render_skill_progress
+from ui.jobs import submit_path_job
 
 def render_profile_page(db, assistant, go_to_page: Callable) -> None:
     """
@@ -85,12 +86,10 @@ def render_profile_page(db, assistant, go_to_page: Callable) -> None:
     selected_lang = st.selectbox("Select Language", languages)
     
     if st.button("Create Learning Path", type="primary"):
-        with st.spinner("Generating personalized learning path..."):
-            path_id = assistant.generate_personalized_learning_path(st.session_state.user_id, selected_lang)
-            
-            if path_id:
-                st.success("Learning path created! View it in the Learning Paths section.")
-                st.session_state.path_id = path_id
-                go_to_page("paths")
-            else:
-                st.error("Could not create learning path. Try again later.")
\ No newline at end of file
+        # Generated in the background; the Learning Paths page shows its progress
+        submit_path_job(assistant, "personalized", {
+            "user_id": st.session_state.user_id,
+            "language": selected_lang
+        })
+        go_to_page("paths")
+        st.rerun()
\ No newline at end of file
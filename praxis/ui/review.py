@@ -3,6 +3,7 @@ import streamlit as st
 from typing import Callable
 from streamlit_ace import st_ace
 
+from models.async_assistant import AsyncEducationalCodeAssistant, run_concurrently
 from utils.visualization import render_mermaid
 
 def render_review_page(db, assistant) -> None:
@@ -73,276 +74,322 @@ def render_review_page(db, assistant) -> None:
             # Track current tab index
             tab_index = 0
             
+            # Placeholders that are filled in as each analysis completes
+            slots = {}
+            async_assistant = AsyncEducationalCodeAssistant(assistant)
+            jobs = {}
+            
             # Code Review tab
             if do_review:
                 with tab_objects[tab_index]:
                     st.markdown("### Code Quality Review")
-                    with st.spinner("Analyzing your code..."):
-                        code_review = assistant.review_code(user_code)
-                    
-                    if 'overall_rating' in code_review and code_review['overall_rating'] != "N/A" and code_review['overall_rating'] != "Review failed":
-                        # Try to convert to numeric if possible
-                        try:
-                            rating = float(code_review['overall_rating'])
-                            st.markdown(f"""
-                            #### Overall Rating: <div class="step-badge">{rating}/10</div>
-                            """, unsafe_allow_html=True)
-                        except:
-                            st.markdown(f"""
-                            #### Overall Rating: <div class="step-badge">{code_review['overall_rating']}</div>
-                            """, unsafe_allow_html=True)
-                    
-                    if 'strengths' in code_review and isinstance(code_review['strengths'], list):
-                        st.markdown("#### Strengths")
-                        for strength in code_review['strengths']:
-                            st.markdown(f"- {strength}")
-                    
-                    if 'improvements' in code_review and isinstance(code_review['improvements'], list):
-                        st.markdown("#### Improvements")
-                        for improvement in code_review['improvements']:
-                            st.markdown(f"- {improvement}")
-                    
-                    if 'optimizations' in code_review and isinstance(code_review['optimizations'], list):
-                        st.markdown("#### Optimizations")
-                        for optimization in code_review['optimizations']:
-                            st.markdown(f"- {optimization}")
-                    
-                    if 'potential_issues' in code_review and isinstance(code_review['potential_issues'], list):
-                        st.markdown("#### Potential Issues")
-                        for issue in code_review['potential_issues']:
-                            st.markdown(f"- {issue}")
-                    
-                    if 'review' in code_review and not isinstance(code_review.get('strengths'), list):
-                        st.markdown("#### Detailed Review")
-                        st.markdown(f"""<div class="feedback-card">{code_review['review']}</div>""", unsafe_allow_html=True)
+                    slots["review"] = st.empty()
+                    slots["review"].info("Analyzing your code...")
                     
                     # Code improvement suggestion
                     with st.expander("Suggested Improvements", expanded=False):
-                        with st.spinner("Generating improved version..."):
-                            system_prompt = """
-                            You are a code improvement expert. Given a piece of code:
-                            1. Create an improved version of the code that addresses the main issues
-                            2. Add clear comments explaining the changes and improvements
-                            3. Focus on readability, efficiency, and best practices
-                            4. Maintain the original functionality but make it better
-                            
-                            Format your response as code only, without explanations outside the code.
-                            """
-                            
-                            messages = [
-                                {"role": "system", "content": system_prompt},
-                                {"role": "user", "content": f"Here's my code in {programming_language}:\n\n{user_code}\n\nPlease provide an improved version with comments explaining the changes."}
-                            ]
-                            
-                            response = assistant._send_request(assistant.llama3_70b, messages, temperature=0.2, max_tokens=4000)
-                            
-                            if 'choices' in response and len(response['choices']) > 0:
-                                improved_code = assistant._extract_code(response['choices'][0]['message']['content'])
-                                st.code(improved_code, language=programming_language.lower())
+                        slots["improvement"] = st.empty()
+                        slots["improvement"].info("Generating improved version...")
+                jobs["review"] = lambda: async_assistant.review_code(user_code)
+                jobs["improvement"] = lambda: async_assistant._send_request(
+                    assistant.llama3_70b, improvement_messages(user_code, programming_language), temperature=0.2, max_tokens=4000, operation="code_improvement"
+                )
                 tab_index += 1
             
             # Complexity Analysis tab
             if do_complexity:
                 with tab_objects[tab_index]:
                     st.markdown("### Complexity Analysis")
-                    with st.spinner("Analyzing complexity..."):
-                        complexity = assistant.analyze_complexity(user_code)
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.markdown(f"""
-                        #### Time Complexity
-                        <div class="step-badge">{complexity['time_complexity']}</div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col2:
-                        st.markdown(f"""
-                        #### Space Complexity
-                        <div class="step-badge">{complexity['space_complexity']}</div>
-                        """, unsafe_allow_html=True)
-                    
-                    st.markdown("#### Explanation")
-                    st.markdown(f"""<div class="feedback-card">{complexity['explanation']}</div>""", unsafe_allow_html=True)
+                    slots["complexity"] = st.empty()
+                    slots["complexity"].info("Analyzing complexity...")
                     
                     # Optimization suggestions
                     with st.expander("Optimization Suggestions", expanded=False):
-                        with st.spinner("Generating optimization tips..."):
-                            system_prompt = """
-                            You are an algorithm optimization expert. Given some code and its complexity analysis:
-                            1. Identify specific areas where the code could be optimized
-                            2. Suggest concrete changes to improve time and/or space complexity
-                            3. Explain the theoretical impact of each suggestion on the overall complexity
-                            4. If possible, suggest alternative algorithms or data structures
-                            
-                            Format your response with clear sections and bullet points.
-                            """
-                            
-                            messages = [
-                                {"role": "system", "content": system_prompt},
-                                {"role": "user", "content": f"Code:\n{user_code}\n\nCurrent complexity analysis:\nTime: {complexity['time_complexity']}\nSpace: {complexity['space_complexity']}\n\nPlease suggest optimizations."}
-                            ]
-                            
-                            response = assistant._send_request(assistant.mixtral, messages, temperature=0.3, max_tokens=2000)
-                            
-                            if 'choices' in response and len(response['choices']) > 0:
-                                optimization_tips = response['choices'][0]['message']['content']
-                                st.markdown(optimization_tips)
+                        slots["optimization"] = st.empty()
+                        slots["optimization"].info("Generating optimization tips...")
+                jobs["complexity"] = lambda: complexity_with_optimizations(async_assistant, user_code)
                 tab_index += 1
             
             # Visualization tab - always included
             with tab_objects[tab_index]:
                 st.markdown("### Code Visualization")
-                with st.spinner("Generating visualization..."):
-                    mermaid_code = assistant.generate_solution_flowchart(f"Visualize this code:\n\n{user_code}")
-                
-                st.markdown("#### Code Structure Diagram")
-                render_mermaid(mermaid_code)
-                
-                with st.expander("View Mermaid Code"):
-                    st.code(mermaid_code, language="mermaid")
+                slots["flowchart"] = st.empty()
+                slots["flowchart"].info("Generating visualization...")
                 
                 # Additional visualization options
                 with st.expander("Code Structure Explanation", expanded=False):
-                    with st.spinner("Generating structure explanation..."):
-                        system_prompt = """
-                        You are a code structure analyst. Based on the provided code:
-                        1. Explain the high-level architecture and structure
-                        2. Break down how the different components interact
-                        3. Identify the core design patterns or approaches used
-                        4. Explain the data flow through the code
-                        
-                        Focus on structure rather than implementation details.
-                        """
-                        
-                        messages = [
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": f"Please analyze the structure of this {programming_language} code:\n\n{user_code}"}
-                        ]
-                        
-                        response = assistant._send_request(assistant.mixtral, messages, temperature=0.3, max_tokens=2000)
-                        
-                        if 'choices' in response and len(response['choices']) > 0:
-                            structure_explanation = response['choices'][0]['message']['content']
-                            st.markdown(structure_explanation)
-                tab_index += 1
+                    slots["structure"] = st.empty()
+                    slots["structure"].info("Generating structure explanation...")
+            jobs["flowchart"] = lambda: async_assistant.generate_solution_flowchart(f"Visualize this code:\n\n{user_code}")
+            jobs["structure"] = lambda: async_assistant._send_request(
+                assistant.mixtral, structure_messages(user_code, programming_language), temperature=0.3, max_tokens=2000, operation="code_structure"
+            )
+            tab_index += 1
             
             # Learning Path tab
             if do_learning:
                 with tab_objects[tab_index]:
                     st.markdown("### Personalized Learning Path")
-                    with st.spinner("Creating personalized learning recommendations..."):
-                        try:
-                            system_prompt = """
-                            You are an educational coding mentor. Based on the user's code:
-                            1. Identify the user's current skill level (beginner, intermediate, advanced)
-                            2. Recommend 3-4 specific concepts or skills they should learn next
-                            3. Suggest resources (documentation, tutorials) for each concept
-                            4. Provide a small practice exercise for each concept
-                            5. Be encouraging and supportive in your tone
-                            """
-                            
-                            messages = [
-                                {"role": "system", "content": system_prompt},
-                                {"role": "user", "content": f"Based on this {programming_language} code, create a personalized learning path:\n\n{user_code}"}
-                            ]
-                            
-                            response = assistant._send_request(assistant.mixtral, messages, temperature=0.4, max_tokens=2000)
-                            
-                            if 'choices' in response and len(response['choices']) > 0:
-                                learning_path = response['choices'][0]['message']['content']
-                                st.markdown(f"""<div class="challenge-card">{learning_path}</div>""", unsafe_allow_html=True)
-                            else:
-                                st.warning("Could not generate learning recommendations. Please try again.")
-                        except Exception as e:
-                            st.error(f"Unable to generate learning recommendations: {str(e)}")
+                    slots["learning_path"] = st.empty()
+                    slots["learning_path"].info("Creating personalized learning recommendations...")
                     
                     # Additional practice problems
                     with st.expander("Practice Problems", expanded=False):
-                        with st.spinner("Generating practice problems..."):
-                            system_prompt = """
-                            You are a programming educator. Based on the user's code skill level:
-                            1. Create 3 progressively challenging practice problems
-                            2. Each problem should build on skills demonstrated in their code
-                            3. Provide clear problem statements with expected inputs/outputs
-                            4. Include a hint for each problem (without giving away the solution)
-                            5. Format these as numbered problems with clear sections
-                            """
-                            
-                            messages = [
-                                {"role": "system", "content": system_prompt},
-                                {"role": "user", "content": f"Based on this {programming_language} code, create practice problems:\n\n{user_code}"}
-                            ]
-                            
-                            response = assistant._send_request(assistant.mixtral, messages, temperature=0.4, max_tokens=2000)
-                            
-                            if 'choices' in response and len(response['choices']) > 0:
-                                practice_problems = response['choices'][0]['message']['content']
-                                st.markdown(practice_problems)
+                        slots["practice"] = st.empty()
+                        slots["practice"].info("Generating practice problems...")
                     
                     # If logged in, save the skills assessment
                     if st.session_state.user_id:
-                        with st.spinner("Analyzing skills in your code..."):
-                            # Analyze code to identify skills
-                            skills_analysis = assistant.skill_analyzer.analyze_code(user_code, programming_language)
-                            
-                            if skills_analysis and 'skills' in skills_analysis:
-                                st.markdown("### Skills Analysis")
-                                
-                                skills_data = skills_analysis['skills']
-                                strengths = []
-                                weaknesses = []
-                                
-                                for skill, score in skills_data.items():
-                                    if score > 0.6:
-                                        strengths.append((skill, score))
-                                    elif score < 0.4:
-                                        weaknesses.append((skill, score))
-                                
-                                col1, col2 = st.columns(2)
-                                
-                                with col1:
-                                    st.markdown("#### Strengths")
-                                    for skill, score in sorted(strengths, key=lambda x: x[1], reverse=True):
-                                        st.markdown(f"""
-                                        <div class="skill-badge">{skill}: {score:.2f}</div>
-                                        """, unsafe_allow_html=True)
-                                
-                                with col2:
-                                    st.markdown("#### Areas for Improvement")
-                                    for skill, score in sorted(weaknesses, key=lambda x: x[1]):
-                                        st.markdown(f"""
-                                        <div class="weak-badge">{skill}: {score:.2f}</div>
-                                        """, unsafe_allow_html=True)
-                                
-                                # Option to save to profile
-                                if st.button("Save Skills to Profile"):
-                                    try:
-                                        # Get skill IDs
-                                        for skill, score in skills_data.items():
-                                            # Check if skill exists
-                                            cursor = db.conn.cursor()
-                                            cursor.execute('SELECT skill_id FROM skills WHERE name = ?', (skill,))
-                                            skill_result = cursor.fetchone()
-                                            
-                                            if not skill_result:
-                                                # Create new skill
-                                                cursor.execute('INSERT INTO skills (name, category) VALUES (?, ?)', 
-                                                             (skill, "code_review"))
-                                                db.conn.commit()
-                                                cursor.execute('SELECT skill_id FROM skills WHERE name = ?', (skill,))
-                                                skill_result = cursor.fetchone()
-                                            
-                                            skill_id = skill_result[0]
-                                            
-                                            # Update user skill
-                                            cursor.execute("""
-                                                INSERT OR REPLACE INTO user_skills 
-                                                (user_id, skill_id, proficiency, last_updated) 
-                                                VALUES (?, ?, ?, ?)
-                                            """, (st.session_state.user_id, skill_id, score, 
-                                                 "datetime('now')"))
-                                        
-                                        db.conn.commit()
-                                        st.success("Skills saved to your profile!")
-                                    except Exception as e:
-                                        st.error(f"Error saving skills: {str(e)}")
\ No newline at end of file
+                        slots["skills"] = st.container()
+                        with slots["skills"]:
+                            skills_status = st.empty()
+                            skills_status.info("Analyzing skills in your code...")
+                jobs["learning_path"] = lambda: async_assistant._send_request(
+                    assistant.mixtral, learning_path_messages(user_code, programming_language), temperature=0.4, max_tokens=2000, operation="review_learning_path"
+                )
+                jobs["practice"] = lambda: async_assistant._send_request(
+                    assistant.mixtral, practice_messages(user_code, programming_language), temperature=0.4, max_tokens=2000, operation="practice_problems"
+                )
+                if st.session_state.user_id:
+                    jobs["skills"] = lambda: async_assistant.analyze_code(user_code, programming_language)
+            
+            def on_result(name, result, error):
+                """Render each analysis into its tab as soon as it lands."""
+                if name == "skills":
+                    skills_status.empty()
+                    with slots["skills"]:
+                        if error:
+                            st.error(f"Unable to analyze skills: {str(error)}")
+                        else:
+                            render_skills_analysis(db, result)
+                    return
+                
+                slot = slots[name]
+                if error:
+                    if name == "learning_path":
+                        slot.error(f"Unable to generate learning recommendations: {str(error)}")
+                    else:
+                        slot.error(f"An error occurred: {str(error)}")
+                    if name == "complexity":
+                        slots["optimization"].empty()
+                    return
+                
+                with slot.container():
+                    if name == "review":
+                        render_code_review(result)
+                    elif name == "improvement":
+                        if 'choices' in result and len(result['choices']) > 0:
+                            improved_code = assistant._extract_code(result['choices'][0]['message']['content'])
+                            st.code(improved_code, language=programming_language.lower())
+                    elif name == "complexity":
+                        complexity, optimization_tips = result
+                        render_complexity(complexity)
+                        with slots["optimization"].container():
+                            if optimization_tips:
+                                st.markdown(optimization_tips)
+                    elif name == "flowchart":
+                        st.markdown("#### Code Structure Diagram")
+                        render_mermaid(result)
+                        
+                        with st.expander("View Mermaid Code"):
+                            st.code(result, language="mermaid")
+                    elif name == "structure" or name == "practice":
+                        if 'choices' in result and len(result['choices']) > 0:
+                            st.markdown(result['choices'][0]['message']['content'])
+                    elif name == "learning_path":
+                        if 'choices' in result and len(result['choices']) > 0:
+                            learning_path = result['choices'][0]['message']['content']
+                            st.markdown(f"""<div class="challenge-card">{learning_path}</div>""", unsafe_allow_html=True)
+                        else:
+                            st.warning("Could not generate learning recommendations. Please try again.")
+            
+            # Run every analysis concurrently; total latency tracks the slowest call
+            run_concurrently(jobs, on_result)
+
+async def complexity_with_optimizations(async_assistant, user_code: str):
+    """Analyze complexity, then ask for optimization tips based on the analysis."""
+    complexity = await async_assistant.analyze_complexity(user_code)
+    
+    system_prompt = """
+    You are an algorithm optimization expert. Given some code and its complexity analysis:
+    1. Identify specific areas where the code could be optimized
+    2. Suggest concrete changes to improve time and/or space complexity
+    3. Explain the theoretical impact of each suggestion on the overall complexity
+    4. If possible, suggest alternative algorithms or data structures
+    
+    Format your response with clear sections and bullet points.
+    """
+    
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"Code:\n{user_code}\n\nCurrent complexity analysis:\nTime: {complexity['time_complexity']}\nSpace: {complexity['space_complexity']}\n\nPlease suggest optimizations."}
+    ]
+    
+    response = await async_assistant._send_request(async_assistant.mixtral, messages, temperature=0.3, max_tokens=2000, operation="optimization_tips")
+    
+    optimization_tips = None
+    if 'choices' in response and len(response['choices']) > 0:
+        optimization_tips = response['choices'][0]['message']['content']
+    
+    return complexity, optimization_tips
+
+def improvement_messages(user_code: str, programming_language: str) -> list:
+    """Build the prompt for the improved-code suggestion."""
+    system_prompt = """
+    You are a code improvement expert. Given a piece of code:
+    1. Create an improved version of the code that addresses the main issues
+    2. Add clear comments explaining the changes and improvements
+    3. Focus on readability, efficiency, and best practices
+    4. Maintain the original functionality but make it better
+    
+    Format your response as code only, without explanations outside the code.
+    """
+    
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"Here's my code in {programming_language}:\n\n{user_code}\n\nPlease provide an improved version with comments explaining the changes."}
+    ]
+
+def structure_messages(user_code: str, programming_language: str) -> list:
+    """Build the prompt for the code structure explanation."""
+    system_prompt = """
+    You are a code structure analyst. Based on the provided code:
+    1. Explain the high-level architecture and structure
+    2. Break down how the different components interact
+    3. Identify the core design patterns or approaches used
+    4. Explain the data flow through the code
+    
+    Focus on structure rather than implementation details.
+    """
+    
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"Please analyze the structure of this {programming_language} code:\n\n{user_code}"}
+    ]
+
+def learning_path_messages(user_code: str, programming_language: str) -> list:
+    """Build the prompt for the personalized learning path."""
+    system_prompt = """
+    You are an educational coding mentor. Based on the user's code:
+    1. Identify the user's current skill level (beginner, intermediate, advanced)
+    2. Recommend 3-4 specific concepts or skills they should learn next
+    3. Suggest resources (documentation, tutorials) for each concept
+    4. Provide a small practice exercise for each concept
+    5. Be encouraging and supportive in your tone
+    """
+    
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"Based on this {programming_language} code, create a personalized learning path:\n\n{user_code}"}
+    ]
+
+def practice_messages(user_code: str, programming_language: str) -> list:
+    """Build the prompt for the practice problems."""
+    system_prompt = """
+    You are a programming educator. Based on the user's code skill level:
+    1. Create 3 progressively challenging practice problems
+    2. Each problem should build on skills demonstrated in their code
+    3. Provide clear problem statements with expected inputs/outputs
+    4. Include a hint for each problem (without giving away the solution)
+    5. Format these as numbered problems with clear sections
+    """
+    
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"Based on this {programming_language} code, create practice problems:\n\n{user_code}"}
+    ]
+
+def render_code_review(code_review: dict) -> None:
+    """Render the structured code review results."""
+    if 'overall_rating' in code_review and code_review['overall_rating'] != "N/A" and code_review['overall_rating'] != "Review failed":
+        # Try to convert to numeric if possible
+        try:
+            rating = float(code_review['overall_rating'])
+            st.markdown(f"""
+            #### Overall Rating: <div class="step-badge">{rating}/10</div>
+            """, unsafe_allow_html=True)
+        except:
+            st.markdown(f"""
+            #### Overall Rating: <div class="step-badge">{code_review['overall_rating']}</div>
+            """, unsafe_allow_html=True)
+    
+    if 'strengths' in code_review and isinstance(code_review['strengths'], list):
+        st.markdown("#### Strengths")
+        for strength in code_review['strengths']:
+            st.markdown(f"- {strength}")
+    
+    if 'improvements' in code_review and isinstance(code_review['improvements'], list):
+        st.markdown("#### Improvements")
+        for improvement in code_review['improvements']:
+            st.markdown(f"- {improvement}")
+    
+    if 'optimizations' in code_review and isinstance(code_review['optimizations'], list):
+        st.markdown("#### Optimizations")
+        for optimization in code_review['optimizations']:
+            st.markdown(f"- {optimization}")
+    
+    if 'potential_issues' in code_review and isinstance(code_review['potential_issues'], list):
+        st.markdown("#### Potential Issues")
+        for issue in code_review['potential_issues']:
+            st.markdown(f"- {issue}")
+    
+    if 'review' in code_review and not isinstance(code_review.get('strengths'), list):
+        st.markdown("#### Detailed Review")
+        st.markdown(f"""<div class="feedback-card">{code_review['review']}</div>""", unsafe_allow_html=True)
+
+def render_complexity(complexity: dict) -> None:
+    """Render the time/space complexity analysis."""
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"""
+        #### Time Complexity
+        <div class="step-badge">{complexity['time_complexity']}</div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        #### Space Complexity
+        <div class="step-badge">{complexity['space_complexity']}</div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown("#### Explanation")
+    st.markdown(f"""<div class="feedback-card">{complexity['explanation']}</div>""", unsafe_allow_html=True)
+
+def render_skills_analysis(db, skills_analysis: dict) -> None:
+    """Render the skills detected in the user's code, with an option to save them."""
+    if skills_analysis and 'skills' in skills_analysis:
+        st.markdown("### Skills Analysis")
+        
+        skills_data = skills_analysis['skills']
+        strengths = []
+        weaknesses = []
+        
+        for skill, score in skills_data.items():
+            if score > 0.6:
+                strengths.append((skill, score))
+            elif score < 0.4:
+                weaknesses.append((skill, score))
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("#### Strengths")
+            for skill, score in sorted(strengths, key=lambda x: x[1], reverse=True):
+                st.markdown(f"""
+                <div class="skill-badge">{skill}: {score:.2f}</div>
+                """, unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown("#### Areas for Improvement")
+            for skill, score in sorted(weaknesses, key=lambda x: x[1]):
+                st.markdown(f"""
+                <div class="weak-badge">{skill}: {score:.2f}</div>
+                """, unsafe_allow_html=True)
+        
+        # Option to save to profile
+        if st.button("Save Skills to Profile"):
+            try:
+                db.save_user_skill_scores(st.session_state.user_id, skills_data)
+                st.success("Skills saved to your profile!")
+            except Exception as e:
+                st.error(f"Error saving skills: {str(e)}")
\ No newline at end of file
@@ -3,7 +3,7 @@ import streamlit as st
 import re
 from typing import Callable
 
-from praxis.utils.visualization import render_mermaid
+from utils.visualization import render_mermaid, render_stream
 
 def render_solution_page(db, assistant, reset_app: Callable, go_to_page: Callable) -> None:
     """
@@ -60,17 +60,17 @@ def render_solution_page(db, assistant, reset_app: Callable, go_to_page: Callabl
             if solution_result and solution_result[0]:
                 st.session_state.solution = solution_result[0]
             else:
-                with st.spinner("Generating solution..."):
-                    # Generate solution
-                    solution = assistant.generate_code(st.session_state.enhanced_prompt)
-                    st.session_state.solution = solution
-                    
-                    # Store solution in database
-                    db.update_challenge_solution(st.session_state.challenge_id, solution)
-        else:
-            with st.spinner("Generating solution..."):
-                solution = assistant.generate_code(st.session_state.enhanced_prompt)
+                # Stream the solution so the first tokens appear right away
+                raw_solution = render_stream(assistant.stream_code(st.session_state.enhanced_prompt), clear_on_finish=True)
+                solution = assistant._extract_code(raw_solution)
                 st.session_state.solution = solution
+                
+                # Store solution in database
+                db.update_challenge_solution(st.session_state.challenge_id, solution)
+        else:
+            raw_solution = render_stream(assistant.stream_code(st.session_state.enhanced_prompt), clear_on_finish=True)
+            solution = assistant._extract_code(raw_solution)
+            st.session_state.solution = solution
     
     st.code(st.session_state.solution, language=lang)
     
@@ -95,7 +95,7 @@ def render_solution_page(db, assistant, reset_app: Callable, go_to_page: Callabl
                     {"role": "user", "content": f"Problem: {st.session_state.enhanced_prompt}\n\nSolution Code:\n{st.session_state.solution}\n\nPlease explain this solution."}
                 ]
                 
-                response = assistant._send_request(assistant.mixtral, messages, temperature=0.3, max_tokens=2000)
+                response = assistant._send_request(assistant.mixtral, messages, temperature=0.3, max_tokens=2000, operation="solution_explanation")
                 
                 if 'choices' in response and len(response['choices']) > 0:
                     explanation = response['choices'][0]['message']['content']
@@ -158,7 +158,7 @@ def render_solution_page(db, assistant, reset_app: Callable, go_to_page: Callabl
                         {"role": "user", "content": f"Problem: {st.session_state.enhanced_prompt}\n\nSolution Code:\n{st.session_state.solution}\n\nWhat are the key learning points from this exercise?"}
                     ]
                     
-                    response = assistant._send_request(assistant.mixtral, messages, temperature=0.3, max_tokens=2000)
+                    response = assistant._send_request(assistant.mixtral, messages, temperature=0.3, max_tokens=2000, operation="learning_summary")
                     
                     if 'choices' in response and len(response['choices']) > 0:
                         learning_points = response['choices'][0]['message']['content']
@@ -189,7 +189,7 @@ def render_solution_page(db, assistant, reset_app: Callable, go_to_page: Callabl
                         {"role": "user", "content": f"Problem: {st.session_state.enhanced_prompt}\n\nSolution Code:\n{st.session_state.solution}\n\nWhat should I learn or practice next?"}
                     ]
                     
-                    response = assistant._send_request(assistant.mixtral, messages, temperature=0.4, max_tokens=2000)
+                    response = assistant._send_request(assistant.mixtral, messages, temperature=0.4, max_tokens=2000, operation="next_steps")
                     
                     if 'choices' in response and len(response['choices']) > 0:
                         next_steps = response['choices'][0]['message']['content']
@@ -234,7 +234,7 @@ def render_solution_page(db, assistant, reset_app: Callable, go_to_page: Callabl
                         {"role": "user", "content": f"Problem: {st.session_state.enhanced_prompt}\n\nUser Solution:\n{st.session_state.user_code}\n\nModel Solution:\n{st.session_state.solution}\n\nPlease compare these solutions."}
                     ]
                     
-                    response = assistant._send_request(assistant.mixtral, messages, temperature=0.3, max_tokens=2000)
+                    response = assistant._send_request(assistant.mixtral, messages, temperature=0.3, max_tokens=2000, operation="solution_comparison")
                     
                     if 'choices' in response and len(response['choices']) > 0:
                         comparison = response['choices'][0]['message']['content']
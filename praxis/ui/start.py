@@ -2,6 +2,8 @@
 import streamlit as st
 from typing import Callable
 
+from utils.visualization import render_stream
+
 def render_start_page(db, assistant, go_to_page: Callable) -> None:
     """
     Render the start page for beginning a new coding challenge.
@@ -45,8 +47,11 @@ def render_start_page(db, assistant, go_to_page: Callable) -> None:
                 # Enhance the prompt
                 enhanced_prompt = assistant.enhance_prompt(full_desc)
                 
-                # Generate challenge
-                challenge = assistant.generate_learning_challenge(enhanced_prompt)
+                # Generate challenge, streaming it so the student can start reading right away
+                challenge = render_stream(
+                    assistant.stream_learning_challenge(enhanced_prompt),
+                    template='<div class="challenge-card">\n\n{}\n\n</div>'
+                )
                 
                 # If user is logged in, store the challenge in the database
                 if st.session_state.user_id:
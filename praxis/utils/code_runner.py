@@ -0,0 +1,203 @@
+# praxis/utils/code_runner.py
+import os
+import ast
+import sys
+import json
+import math
+import time
+import signal
+import secrets
+import tempfile
+import subprocess
+from typing import Dict, List, Any, Optional
+
+from config import (
+    TEST_TIMEOUT_SECONDS, TEST_CPU_LIMIT_SECONDS, TEST_MEMORY_LIMIT_MB, TEST_SANDBOX_UID, TEST_SANDBOX_GID
+)
+from utils.sandbox_harness import RESULT_MARKER, entry_point_candidates
+
+HARNESS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sandbox_harness.py")
+
+class SandboxUnavailable(Exception):
+    """Raised when the host cannot isolate user code, so it must not be executed."""
+
+def harness_command(cpu_seconds: int, timeout: float, worker_cpu_seconds: int, memory_mb: int,
+                    serve: bool = False) -> List[str]:
+    """
+    Command line that starts the sandbox harness.
+
+    Limits are passed as arguments and applied by the harness itself, since
+    preexec_fn is not safe in the multithreaded app process.
+    """
+    command = [sys.executable, "-I", HARNESS_PATH,
+               "--cpu-seconds", str(cpu_seconds), "--timeout", str(timeout),
+               "--worker-cpu-seconds", str(worker_cpu_seconds), "--memory-mb", str(memory_mb),
+               "--uid", str(TEST_SANDBOX_UID), "--gid", str(TEST_SANDBOX_GID)]
+    if serve:
+        command.append("--serve")
+    return command
+
+def outputs_match(actual: Any, expected: Any) -> bool:
+    """Compare an actual output with the expected one, tolerating float error and stringified expectations."""
+    if actual == expected:
+        return True
+    if isinstance(actual, (int, float)) and isinstance(expected, (int, float)) \
+            and not isinstance(actual, bool) and not isinstance(expected, bool):
+        return math.isclose(actual, expected, rel_tol=1e-9, abs_tol=1e-9)
+    if isinstance(actual, list) and isinstance(expected, list):
+        return len(actual) == len(expected) and all(outputs_match(a, e) for a, e in zip(actual, expected))
+    if isinstance(actual, dict) and isinstance(expected, dict):
+        return actual.keys() == expected.keys() and all(outputs_match(actual[k], expected[k]) for k in actual)
+    # LLM-generated cases often give the expected value as a string
+    if isinstance(expected, str) and not isinstance(actual, str):
+        return str(actual) == expected or json.dumps(actual) == expected
+    return False
+
+class LanguageRunner:
+    """Base class for executing user code against test cases in one language."""
+
+    def run_case(self, code: str, case: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the code against a single test case.
+
+        Returns:
+            Dictionary with either "output" (plus "time_ms") or "error"
+        """
+        raise NotImplementedError
+
+    def run_cases(self, code: str, cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run the code against every case (sequentially by default), recording wall time."""
+        outcomes = []
+        for case in cases:
+            start = time.perf_counter()
+            outcome = self.run_case(code, case)
+            outcome.setdefault("wall_time_ms", (time.perf_counter() - start) * 1000)
+            outcomes.append(outcome)
+        return outcomes
+
+class PythonRunner(LanguageRunner):
+    """Runs Python code through a one-off sandbox harness process with resource limits."""
+
+    def __init__(self, timeout: float = TEST_TIMEOUT_SECONDS, cpu_seconds: int = TEST_CPU_LIMIT_SECONDS,
+                 memory_mb: int = TEST_MEMORY_LIMIT_MB):
+        """Initialize the runner with per-case limits."""
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+
+    def run_case(self, code: str, case: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the code against a single test case in a fresh sandbox harness."""
+        nonce = secrets.token_hex(16)
+        job = json.dumps({"code": code, "case": case, "nonce": nonce})
+        with tempfile.TemporaryDirectory(prefix="praxis_sandbox_") as workdir:
+            process = subprocess.Popen(
+                harness_command(self.cpu_seconds, self.timeout, self.cpu_seconds, self.memory_mb),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                cwd=workdir,
+                env={"PATH": os.environ.get("PATH", ""), "PYTHONHASHSEED": "0"},
+                start_new_session=True
+            )
+            try:
+                stdout, stderr = process.communicate(job, timeout=self.timeout + 1)
+            except subprocess.TimeoutExpired:
+                # Kill the harness together with the child running the user code
+                os.killpg(process.pid, signal.SIGKILL)
+                process.communicate()
+                return {"error": f"Timed out after {self.timeout:.1f}s"}
+
+        marker = RESULT_MARKER + nonce
+        if marker not in stdout:
+            stderr = stderr.strip().splitlines()
+            reason = stderr[-1] if stderr else f"exit code {process.returncode}"
+            return {"error": f"Execution failed: {reason}"}
+
+        return json.loads(stdout.split(marker, 1)[1])
+
+class PooledPythonRunner(LanguageRunner):
+    """Runs Python test cases in parallel on the shared pool of warm sandbox workers."""
+
+    def run_case(self, code: str, case: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a single case on the pool."""
+        return self.run_cases(code, [case])[0]
+
+    def run_cases(self, code: str, cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run all cases of an attempt in parallel on the pool."""
+        # Imported lazily: the pool module depends on this one
+        from utils.sandbox_pool import get_sandbox_pool
+        return get_sandbox_pool().run_cases(code, cases)
+
+# Registry of supported languages; other languages can be plugged in with register_runner
+_RUNNERS: Dict[str, LanguageRunner] = {
+    "python": PooledPythonRunner()
+}
+
+def register_runner(lang: str, runner: LanguageRunner) -> None:
+    """Register an executor for a programming language."""
+    _RUNNERS[lang.lower()] = runner
+
+def get_runner(lang: str) -> Optional[LanguageRunner]:
+    """Get the executor for a programming language, if one is registered."""
+    return _RUNNERS.get(lang.lower())
+
+def entry_points(code: str, lang: str) -> List[Optional[str]]:
+    """
+    Functions of the code that test cases may call, most likely first.
+
+    [None] means the runner picks the function itself (other languages, or code
+    that does not parse).
+    """
+    if lang.lower() == "python":
+        try:
+            return entry_point_candidates(ast.parse(code)) or [None]
+        except SyntaxError:
+            pass
+    return [None]
+
+def run_test_cases(code: str, test_cases: List[Dict[str, Any]], lang: str,
+                   runner: Optional[LanguageRunner] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Execute the user's code against each test case.
+
+    Args:
+        code: User's code
+        test_cases: List of test cases with inputs and expected outputs
+        lang: Programming language
+        runner: Optional executor to use instead of the registered one
+
+    Returns:
+        Dictionary mapping test case IDs to results with keys:
+        passed, output, expected_output, error, time_ms, wall_time_ms, description
+
+    Raises:
+        SandboxUnavailable: If the code could not be run in isolation
+    """
+    runner = runner or get_runner(lang)
+    if runner is None:
+        raise ValueError(f"No test runner registered for language: {lang}")
+
+    # Only what the code needs goes into the sandbox; outputs are compared here
+    sandbox_cases = [{key: case[key] for key in ("inputs", "function") if key in case} for case in test_cases]
+    outcomes = runner.run_cases(code, sandbox_cases)
+    for outcome in outcomes:
+        if outcome.get("sandbox_unavailable"):
+            raise SandboxUnavailable(outcome["error"])
+    return {
+        f"test_{i+1}": build_result(test_case, outcome)
+        for i, (test_case, outcome) in enumerate(zip(test_cases, outcomes))
+    }
+
+def build_result(test_case: Dict[str, Any], outcome: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine a test case with its raw execution outcome."""
+    error = outcome.get("error")
+    return {
+        "passed": error is None and outputs_match(outcome.get("output"), test_case.get("expected_output")),
+        "output": outcome.get("output"),
+        "expected_output": test_case.get("expected_output"),
+        "error": error,
+        "time_ms": outcome.get("time_ms"),
+        "wall_time_ms": outcome.get("wall_time_ms"),
+        "description": test_case.get("description", "")
+    }
@@ -0,0 +1,134 @@
+# praxis/utils/job_queue.py
+import os
+import uuid
+import socket
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from config import DB_PATH, JOB_WORKERS
+from database.db_manager import Database
+
+class JobContext:
+    """Handle passed to a running job for database access and progress reporting."""
+
+    def __init__(self, job_id: str, db: Database):
+        """Initialize for one job with the worker's own database connection."""
+        self.job_id = job_id
+        self.db = db
+        self.progress: List[Any] = []
+        self._lock = threading.Lock()
+
+    def report(self, item: Any) -> None:
+        """Append a JSON-serialisable progress item and persist it for pages polling the job."""
+        with self._lock:
+            self.progress.append(item)
+            self.db.update_job(self.job_id, progress=self.progress)
+
+class JobQueue:
+    """
+    Local background worker for long-running jobs such as learning path generation.
+
+    Jobs run on a thread pool, since they mostly wait on the LLM API. Their status,
+    progress and result are persisted in the jobs table, so any page (or rerun) can poll
+    them without holding the browser on a spinner. Handlers are plain functions and
+    are not persisted: a job that was queued or running when its process stopped is
+    marked failed when the next queue starts. Each job records the queue that owns it,
+    so jobs of queues still running in other processes are left alone.
+    """
+
+    def __init__(self, max_workers: int = JOB_WORKERS, db_path: str = DB_PATH):
+        """Start the worker pool and fail jobs left over from a previous process."""
+        self.db_path = db_path
+        self.owner = f"{socket.gethostname()}:{_boot_id()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="praxis-job")
+        db = Database(db_path)
+        try:
+            stale = [owner for owner in db.get_unfinished_job_owners() if _owner_stopped(owner)]
+            if stale:
+                db.fail_unfinished_jobs("Interrupted by a server restart", stale)
+        finally:
+            db.close()
+
+    def submit(self, user_id: Optional[str], kind: str, handler: Callable[..., Any],
+               params: Dict[str, Any], *args: Any) -> str:
+        """
+        Queue a job and return its ID immediately.
+
+        Args:
+            user_id: Owner of the job
+            kind: Job type, used to find a user's jobs of one kind
+            handler: Function called as handler(context, params, *args) on a worker thread
+            params: JSON-serialisable job parameters, stored with the job
+            args: Extra runtime arguments that must not be persisted (e.g. API keys)
+
+        Returns:
+            The job ID
+        """
+        db = Database(self.db_path)
+        try:
+            job_id = db.create_job(user_id, kind, params, self.owner)
+        finally:
+            db.close()
+        self.executor.submit(self._run, job_id, handler, params, args)
+        return job_id
+
+    def _run(self, job_id: str, handler: Callable[..., Any], params: Dict[str, Any], args: tuple) -> None:
+        """Run one job on a worker thread, recording its outcome."""
+        db = Database(self.db_path)
+        try:
+            db.update_job(job_id, status='running')
+            result = handler(JobContext(job_id, db), params, *args)
+            db.update_job(job_id, status='completed', result=result)
+        except Exception as e:
+            traceback.print_exc()
+            db.update_job(job_id, status='failed', error=str(e))
+        finally:
+            db.close()
+
+def _boot_id() -> str:
+    """This machine's boot ID, which changes on every reboot (empty where unavailable)."""
+    try:
+        with open("/proc/sys/kernel/random/boot_id") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+def _owner_stopped(owner: Optional[str]) -> bool:
+    """
+    Whether the job queue that owns a job is known to have stopped.
+
+    Owners are "host:boot_id:pid:token". Only owners on this host can be checked: they
+    stopped if the machine rebooted since or their process no longer exists. Jobs
+    recorded without an owner predate owners and are treated as stopped.
+    """
+    if owner is None:
+        return True
+    host, boot_id, pid, _ = owner.rsplit(":", 3)
+    if host != socket.gethostname():
+        return False
+    if boot_id != _boot_id():
+        return True
+    if int(pid) == os.getpid():
+        # An earlier queue of a restarted process that was given the same PID (e.g. in a container)
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass
+    return False
+
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+def get_job_queue() -> JobQueue:
+    """Return the process-wide background job queue, starting it on first use."""
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                _job_queue = JobQueue()
+    return _job_queue
@@ -0,0 +1,192 @@
+# praxis/utils/llm_metrics.py
+import time
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional, Tuple
+
+from config import LLM_METRICS_RECENT_CALLS, LLM_METRICS_PORT
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class LLMMetrics:
+    """In-process registry of per-operation LLM call latency, token usage and cache hits."""
+
+    def __init__(self, recent_calls: int = LLM_METRICS_RECENT_CALLS):
+        """Initialize empty aggregates and a ring buffer of recent calls."""
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.recent: "deque[Dict[str, Any]]" = deque(maxlen=recent_calls)
+        self.started_at = time.time()
+
+    def _new_series(self) -> Dict[str, Any]:
+        return {
+            "calls": 0,
+            "errors": 0,
+            "cache_hits": 0,
+            "coalesced": 0,
+            "streamed": 0,
+            "retries": 0,
+            "wall_seconds": 0.0,
+            "ttfb_seconds": 0.0,
+            "ttfb_count": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "buckets": [0] * len(LATENCY_BUCKETS)
+        }
+
+    def record(self, operation: str, model: str, wall_ms: float, ttfb_ms: Optional[float] = None,
+               prompt_tokens: int = 0, completion_tokens: int = 0, cache_hit: bool = False,
+               retries: int = 0, error: Optional[str] = None, stream: bool = False,
+               coalesced: bool = False) -> None:
+        """Record one LLM call; coalesced calls shared another caller's request and used no tokens."""
+        wall_seconds = wall_ms / 1000
+        with self._lock:
+            series = self._series.get((operation, model))
+            if series is None:
+                series = self._series[(operation, model)] = self._new_series()
+            series["calls"] += 1
+            series["errors"] += int(error is not None)
+            series["cache_hits"] += int(cache_hit)
+            series["coalesced"] += int(coalesced)
+            series["streamed"] += int(stream)
+            series["retries"] += retries
+            series["wall_seconds"] += wall_seconds
+            if ttfb_ms is not None:
+                series["ttfb_seconds"] += ttfb_ms / 1000
+                series["ttfb_count"] += 1
+            series["prompt_tokens"] += prompt_tokens or 0
+            series["completion_tokens"] += completion_tokens or 0
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if wall_seconds <= bound:
+                    series["buckets"][i] += 1
+
+            self.recent.append({
+                "time": time.time(),
+                "operation": operation,
+                "model": model,
+                "wall_ms": wall_ms,
+                "ttfb_ms": ttfb_ms,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "cache_hit": cache_hit,
+                "coalesced": coalesced,
+                "retries": retries,
+                "stream": stream,
+                "error": error
+            })
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Per-operation aggregates, most token-hungry first."""
+        with self._lock:
+            rows = []
+            for (operation, model), series in self._series.items():
+                calls = series["calls"]
+                rows.append({
+                    "operation": operation,
+                    "model": model,
+                    "calls": calls,
+                    "errors": series["errors"],
+                    "cache_hits": series["cache_hits"],
+                    "coalesced": series["coalesced"],
+                    "streamed": series["streamed"],
+                    "retries": series["retries"],
+                    "avg_wall_ms": series["wall_seconds"] * 1000 / calls if calls else 0.0,
+                    "avg_ttfb_ms": (series["ttfb_seconds"] * 1000 / series["ttfb_count"]
+                                    if series["ttfb_count"] else None),
+                    "total_wall_s": series["wall_seconds"],
+                    "prompt_tokens": series["prompt_tokens"],
+                    "completion_tokens": series["completion_tokens"],
+                    "total_tokens": series["prompt_tokens"] + series["completion_tokens"]
+                })
+        return sorted(rows, key=lambda row: row["total_tokens"], reverse=True)
+
+    def recent_calls(self) -> List[Dict[str, Any]]:
+        """The most recent calls, newest first."""
+        with self._lock:
+            return list(reversed(self.recent))
+
+    def reset(self) -> None:
+        """Clear all recorded metrics."""
+        with self._lock:
+            self._series.clear()
+            self.recent.clear()
+            self.started_at = time.time()
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        counters = [
+            ("praxis_llm_calls_total", "LLM calls", "calls"),
+            ("praxis_llm_errors_total", "LLM calls that failed", "errors"),
+            ("praxis_llm_cache_hits_total", "LLM calls served from the response cache", "cache_hits"),
+            ("praxis_llm_coalesced_total", "LLM calls that shared an identical in-flight request", "coalesced"),
+            ("praxis_llm_retries_total", "Retried LLM requests", "retries"),
+            ("praxis_llm_prompt_tokens_total", "Prompt tokens used", "prompt_tokens"),
+            ("praxis_llm_completion_tokens_total", "Completion tokens used", "completion_tokens")
+        ]
+        with self._lock:
+            series = sorted(self._series.items())
+            lines = []
+            for name, help_text, field in counters:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for (operation, model), values in series:
+                    lines.append(f'{name}{{operation="{operation}",model="{model}"}} {values[field]}')
+
+            name = "praxis_llm_request_duration_seconds"
+            lines.append(f"# HELP {name} LLM call wall time")
+            lines.append(f"# TYPE {name} histogram")
+            for (operation, model), values in series:
+                labels = f'operation="{operation}",model="{model}"'
+                for bound, count in zip(LATENCY_BUCKETS, values["buckets"]):
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {values["calls"]}')
+                lines.append(f'{name}_sum{{{labels}}} {values["wall_seconds"]}')
+                lines.append(f'{name}_count{{{labels}}} {values["calls"]}')
+
+            name = "praxis_llm_ttfb_seconds"
+            lines.append(f"# HELP {name} LLM time to first byte")
+            lines.append(f"# TYPE {name} summary")
+            for (operation, model), values in series:
+                labels = f'operation="{operation}",model="{model}"'
+                lines.append(f'{name}_sum{{{labels}}} {values["ttfb_seconds"]}')
+                lines.append(f'{name}_count{{{labels}}} {values["ttfb_count"]}')
+        return "\n".join(lines) + "\n"
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves GET /metrics for Prometheus scrapes."""
+
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = get_llm_metrics().to_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+def start_metrics_server(port: int) -> ThreadingHTTPServer:
+    """Expose /metrics on the given port from a background thread."""
+    server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="llm-metrics").start()
+    return server
+
+_llm_metrics: Optional[LLMMetrics] = None
+_llm_metrics_lock = threading.Lock()
+
+def get_llm_metrics() -> LLMMetrics:
+    """Return the process-wide LLM metrics registry, starting the /metrics endpoint if configured."""
+    global _llm_metrics
+    if _llm_metrics is None:
+        with _llm_metrics_lock:
+            if _llm_metrics is None:
+                _llm_metrics = LLMMetrics()
+                if LLM_METRICS_PORT:
+                    start_metrics_server(LLM_METRICS_PORT)
+    return _llm_metrics
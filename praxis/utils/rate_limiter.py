@@ -0,0 +1,209 @@
+# praxis/utils/rate_limiter.py
+import re
+import time
+import random
+import threading
+import datetime
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Mapping, Optional
+
+from config import (
+    GROQ_REQUESTS_PER_MINUTE, GROQ_TOKENS_PER_MINUTE, GROQ_RATE_LIMIT_MAX_WAIT,
+    GROQ_BACKOFF_BASE, GROQ_BACKOFF_MAX, GROQ_RATE_LIMITER_MAX_KEYS
+)
+
+class RateLimitExceeded(Exception):
+    """Raised when a request cannot get a slot in the client-side budget in time."""
+
+def estimate_tokens(messages: List[Dict[str, str]]) -> int:
+    """Rough prompt size in tokens (about four characters per token)."""
+    return sum(len(message.get('content') or '') for message in messages) // 4 + 4 * len(messages)
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse a rate-limit reset value such as "1.5", "7.66s", "2m59.56s" or "250ms" into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = re.findall(r'(\d+(?:\.\d+)?)(ms|h|m|s)', value)
+    if not parts:
+        return None
+    scale = {'h': 3600, 'm': 60, 's': 1, 'ms': 0.001}
+    return sum(float(number) * scale[unit] for number, unit in parts)
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds the server asked us to wait, from Retry-After or the rate-limit reset headers."""
+    retry_after = headers.get('Retry-After')
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(retry_after)
+                return max(0.0, (when - datetime.datetime.now(when.tzinfo)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    resets = [parse_duration(headers.get(name))
+              for name in ('x-ratelimit-reset-tokens', 'x-ratelimit-reset-requests')]
+    resets = [reset for reset in resets if reset is not None]
+    return max(resets) if resets else None
+
+def backoff_delay(attempt: int, base: float = GROQ_BACKOFF_BASE, cap: float = GROQ_BACKOFF_MAX) -> float:
+    """Exponential backoff with full jitter for the given retry attempt (0-based)."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+class RateLimiter:
+    """
+    Client-side requests-per-minute and tokens-per-minute budget for one API key.
+
+    Both budgets are token buckets that refill continuously, so bursts are queued and
+    released at the sustainable rate instead of being rejected by the API. A limit of
+    0 disables that bucket.
+    """
+
+    def __init__(self, requests_per_minute: int = GROQ_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: int = GROQ_TOKENS_PER_MINUTE,
+                 max_wait: float = GROQ_RATE_LIMIT_MAX_WAIT):
+        """Initialize both buckets full."""
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_wait = max_wait
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        if self.requests_per_minute:
+            self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    def acquire(self, tokens: int) -> float:
+        """
+        Block until one request and the given number of tokens fit in the budget.
+
+        Args:
+            tokens: Estimated prompt tokens of the request
+
+        Returns:
+            Seconds spent waiting
+        """
+        # A request larger than the whole bucket only has to wait for a full bucket
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if self.requests_per_minute and self._requests < 1:
+                    wait = max(wait, (1 - self._requests) * 60 / self.requests_per_minute)
+                if self.tokens_per_minute and self._tokens < tokens:
+                    wait = max(wait, (tokens - self._tokens) * 60 / self.tokens_per_minute)
+                if wait <= 0:
+                    if self.requests_per_minute:
+                        self._requests -= 1
+                    if self.tokens_per_minute:
+                        self._tokens -= tokens
+                    if waited:
+                        self.throttled += 1
+                        self.wait_seconds += waited
+                    return waited
+            if waited + wait > self.max_wait:
+                raise RateLimitExceeded(
+                    f"API rate limit budget exhausted; request would wait more than {self.max_wait:g}s"
+                )
+            time.sleep(wait)
+            waited += wait
+
+    def settle(self, reserved: int, used: int) -> None:
+        """Charge the difference between the reserved estimate and the tokens actually used."""
+        if not self.tokens_per_minute or not used:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            # May go negative: later requests then wait until the overdraft is paid back
+            self._tokens -= used - min(reserved, self.tokens_per_minute)
+
+    def refund(self, tokens: int) -> None:
+        """Return a reservation for a request that failed before the API processed it."""
+        if not self.tokens_per_minute:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.tokens_per_minute, self._tokens + min(tokens, self.tokens_per_minute))
+
+    def pause(self, seconds: float) -> None:
+        """Hold every request on this key for the given time, e.g. after the API answered 429."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Lower the token budget to what the API reports as remaining."""
+        remaining = headers.get('x-ratelimit-remaining-tokens')
+        if not self.tokens_per_minute or remaining is None:
+            return
+        try:
+            remaining = float(remaining)
+        except ValueError:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, remaining)
+
+    def stats(self) -> Dict[str, float]:
+        """Return the current budget and throttling counters."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'requests_available': self._requests,
+                'tokens_available': self._tokens,
+                'throttled_requests': self.throttled,
+                'throttle_wait_seconds': self.wait_seconds
+            }
+
+# API key hash -> limiter, least recently used first
+_rate_limiters: "OrderedDict[str, RateLimiter]" = OrderedDict()
+_rate_limiters_lock = threading.Lock()
+
+def get_rate_limiter(key_id: str = "") -> RateLimiter:
+    """
+    Return the rate limiter for one API key, creating it on first use.
+
+    Every session may bring its own Groq key with its own quota, so budgets, 429
+    pauses and rate-limit headers are tracked per key. Only the most recently used
+    GROQ_RATE_LIMITER_MAX_KEYS keys are kept.
+
+    Args:
+        key_id: Hash identifying the API key (never the key itself)
+    """
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key_id)
+        if limiter is None:
+            limiter = _rate_limiters[key_id] = RateLimiter()
+            while len(_rate_limiters) > GROQ_RATE_LIMITER_MAX_KEYS:
+                _rate_limiters.popitem(last=False)
+        _rate_limiters.move_to_end(key_id)
+        return limiter
+
+def rate_limiter_stats() -> Dict[str, float]:
+    """Throttling counters summed over every API key's limiter."""
+    with _rate_limiters_lock:
+        limiters = list(_rate_limiters.values())
+    stats = [limiter.stats() for limiter in limiters]
+    return {
+        'api_keys': len(limiters),
+        'throttled_requests': sum(stat['throttled_requests'] for stat in stats),
+        'throttle_wait_seconds': sum(stat['throttle_wait_seconds'] for stat in stats)
+    }
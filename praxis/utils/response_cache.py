@@ -0,0 +1,150 @@
+# praxis/utils/response_cache.py
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional
+
+from config import (
+    LLM_CACHE_PATH, LLM_CACHE_TTL, LLM_CACHE_MEMORY_ENTRIES, LLM_CACHE_DISK_ENTRIES
+)
+
+class ResponseCache:
+    """Two-tier (in-memory LRU + SQLite) cache for LLM API responses."""
+
+    # Run disk eviction once every this many writes
+    EVICTION_INTERVAL = 100
+
+    def __init__(self, db_path: str = LLM_CACHE_PATH, ttl: int = LLM_CACHE_TTL,
+                 max_memory_entries: int = LLM_CACHE_MEMORY_ENTRIES,
+                 max_disk_entries: int = LLM_CACHE_DISK_ENTRIES):
+        """Initialize the cache tiers and create the disk table if needed."""
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        # Hit/miss counters
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('''
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            cache_key TEXT PRIMARY KEY,
+            response TEXT,
+            expires_at REAL,
+            last_access REAL
+        )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access)')
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
+        """Build a content-addressed key for a chat completion request."""
+        payload = json.dumps(
+            {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens},
+            sort_keys=True,
+            separators=(",", ":")
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Look up a cached response, checking memory first and then disk."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, response = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return response
+                del self._memory[key]
+
+            row = self.conn.execute(
+                'SELECT response, expires_at FROM llm_cache WHERE cache_key = ?', (key,)
+            ).fetchone()
+            if row and row[1] > now:
+                response = json.loads(row[0])
+                self.conn.execute('UPDATE llm_cache SET last_access = ? WHERE cache_key = ?', (now, key))
+                self.conn.commit()
+                self._remember(key, row[1], response)
+                self.disk_hits += 1
+                return response
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, response: Dict) -> None:
+        """Store a response in both cache tiers."""
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, response)
+            self.conn.execute(
+                'INSERT OR REPLACE INTO llm_cache (cache_key, response, expires_at, last_access) VALUES (?, ?, ?, ?)',
+                (key, json.dumps(response), expires_at, now)
+            )
+            self._writes += 1
+            if self._writes % self.EVICTION_INTERVAL == 0:
+                self._evict_disk(now)
+            self.conn.commit()
+
+    def clear(self) -> None:
+        """Remove every cached response from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self.conn.execute('DELETE FROM llm_cache')
+            self.conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current tier sizes."""
+        with self._lock:
+            disk_entries = self.conn.execute('SELECT COUNT(*) FROM llm_cache').fetchone()[0]
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0,
+                'memory_entries': len(self._memory),
+                'disk_entries': disk_entries
+            }
+
+    def _remember(self, key: str, expires_at: float, response: Dict) -> None:
+        """Insert into the memory tier, evicting least recently used entries."""
+        self._memory[key] = (expires_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, now: float) -> None:
+        """Drop expired disk entries and trim the table to its size limit."""
+        self.conn.execute('DELETE FROM llm_cache WHERE expires_at <= ?', (now,))
+        self.conn.execute('''
+            DELETE FROM llm_cache WHERE cache_key IN (
+                SELECT cache_key FROM llm_cache
+                ORDER BY last_access DESC
+                LIMIT -1 OFFSET ?
+            )
+        ''', (self.max_disk_entries,))
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache, creating it on first use."""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+    return _response_cache
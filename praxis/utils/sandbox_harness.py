@@ -0,0 +1,371 @@
+# praxis/utils/sandbox_harness.py
+"""
+Harness that runs user code against one test case in an isolated child process.
+
+Every job runs in a freshly forked child that is moved into new mount, network, IPC
+and PID namespaces (plus a user namespace when the app is not root). The child gets an
+empty read-only root with no /proc, no network interfaces, no file descriptors other
+than its result pipe, and no way to fork. It then runs as a dedicated uid (when started
+as root) or with every capability dropped. If any of that cannot be set up, the job
+is reported as "sandbox unavailable" instead of running unconfined.
+
+This module must only depend on the standard library: it runs with `python -I`,
+so neither the project nor site-packages are importable.
+"""
+import io
+import os
+import ast
+import sys
+import json
+import time
+import select
+import signal
+import ctypes
+import argparse
+import contextlib
+from typing import Dict, List, Any, Optional
+
+try:
+    import resource
+except ImportError:  # resource limits are POSIX-only
+    resource = None
+
+# Cap on captured stdout so chatty user code cannot flood the pipe
+MAX_STDOUT_CHARS = 2000
+
+# Marks the start of the JSON result line; the caller's per-job nonce follows it
+RESULT_MARKER = "\n__PRAXIS_RESULT__"
+
+# Standard library modules user code may import; the isolated child has no filesystem,
+# so only modules already loaded before it starts can be imported
+PRELOADED_MODULES = (
+    "array", "bisect", "cmath", "collections", "copy", "dataclasses", "datetime", "decimal",
+    "enum", "fractions", "functools", "heapq", "itertools", "math", "operator", "random",
+    "re", "statistics", "string", "typing"
+)
+
+# Linux constants for unshare(2), mount(2), prctl(2) and capset(2)
+CLONE_NEWNS = 0x00020000
+CLONE_NEWIPC = 0x08000000
+CLONE_NEWUSER = 0x10000000
+CLONE_NEWPID = 0x20000000
+CLONE_NEWNET = 0x40000000
+MS_RDONLY, MS_NOSUID, MS_NODEV, MS_NOEXEC = 1, 2, 4, 8
+MS_REC = 0x4000
+MS_PRIVATE = 0x40000
+PR_SET_PDEATHSIG = 1
+PR_SET_NO_NEW_PRIVS = 38
+LINUX_CAPABILITY_VERSION_3 = 0x20080522
+
+_libc = ctypes.CDLL(None, use_errno=True) if sys.platform.startswith("linux") else None
+
+class _CapHeader(ctypes.Structure):
+    _fields_ = [("version", ctypes.c_uint32), ("pid", ctypes.c_int)]
+
+class _CapData(ctypes.Structure):
+    _fields_ = [("effective", ctypes.c_uint32), ("permitted", ctypes.c_uint32), ("inheritable", ctypes.c_uint32)]
+
+def _check(result: int) -> None:
+    """Raise OSError for a failed libc call."""
+    if result != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+
+def apply_resource_limits(cpu_seconds: int, memory_mb: int) -> None:
+    """Apply CPU, memory and file-size limits to this process (inherited by every job)."""
+    if resource is None:
+        return
+    if cpu_seconds:
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+    if memory_mb:
+        memory_bytes = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (1024 * 1024, 1024 * 1024))
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+
+def enter_namespaces() -> None:
+    """
+    Unshare the mount, network, IPC and PID namespaces of this process.
+
+    Without root a user namespace is created as well, keeping the same uid and gid
+    inside; the capabilities that grants are dropped again in isolate(). The PID
+    namespace applies to the next child, which becomes its init.
+    """
+    if _libc is None:
+        raise OSError("namespaces are only available on Linux")
+    uid, gid = os.getuid(), os.getgid()
+    flags = CLONE_NEWNS | CLONE_NEWNET | CLONE_NEWIPC | CLONE_NEWPID
+    if uid != 0:
+        flags |= CLONE_NEWUSER
+    _check(_libc.unshare(flags))
+    if uid != 0:
+        for name, content in (("setgroups", "deny"), ("uid_map", f"{uid} {uid} 1"), ("gid_map", f"{gid} {gid} 1")):
+            with open(f"/proc/self/{name}", "w") as f:
+                f.write(content)
+
+def isolate(root: str, uid: int, gid: int) -> None:
+    """
+    Confine this process (the init of the new PID namespace) before it runs user code.
+
+    Mounts an empty read-only tmpfs over `root` and chroots into it, then drops
+    privileges: a root process switches to the sandbox uid/gid, any other process
+    drops every capability it holds in its user namespace. Finally forking is
+    disabled and the process dies with its parent (it shares the job's process
+    group too, which the harness kills once the job is done).
+    """
+    _check(_libc.mount(None, b"/", None, MS_REC | MS_PRIVATE, None))
+    _check(_libc.mount(b"none", root.encode(), b"tmpfs", MS_RDONLY | MS_NOSUID | MS_NODEV | MS_NOEXEC, None))
+    os.chroot(root)
+    os.chdir("/")
+    if os.getuid() == 0:
+        os.setgroups([])
+        os.setgid(gid)
+        os.setuid(uid)  # also clears every capability
+    else:
+        _check(_libc.capset(ctypes.byref(_CapHeader(LINUX_CAPABILITY_VERSION_3, 0)), (_CapData * 2)()))
+    _check(_libc.prctl(PR_SET_NO_NEW_PRIVS, 1, 0, 0, 0))
+    # Set after the uid change, which clears it
+    _check(_libc.prctl(PR_SET_PDEATHSIG, signal.SIGKILL, 0, 0, 0))
+    if resource is not None:
+        resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+
+def entry_point_candidates(tree: ast.Module) -> List[str]:
+    """
+    Top-level functions in the order they are tried as the function under test.
+
+    Functions no other function calls come first, so a helper such as is_prime is
+    never picked over the count_primes that uses it, wherever it is defined. A
+    main() demo, or any function without parameters, comes last. Ties go to the
+    function defined last.
+    """
+    functions = [node for node in tree.body if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]
+
+    def is_demo(node: ast.AST) -> bool:
+        return node.name == "main" or not (node.args.args or node.args.posonlyargs or node.args.vararg)
+
+    called = {
+        call.func.id
+        for node in functions if not is_demo(node)
+        for call in ast.walk(node)
+        if isinstance(call, ast.Call) and isinstance(call.func, ast.Name) and call.func.id != node.name
+    }
+    ranked = sorted(reversed(functions), key=lambda node: (is_demo(node), node.name in called))
+    return [node.name for node in ranked]
+
+def find_entry_point(tree: ast.Module) -> Optional[str]:
+    """Pick the function to call when a test case does not name one."""
+    candidates = entry_point_candidates(tree)
+    return candidates[0] if candidates else None
+
+def run_case(code: str, case: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute the user's code and call its entry point with the test case inputs."""
+    stdout = io.StringIO()
+    try:
+        tree = ast.parse(code)
+        entry_point = find_entry_point(tree)
+        if not entry_point:
+            return {"error": "No function definition found in the submitted code"}
+
+        namespace = {"__name__": "__praxis__"}
+        with contextlib.redirect_stdout(stdout):
+            exec(compile(tree, "<user_code>", "exec"), namespace)
+
+        # The case names the model solution's function; use it when this code defines it too
+        func = namespace.get(case.get("function") or entry_point)
+        if not callable(func):
+            func = namespace.get(entry_point)
+        if not callable(func):
+            return {"error": f"Function '{entry_point}' is not defined"}
+
+        inputs = case.get("inputs", [])
+        if not isinstance(inputs, list):
+            inputs = [inputs]
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(stdout):
+            output = func(*inputs)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        return {
+            "output": output,
+            "time_ms": elapsed_ms,
+            "stdout": stdout.getvalue()[:MAX_STDOUT_CHARS]
+        }
+    except BaseException as e:
+        return {
+            "error": f"{type(e).__name__}: {e}",
+            "stdout": stdout.getvalue()[:MAX_STDOUT_CHARS]
+        }
+
+def encode_result(result: Dict[str, Any]) -> str:
+    """Serialize a result, falling back to repr() for values JSON cannot express."""
+    return json.dumps(result, default=repr)
+
+def unavailable(error: OSError) -> Dict[str, Any]:
+    """Result for a job that was not run because isolation could not be set up."""
+    return {"error": f"Sandbox unavailable: {error}", "sandbox_unavailable": True}
+
+def read_result(read_fd: int, deadline: Optional[float]) -> Optional[bytes]:
+    """Read a child's whole result from a pipe; None if the deadline passes first."""
+    chunks = []
+    try:
+        while True:
+            remaining = deadline - time.monotonic() if deadline else None
+            if remaining is not None and remaining <= 0:
+                return None
+            readable, _, _ = select.select([read_fd], [], [], remaining)
+            if readable:
+                chunk = os.read(read_fd, 65536)
+                if not chunk:
+                    return b"".join(chunks)
+                chunks.append(chunk)
+    finally:
+        os.close(read_fd)
+
+def decode_result(data: bytes, status: int) -> Dict[str, Any]:
+    """Turn a child's result bytes and exit status into a result dictionary."""
+    if not data:
+        if os.WIFSIGNALED(status):
+            return {"error": f"Execution failed: killed by {signal.Signals(os.WTERMSIG(status)).name}"}
+        return {"error": f"Execution failed: exit code {os.waitstatus_to_exitcode(status)}"}
+    try:
+        return json.loads(data)
+    except ValueError:
+        return {"error": "Execution failed: malformed result"}
+
+def write_channel(fd: int, result: Dict[str, Any]) -> None:
+    """Write a result to a pipe and close it."""
+    with os.fdopen(fd, "wb") as channel:
+        channel.write(encode_result(result).encode())
+
+def run_job(code: str, case: Dict[str, Any], cpu_seconds: int, uid: int, gid: int, root: str, write_fd: int) -> None:
+    """
+    Body of the forked job process: enter the namespaces, run the case in an isolated
+    child (the PID namespace's init) and relay that child's result.
+    """
+    try:
+        enter_namespaces()
+    except OSError as e:
+        write_channel(write_fd, unavailable(e))
+        return
+
+    read_fd, inner_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(read_fd)
+            try:
+                isolate(root, uid, gid)
+            except OSError as e:
+                result = unavailable(e)
+            else:
+                if resource is not None and cpu_seconds:
+                    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+                result = run_case(code, case)
+            write_channel(inner_fd, result)
+        finally:
+            os._exit(0)
+
+    os.close(inner_fd)
+    data = read_result(read_fd, None)
+    _, status = os.waitpid(pid, 0)
+    write_channel(write_fd, decode_result(data, status))
+
+def run_forked(code: str, case: Dict[str, Any], cpu_seconds: int = 0, timeout: float = 0,
+               uid: int = 65534, gid: int = 65534) -> Dict[str, Any]:
+    """
+    Run one case in a forked, isolated child and collect its result over a private pipe.
+
+    Nothing user code changes (builtins, imported modules, this harness) outlives the
+    job. The job runs in its own process group, which is killed once the result is in
+    or the timeout passes, so nothing it started can linger.
+
+    Args:
+        code: User's code
+        case: Test case passed to run_case
+        cpu_seconds: CPU limit for the child (0 keeps the inherited limit)
+        timeout: Wall-clock limit after which the child is killed (0 for none)
+        uid: User the child runs as when the harness runs as root
+        gid: Group the child runs as when the harness runs as root
+
+    Returns:
+        The case result, with the job's peak memory in "max_rss_kb"
+    """
+    root = os.getcwd()
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.setpgid(0, 0)
+            os.close(read_fd)
+            devnull = os.open(os.devnull, os.O_RDWR)
+            for fd in (0, 1, 2):
+                os.dup2(devnull, fd)
+            # Only the result pipe stays open
+            os.closerange(3, write_fd)
+            os.closerange(write_fd + 1, os.sysconf("SC_OPEN_MAX"))
+            if _libc is not None:
+                _libc.prctl(PR_SET_PDEATHSIG, signal.SIGKILL, 0, 0, 0)
+            run_job(code, case, cpu_seconds, uid, gid, root, write_fd)
+        finally:
+            os._exit(0)
+
+    # Also set here, so the group exists even if the child has not run yet
+    with contextlib.suppress(OSError):
+        os.setpgid(pid, pid)
+    os.close(write_fd)
+    data = read_result(read_fd, time.monotonic() + timeout if timeout else None)
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(pid, signal.SIGKILL)
+    _, status, usage = os.wait4(pid, 0)
+
+    result = {"error": f"Timed out after {timeout:.1f}s"} if data is None else decode_result(data, status)
+    result["max_rss_kb"] = usage.ru_maxrss
+    return result
+
+def write_result(nonce: str, result: Dict[str, Any]) -> None:
+    """Write one result line, tagged with the nonce the caller sent with the job."""
+    sys.stdout.write(RESULT_MARKER + nonce + encode_result(result) + "\n")
+    sys.stdout.flush()
+
+def serve(cpu_seconds: int = 0, timeout: float = 0, uid: int = 65534, gid: int = 65534) -> None:
+    """
+    Warm worker loop: read one JSON job per line and answer each with one result line.
+
+    This interpreter never runs user code; every job runs in a fresh forked child, so
+    jobs from different users cannot affect each other. The job's nonce is removed
+    before forking, so user code cannot forge a result line.
+    """
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        nonce = job.pop("nonce", "")
+        write_result(nonce, run_forked(job["code"], job["case"], cpu_seconds, timeout, uid, gid))
+
+def main() -> None:
+    """Read one {"code", "case", "nonce"} job from stdin and write its result to stdout."""
+    parser = argparse.ArgumentParser(description="Run user code against test cases")
+    parser.add_argument("--serve", action="store_true", help="Answer one job per stdin line")
+    parser.add_argument("--cpu-seconds", type=int, default=0, help="CPU limit per job")
+    parser.add_argument("--timeout", type=float, default=0, help="Wall-clock limit per job")
+    parser.add_argument("--worker-cpu-seconds", type=int, default=0, help="CPU limit for this process")
+    parser.add_argument("--memory-mb", type=int, default=0, help="Address space limit for this process and its jobs")
+    parser.add_argument("--uid", type=int, default=65534, help="User jobs run as when started as root")
+    parser.add_argument("--gid", type=int, default=65534, help="Group jobs run as when started as root")
+    args = parser.parse_args()
+
+    apply_resource_limits(args.worker_cpu_seconds, args.memory_mb)
+    for module in PRELOADED_MODULES:
+        __import__(module)
+
+    if args.serve:
+        serve(args.cpu_seconds, args.timeout, args.uid, args.gid)
+        return
+
+    job = json.loads(sys.stdin.read())
+    nonce = job.pop("nonce", "")
+    write_result(nonce, run_forked(job["code"], job["case"], args.cpu_seconds, args.timeout, args.uid, args.gid))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+# praxis/utils/sandbox_pool.py
+import os
+import json
+import time
+import queue
+import atexit
+import select
+import signal
+import secrets
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import Future
+from typing import Dict, List, Any, Optional
+
+from config import (
+    TEST_TIMEOUT_SECONDS, TEST_CPU_LIMIT_SECONDS, TEST_MEMORY_LIMIT_MB,
+    TEST_POOL_SIZE, TEST_WORKER_MAX_JOBS
+)
+from utils.code_runner import harness_command
+from utils.sandbox_harness import RESULT_MARKER
+
+# Extra wait before the pool kills a worker whose own per-job timeout did not fire
+KILL_GRACE_SECONDS = 1.0
+
+class SandboxWorker:
+    """
+    A long-lived, resource-limited harness process that runs test cases on demand.
+
+    The warm interpreter forks a fresh, isolated child for every job (see
+    utils.sandbox_harness), so user code never runs in the long-lived process itself.
+    """
+
+    def __init__(self, cpu_seconds: int, memory_mb: int, job_cpu_seconds: int, job_timeout: float):
+        """Start the worker process in serve mode, in its own process group."""
+        self.workdir = tempfile.TemporaryDirectory(prefix="praxis_worker_")
+        self.process = subprocess.Popen(
+            harness_command(job_cpu_seconds, job_timeout, cpu_seconds, memory_mb, serve=True),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=self.workdir.name,
+            env={"PATH": os.environ.get("PATH", ""), "PYTHONHASHSEED": "0"},
+            start_new_session=True
+        )
+        self.jobs_done = 0
+        # Largest peak memory of a single job, for sizing TEST_MEMORY_LIMIT_MB
+        self.peak_job_rss_kb = 0
+        self._buffer = b""
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def execute(self, code: str, case: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send one job to the worker and wait for its result, recording wall time."""
+        start = time.perf_counter()
+        outcome = self._execute(code, case, timeout)
+        outcome["wall_time_ms"] = (time.perf_counter() - start) * 1000
+        return outcome
+
+    def _execute(self, code: str, case: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send one job to the worker and wait for the result line carrying this job's nonce."""
+        nonce = secrets.token_hex(16)
+        try:
+            self.process.stdin.write((json.dumps({"code": code, "case": case, "nonce": nonce}) + "\n").encode())
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError):
+            return {"error": "Execution failed: sandbox worker exited"}
+
+        deadline = time.monotonic() + timeout
+        marker = (RESULT_MARKER.strip() + nonce).encode()
+        fd = self.process.stdout.fileno()
+        while True:
+            # Consume complete lines; only the one tagged with this job's nonce is a result
+            while b"\n" in self._buffer:
+                line, self._buffer = self._buffer.split(b"\n", 1)
+                if line.startswith(marker):
+                    self.jobs_done += 1
+                    result = json.loads(line[len(marker):])
+                    self.peak_job_rss_kb = max(self.peak_job_rss_kb, result.pop("max_rss_kb", 0))
+                    return result
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.kill()
+                return {"error": f"Timed out after {timeout:.1f}s"}
+
+            readable, _, _ = select.select([fd], [], [], remaining)
+            if readable:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    self.kill()
+                    return {"error": f"Execution failed: exit code {self.process.wait()}"}
+                self._buffer += chunk
+
+    def kill(self) -> None:
+        """Terminate the worker process and any job child, and clean up its working directory."""
+        # Also reaches a job child left behind if the worker itself already exited
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        self.workdir.cleanup()
+
+class SandboxPool:
+    """Pre-forked pool of warm sandbox workers that runs test cases in parallel."""
+
+    def __init__(self, size: int = TEST_POOL_SIZE, timeout: float = TEST_TIMEOUT_SECONDS,
+                 cpu_seconds: int = TEST_CPU_LIMIT_SECONDS, memory_mb: int = TEST_MEMORY_LIMIT_MB,
+                 max_jobs_per_worker: int = TEST_WORKER_MAX_JOBS):
+        """Start `size` workers, each served by its own dispatcher thread."""
+        self.size = size
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.cpu_seconds = cpu_seconds
+        # RLIMIT_CPU is cumulative over a process lifetime, so the warm parent gets the
+        # per-case budget for every job it may run; each forked job gets cpu_seconds.
+        self.worker_cpu_seconds = cpu_seconds * max_jobs_per_worker
+
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.started_at = time.monotonic()
+        self.recycled = 0
+
+        self._slots = []
+        for slot_id in range(size):
+            slot = {
+                "slot_id": slot_id,
+                "worker": self._spawn(),
+                "busy": False,
+                "busy_seconds": 0.0,
+                "jobs_done": 0
+            }
+            self._slots.append(slot)
+
+        self._threads = []
+        for slot in self._slots:
+            thread = threading.Thread(target=self._dispatch, args=(slot,), daemon=True,
+                                      name=f"sandbox-dispatch-{slot['slot_id']}")
+            thread.start()
+            self._threads.append(thread)
+
+    def _spawn(self) -> SandboxWorker:
+        return SandboxWorker(self.worker_cpu_seconds, self.memory_mb, self.cpu_seconds, self.timeout)
+
+    def _dispatch(self, slot: Dict[str, Any]) -> None:
+        """Dispatcher loop: feed queued jobs to this slot's worker, recycling it as needed."""
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            code, case, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            started = time.monotonic()
+            with self._lock:
+                slot["busy"] = True
+            try:
+                worker = slot["worker"]
+                if not worker.is_alive():
+                    worker = self._replace(slot)
+                outcome = worker.execute(code, case, self.timeout + KILL_GRACE_SECONDS)
+                future.set_result(outcome)
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    slot["busy"] = False
+                    slot["busy_seconds"] += time.monotonic() - started
+                    slot["jobs_done"] += 1
+
+            worker = slot["worker"]
+            if not worker.is_alive() or worker.jobs_done >= self.max_jobs_per_worker:
+                self._replace(slot)
+
+    def _replace(self, slot: Dict[str, Any]) -> SandboxWorker:
+        """Kill a slot's worker and start a fresh one in its place."""
+        slot["worker"].kill()
+        slot["worker"] = self._spawn()
+        with self._lock:
+            self.recycled += 1
+        return slot["worker"]
+
+    def submit(self, code: str, case: Dict[str, Any]) -> Future:
+        """Queue one test case for execution."""
+        if self._closed:
+            raise RuntimeError("Sandbox pool has been shut down")
+        future = Future()
+        self._jobs.put((code, case, future))
+        return future
+
+    def run_cases(self, code: str, cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run all cases of one attempt in parallel and return outcomes in order."""
+        futures = [self.submit(code, case) for case in cases]
+        return [future.result() for future in futures]
+
+    def stats(self) -> Dict[str, Any]:
+        """Report queue depth and per-worker utilisation for pool sizing."""
+        uptime = max(time.monotonic() - self.started_at, 1e-9)
+        with self._lock:
+            workers = [
+                {
+                    "slot_id": slot["slot_id"],
+                    "pid": slot["worker"].pid,
+                    "busy": slot["busy"],
+                    "jobs_done": slot["jobs_done"],
+                    "worker_jobs": slot["worker"].jobs_done,
+                    "peak_job_rss_mb": slot["worker"].peak_job_rss_kb / 1024,
+                    "utilisation": slot["busy_seconds"] / uptime
+                }
+                for slot in self._slots
+            ]
+            return {
+                "size": self.size,
+                "queue_depth": self._jobs.qsize(),
+                "busy_workers": sum(1 for w in workers if w["busy"]),
+                "recycled": self.recycled,
+                "workers": workers
+            }
+
+    def shutdown(self) -> None:
+        """Stop the dispatchers and kill every worker."""
+        self._closed = True
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+        for slot in self._slots:
+            slot["worker"].kill()
+
+_sandbox_pool: Optional[SandboxPool] = None
+_sandbox_pool_lock = threading.Lock()
+
+def get_sandbox_pool() -> SandboxPool:
+    """Return the process-wide sandbox pool, starting it on first use."""
+    global _sandbox_pool
+    if _sandbox_pool is None:
+        with _sandbox_pool_lock:
+            if _sandbox_pool is None:
+                _sandbox_pool = SandboxPool()
+                # Otherwise the workers outlive the app process
+                atexit.register(_sandbox_pool.shutdown)
+    return _sandbox_pool
@@ -0,0 +1,88 @@
+# praxis/utils/single_flight.py
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+class _Call:
+    """One in-flight call and the outcome its waiters will receive."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is still
+    running wait for it and receive the same result, or the same exception. Nothing is
+    remembered once the call finishes, so this complements rather than replaces caching.
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: str, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run func for this key, or wait for the identical call already in flight.
+
+        Args:
+            key: Identity of the call; equal keys must mean interchangeable results
+            func: Zero-argument function performing the call
+
+        Returns:
+            Tuple of the result and whether it was shared from another caller's execution
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def stats(self) -> Dict[str, int]:
+        """Return execution and coalescing counters."""
+        with self._lock:
+            return {
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls)
+            }
+
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+def get_single_flight() -> SingleFlight:
+    """Return the process-wide single-flight group for LLM requests."""
+    global _single_flight
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight()
+    return _single_flight
@@ -2,7 +2,7 @@
 import plotly.graph_objects as go
 import streamlit as st
 import streamlit.components.v1 as components
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Iterable
 
 def render_mermaid(mermaid_code: str, height: int = 400) -> None:
     """Render mermaid diagram in Streamlit."""
@@ -17,6 +17,26 @@ def render_mermaid(mermaid_code: str, height: int = 400) -> None:
     """
     components.html(html, height=height)
 
+def render_stream(deltas: Iterable[str], template: str = "{}", clear_on_finish: bool = False) -> str:
+    """
+    Render streamed LLM output progressively and return the assembled text.
+    
+    Args:
+        deltas: Iterable of text chunks, e.g. from one of the assistant's stream_* methods
+        template: HTML/markdown template with a single {} for the text so far
+        clear_on_finish: Remove the streamed preview once the text is complete
+    """
+    placeholder = st.empty()
+    text = ""
+    for delta in deltas:
+        text += delta
+        placeholder.markdown(template.format(text), unsafe_allow_html=True)
+    
+    if clear_on_finish:
+        placeholder.empty()
+    
+    return text
+
 def render_skill_chart(skills_data: List[Tuple], title: str) -> Optional[go.Figure]:
     """Render a radar chart for skills visualization."""
     if not skills_data:
@@ -59,18 +79,8 @@ def render_progress_chart(user_id: str, db) -> Optional[go.Figure]:
     if not db:
         return None
     
-    # Get recent attempts
-    cursor = db.conn.cursor()
-    cursor.execute('''
-        SELECT date(created_at) as date, AVG(score) as avg_score, COUNT(*) as attempts
-        FROM attempts
-        WHERE user_id = ?
-        GROUP BY date(created_at)
-        ORDER BY date ASC
-        LIMIT 30
-    ''', (user_id,))
-    
-    data = cursor.fetchall()
+    # Get daily activity
+    data = db.get_activity_patterns(user_id)['daily'][:30]
     
     if not data:
         return None